@@ -0,0 +1,86 @@
+"""
+Benchmark of reading a few pages out of a large input, with and without
+memory-mapped reading (--mmap).
+
+Usage: python -m benchmarks.large_input [--size-mib 1024] [-o results.json]
+
+The input is a scan-like file of one large image per page (see
+benchmarks/synthetic.py). It was just written, so it is read from the page
+cache: the numbers show the cost of copying the file into the reader, not of
+the disk.
+"""
+import json
+import tempfile
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Any
+
+from benchmarks.suite import measure
+from benchmarks.synthetic import generate_large_pdf
+
+# Side of the grayscale image of each page, so each page holds 1 MiB.
+IMAGE_SIZE = 1024
+
+
+def build_cases(pages: int) -> dict[str, dict[str, Any]]:
+    selected: str = f"1,{pages // 2},{pages}"
+    cases: dict[str, dict[str, Any]] = {}
+    for mmap in (False, True):
+        suffix: str = "-mmap" if mmap else ""
+        cases[f"split-3-pages{suffix}"] = {
+            "kind": "split",
+            "mode": "single_file",
+            "pages": selected,
+            "mmap": mmap,
+        }
+        cases[f"split-multi_files-j2{suffix}"] = {
+            "kind": "split",
+            "mode": "multi_files",
+            "pages": "1-8",
+            "jobs": 2,
+            "mmap": mmap,
+        }
+    return cases
+
+
+def read_args() -> Namespace:
+    parser = ArgumentParser(
+        description="Benchmark of memory-mapped reading of a large input."
+    )
+    parser.add_argument(
+        "-o", "--output", default="benchmark-large-input.json", metavar="FILE"
+    )
+    parser.add_argument("-r", "--repeat", default=3, type=int, metavar="N")
+    parser.add_argument(
+        "--size-mib",
+        help="Approximate size of the input file. Defaults to 1024.",
+        default=1024,
+        type=int,
+        metavar="N",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args: Namespace = read_args()
+    pages: int = max(8, args.size_mib * 1024 * 1024 // (IMAGE_SIZE * IMAGE_SIZE))
+    results: dict[str, Any] = {"input": {"pages": pages}, "cases": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_file: Path = workdir / "doc.pdf"
+        generate_large_pdf(str(input_file), pages, IMAGE_SIZE)
+        results["input"]["bytes"] = input_file.stat().st_size
+        for name, case in build_cases(pages).items():
+            results["cases"][name] = measure(name, case, workdir, args.repeat)
+
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"input: {pages} pages, {results['input']['bytes'] / 2**20:.0f} MiB")
+    print(f"{'case':<28} {'seconds':>10} {'peak RSS MiB':>13}")
+    for name, metrics in results["cases"].items():
+        print(
+            f"{name:<28} {metrics['seconds']:>10.3f} {metrics['peak_rss_mib']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
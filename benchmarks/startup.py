@@ -0,0 +1,66 @@
+"""
+Startup time of the command line tool.
+
+Usage: python benchmarks/startup.py [-r RUNS]
+
+Times `python -m pypdfeditor --help` and a run that fails validation, the two
+paths that must not pay for importing PyPDF2.
+"""
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import median
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CASES: dict[str, list[str]] = {
+    "help": ["--help"],
+    "invalid arguments": ["split", "missing.pdf", "-p", "1"],
+}
+
+
+def time_run(arguments: list[str]) -> float:
+    start: float = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *arguments],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - start
+
+
+def loads_pypdf2(arguments: list[str]) -> bool:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "pypdfeditor", *arguments],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return "PyPDF2" in result.stderr
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-r", "--runs", default=20, type=int, metavar="N")
+    runs: int = parser.parse_args().runs
+
+    baseline: list[float] = [time_run(["-c", "pass"]) for _ in range(runs)]
+    print(f"{'interpreter only':<20} median {median(baseline) * 1000:7.1f} ms")
+    for name, arguments in CASES.items():
+        timings: list[float] = [
+            time_run(["-m", "pypdfeditor", *arguments]) for _ in range(runs)
+        ]
+        print(
+            f"{name:<20} median {median(timings) * 1000:7.1f} ms, "
+            f"min {min(timings) * 1000:7.1f} ms, "
+            f"imports PyPDF2: {'yes' if loads_pypdf2(arguments) else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
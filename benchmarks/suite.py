@@ -0,0 +1,288 @@
+"""
+Benchmarks of the split, merge and encrypt hot paths.
+
+Usage: python -m benchmarks.suite [-o results.json] [--baseline baseline.json]
+
+Every case runs on synthetic files (see benchmarks/synthetic.py) in a fresh
+process, so the peak RSS recorded is that of the case alone. The results are
+written as JSON; with --baseline, cases slower, bigger or heavier than the
+baseline by more than --tolerance are reported and the exit status is 1.
+"""
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser, Namespace
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from statistics import median
+from typing import Any
+
+import PyPDF2
+
+from benchmarks.synthetic import DocumentSpec, generate_pdf
+
+ROOT = Path(__file__).resolve().parent.parent
+
+METRICS = ("seconds", "peak_rss_mib", "output_bytes")
+
+# Pages per file of the range_files split.
+RANGE_SIZE = 10
+
+
+def build_cases(pages: int, merge_inputs: list[int]) -> dict[str, dict[str, Any]]:
+    ranges: str = ",".join(
+        f"{start}-{min(start + RANGE_SIZE - 1, pages)}"
+        for start in range(1, pages + 1, RANGE_SIZE)
+    )
+    cases: dict[str, dict[str, Any]] = {
+        "split-single_file": {
+            "kind": "split",
+            "mode": "single_file",
+            "pages": f"1-{pages}",
+        },
+        "split-range_files": {"kind": "split", "mode": "range_files", "pages": ranges},
+        "split-multi_files": {
+            "kind": "split",
+            "mode": "multi_files",
+            "pages": f"1-{pages}",
+        },
+        "split-single_file-optimize": {
+            "kind": "split",
+            "mode": "single_file",
+            "pages": f"1-{pages}",
+            "optimize": True,
+        },
+    }
+    for inputs in merge_inputs:
+        cases[f"merge-{inputs}"] = {"kind": "merge", "inputs": inputs, "stream": False}
+    cases[f"merge-{max(merge_inputs)}-stream"] = {
+        "kind": "merge",
+        "inputs": max(merge_inputs),
+        "stream": True,
+    }
+    cases[f"merge-{max(merge_inputs)}-no-prefetch"] = {
+        "kind": "merge",
+        "inputs": max(merge_inputs),
+        "stream": False,
+        "prefetch": 0,
+    }
+    cases["encrypt"] = {"kind": "encrypt"}
+    return cases
+
+
+def prepare_inputs(
+    workdir: Path, spec: DocumentSpec, merge_pages: int, merge_inputs: int
+) -> None:
+    generate_pdf(str(workdir / "doc.pdf"), spec)
+    part: Path = workdir / "part.pdf"
+    generate_pdf(str(part), spec._replace(pages=merge_pages, seed=spec.seed + 1))
+    # Distinct paths, so each input is opened and parsed on its own.
+    for i in range(merge_inputs):
+        shutil.copy(part, workdir / f"part_{i}.pdf")
+
+
+def peak_rss_mib() -> float:
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_case(case: dict[str, Any], inputs: Path) -> dict[str, float]:
+    """Run one case in the current directory; called in a fresh process."""
+    from pypdfeditor.editor import encrypt_pdf, merge_pdf, split_pdf
+    from pypdfeditor.reader_cache import DEFAULT_PREFETCH
+    from pypdfeditor.type_definitions import SplitMode, WriteOptions
+
+    if case["kind"] == "encrypt":
+        shutil.copy(inputs / "doc.pdf", "doc.pdf")
+
+    start: float = time.perf_counter()
+    with redirect_stdout(StringIO()):
+        match case["kind"]:
+            case "split":
+                split_pdf(
+                    source_file=str(inputs / "doc.pdf"),
+                    page_range=case["pages"],
+                    mode=SplitMode(case["mode"]),
+                    jobs=case.get("jobs", 1),
+                    options=WriteOptions(optimize=case.get("optimize", False)),
+                    use_mmap=case.get("mmap", False),
+                )
+            case "merge":
+                merge_pdf(
+                    output_file="merged.pdf",
+                    input_files=[
+                        str(inputs / f"part_{i}.pdf") for i in range(case["inputs"])
+                    ],
+                    stream=case["stream"],
+                    use_mmap=case.get("mmap", False),
+                    prefetch=case.get("prefetch", DEFAULT_PREFETCH),
+                )
+            case "encrypt":
+                encrypt_pdf(input_file="doc.pdf", new_password="benchmark")
+    seconds: float = time.perf_counter() - start
+
+    return {
+        "seconds": seconds,
+        "peak_rss_mib": peak_rss_mib(),
+        "output_bytes": sum(path.stat().st_size for path in Path(".").iterdir()),
+    }
+
+
+def measure(
+    name: str, case: dict[str, Any], workdir: Path, repeat: int
+) -> dict[str, float]:
+    runs: list[dict[str, float]] = []
+    for i in range(repeat):
+        rundir: Path = workdir / f"{name}-{i}"
+        rundir.mkdir()
+        output: str = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.suite",
+                "--run-case",
+                json.dumps(case),
+                "--inputs",
+                str(workdir),
+            ],
+            cwd=rundir,
+            env={**os.environ, "PYTHONPATH": str(ROOT)},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        runs.append(json.loads(output))
+        shutil.rmtree(rundir)
+
+    return {
+        "seconds": median(run["seconds"] for run in runs),
+        "peak_rss_mib": max(run["peak_rss_mib"] for run in runs),
+        "output_bytes": runs[-1]["output_bytes"],
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    regressions: list[str] = []
+    for name, metrics in results["cases"].items():
+        expected: dict[str, float] | None = baseline["cases"].get(name)
+        if expected is None:
+            continue
+        for metric in METRICS:
+            if expected[metric] and metrics[metric] / expected[metric] > 1 + tolerance:
+                regressions.append(
+                    f"{name}: {metric} {expected[metric]:.6g} -> {metrics[metric]:.6g}"
+                )
+    return regressions
+
+
+def print_results(results: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    print(f"{'case':<28} {'seconds':>10} {'peak RSS MiB':>13} {'output bytes':>14}")
+    for name, metrics in results["cases"].items():
+        line: str = (
+            f"{name:<28} {metrics['seconds']:>10.3f} "
+            f"{metrics['peak_rss_mib']:>13.1f} {metrics['output_bytes']:>14}"
+        )
+        expected: dict[str, float] | None = (
+            baseline["cases"].get(name) if baseline else None
+        )
+        if expected:
+            ratios: str = ", ".join(
+                f"{metric} x{metrics[metric] / expected[metric]:.2f}"
+                for metric in METRICS
+                if expected[metric]
+            )
+            line += f"   ({ratios})"
+        print(line)
+
+
+def read_args() -> Namespace:
+    parser = ArgumentParser(
+        description="Benchmarks of the split, merge and encrypt hot paths."
+    )
+    parser.add_argument(
+        "-o", "--output", default="benchmark-results.json", metavar="FILE"
+    )
+    parser.add_argument(
+        "--baseline", help="Results to compare against.", metavar="FILE"
+    )
+    parser.add_argument(
+        "--tolerance",
+        help="Allowed relative increase over the baseline. Defaults to 0.2.",
+        default=0.2,
+        type=float,
+    )
+    parser.add_argument("-r", "--repeat", default=3, type=int, metavar="N")
+    parser.add_argument("--pages", default=200, type=int, metavar="N")
+    parser.add_argument("--images-per-page", default=1, type=int, metavar="N")
+    parser.add_argument("--fonts", default=4, type=int, metavar="N")
+    parser.add_argument("--font-reuse", default=0.9, type=float, metavar="RATIO")
+    parser.add_argument(
+        "--merge-inputs",
+        help="Comma separated numbers of merged files. Defaults to 2,50,500.",
+        default="2,50,500",
+        metavar="N,...",
+    )
+    parser.add_argument("--merge-pages", default=4, type=int, metavar="N")
+    parser.add_argument("--run-case", help="Internal: run a single case.")
+    parser.add_argument("--inputs", help="Internal: directory of the input files.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args: Namespace = read_args()
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case), Path(args.inputs))))
+        return
+
+    spec = DocumentSpec(
+        pages=args.pages,
+        images_per_page=args.images_per_page,
+        fonts=args.fonts,
+        font_reuse=args.font_reuse,
+    )
+    merge_inputs: list[int] = [int(n) for n in args.merge_inputs.split(",")]
+    cases: dict[str, dict[str, Any]] = build_cases(spec.pages, merge_inputs)
+
+    results: dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "pypdf2": PyPDF2.__version__,
+            "platform": platform.platform(),
+        },
+        "spec": {**spec._asdict(), "merge_pages": args.merge_pages},
+        "cases": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        prepare_inputs(workdir, spec, args.merge_pages, max(merge_inputs))
+        for name, case in cases.items():
+            results["cases"][name] = measure(name, case, workdir, args.repeat)
+
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+
+    baseline: dict[str, Any] | None = (
+        json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    )
+    print_results(results, baseline)
+    if baseline is not None:
+        if baseline.get("spec") != results["spec"]:
+            print("Warning: the baseline was recorded with different input files.")
+        regressions: list[str] = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Synthetic PDF files for the benchmarks.
+
+The files are built from random bytes, so their streams do not compress, and
+are reproducible for a given seed.
+"""
+import random
+from typing import NamedTuple
+
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+)
+
+
+class DocumentSpec(NamedTuple):
+    pages: int = 100
+    # Images drawn on each page; every image is a distinct stream.
+    images_per_page: int = 1
+    image_size: int = 64
+    # Embedded fonts shared by the pages that reuse a font.
+    fonts: int = 4
+    font_size: int = 16 * 1024
+    # Fraction of the pages using one of the shared fonts; the others embed
+    # a copy of their own.
+    font_reuse: float = 0.9
+    seed: int = 0
+
+
+def stream(data: bytes, **entries: object) -> DecodedStreamObject:
+    obj = DecodedStreamObject()
+    for key, value in entries.items():
+        obj[NameObject(f"/{key}")] = value
+    obj.set_data(data)
+    return obj
+
+
+def add_font(
+    writer: PdfWriter, rng: random.Random, name: str, size: int
+) -> IndirectObject:
+    font_file: IndirectObject = writer._add_object(
+        stream(rng.randbytes(size), Length1=NumberObject(size))
+    )
+    descriptor = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/FontDescriptor"),
+            NameObject("/FontName"): NameObject(name),
+            NameObject("/Flags"): NumberObject(32),
+            NameObject("/FontFile2"): font_file,
+        }
+    )
+    return writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Font"),
+                NameObject("/Subtype"): NameObject("/TrueType"),
+                NameObject("/BaseFont"): NameObject(name),
+                NameObject("/FontDescriptor"): writer._add_object(descriptor),
+            }
+        )
+    )
+
+
+def add_image(writer: PdfWriter, rng: random.Random, size: int) -> IndirectObject:
+    return writer._add_object(
+        stream(
+            rng.randbytes(size * size),
+            Type=NameObject("/XObject"),
+            Subtype=NameObject("/Image"),
+            Width=NumberObject(size),
+            Height=NumberObject(size),
+            ColorSpace=NameObject("/DeviceGray"),
+            BitsPerComponent=NumberObject(8),
+        )
+    )
+
+
+def generate_pdf(path: str, spec: DocumentSpec = DocumentSpec()) -> None:
+    rng = random.Random(spec.seed)
+    writer = PdfWriter()
+    shared_fonts: list[IndirectObject] = [
+        add_font(writer, rng, f"/Shared{i}", spec.font_size) for i in range(spec.fonts)
+    ]
+
+    for number in range(1, spec.pages + 1):
+        writer.add_blank_page(612, 792)
+        # add_blank_page returns the page before it was added to the writer.
+        page = writer.pages[-1]
+        if shared_fonts and rng.random() < spec.font_reuse:
+            font: IndirectObject = rng.choice(shared_fonts)
+        else:
+            font = add_font(writer, rng, f"/Page{number}", spec.font_size)
+
+        images = DictionaryObject()
+        content: list[bytes] = [b"BT /F1 24 Tf 72 720 Td (Page %d) Tj ET" % number]
+        for i in range(spec.images_per_page):
+            images[NameObject(f"/Im{i}")] = add_image(writer, rng, spec.image_size)
+            content.append(b"q 100 0 0 100 %d 72 cm /Im%d Do Q" % (72 + i * 110, i))
+
+        page[NameObject("/Resources")] = DictionaryObject(
+            {
+                NameObject("/Font"): DictionaryObject({NameObject("/F1"): font}),
+                NameObject("/XObject"): images,
+                NameObject("/ProcSet"): ArrayObject(
+                    [NameObject("/PDF"), NameObject("/Text")]
+                ),
+            }
+        )
+        page[NameObject("/Contents")] = writer._add_object(stream(b"\n".join(content)))
+
+    with open(path, "wb") as file:
+        writer.write(file)
+
+
+def generate_large_pdf(path: str, pages: int, image_size: int, seed: int = 0) -> None:
+    """
+    Write a scan-like file of `pages` pages holding one `image_size` square
+    grayscale image each, object by object, so files of several gigabytes
+    can be generated without holding them in memory.
+    """
+    rng = random.Random(seed)
+    offsets: list[int] = []
+    with open(path, "wb") as file:
+
+        def write_object(body: bytes, data: bytes = b"") -> None:
+            offsets.append(file.tell())
+            file.write(b"%d 0 obj\n" % len(offsets) + body)
+            if data:
+                file.write(b"\nstream\n" + data + b"\nendstream")
+            file.write(b"\nendobj\n")
+
+        file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        # Objects 1 and 2 are the catalog and the page tree; each page then
+        # takes three objects: the page, its content stream and its image.
+        write_object(b"<< /Type /Catalog /Pages 2 0 R >>")
+        kids: bytes = b" ".join(b"%d 0 R" % (3 + 3 * i) for i in range(pages))
+        write_object(b"<< /Type /Pages /Count %d /Kids [%s] >>" % (pages, kids))
+        for number in range(1, pages + 1):
+            page: int = len(offsets) + 1
+            write_object(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+                % (page + 2, page + 1)
+            )
+            content: bytes = b"q 468 0 0 648 72 72 cm /Im0 Do Q %% page %d" % number
+            write_object(b"<< /Length %d >>" % len(content), content)
+            image: bytes = rng.randbytes(image_size * image_size)
+            write_object(
+                b"<< /Type /XObject /Subtype /Image /Width %d /Height %d "
+                b"/ColorSpace /DeviceGray /BitsPerComponent 8 /Length %d >>"
+                % (image_size, image_size, len(image)),
+                image,
+            )
+
+        xref: int = file.tell()
+        file.write(b"xref\n0 %d\n0000000000 65535 f\r\n" % (len(offsets) + 1))
+        file.write(b"".join(b"%010d 00000 n\r\n" % offset for offset in offsets))
+        file.write(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(offsets) + 1, xref)
+        )
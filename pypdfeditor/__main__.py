@@ -0,0 +1,3 @@
+from pypdfeditor.main import main
+
+main()
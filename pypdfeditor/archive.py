@@ -0,0 +1,121 @@
+import os
+import tarfile
+import time
+import zipfile
+from io import BytesIO
+from types import TracebackType
+from typing import BinaryIO, Iterable, Optional, Union
+
+# Tar archives are written in stream mode ("w|"), which never seeks back.
+ARCHIVE_MODES: dict[str, str] = {
+    ".zip": "zip",
+    ".tar": "w|",
+    ".tar.gz": "w|gz",
+    ".tgz": "w|gz",
+    ".tar.bz2": "w|bz2",
+    ".tar.xz": "w|xz",
+}
+
+
+def archive_suffix(path: str) -> Optional[str]:
+    """The supported archive suffix `path` ends in, e.g. `.tar.gz`, if any."""
+    name: str = os.path.basename(path).lower()
+    matches: list[str] = [suffix for suffix in ARCHIVE_MODES if name.endswith(suffix)]
+    return max(matches, key=len, default=None)
+
+
+class SequentialFile:
+    """
+    Write-only view of a file without `seek`, so `zipfile` follows each entry
+    with a data descriptor instead of going back to patch its header.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+
+    def write(self, data: bytes) -> int:
+        return self.file.write(data)
+
+    def tell(self) -> int:
+        return self.file.tell()
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+class ArchiveWriter:
+    """
+    Writes files one after another into the ZIP or tar archive `path`, its
+    format and compression given by its suffix. Each file is written as soon
+    as it is added, so the archive is one sequential write. ZIP entries are
+    deflated. The archive is removed if writing it fails.
+    """
+
+    def __init__(self, path: str) -> None:
+        suffix: Optional[str] = archive_suffix(path)
+        if suffix is None:
+            raise ValueError(f"Error: Unsupported archive format: {path}")
+        self.path = path
+        self._file: BinaryIO = open(path, "wb")
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        if ARCHIVE_MODES[suffix] == "zip":
+            self._zip = zipfile.ZipFile(
+                SequentialFile(self._file),  # type: ignore[arg-type]
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+            )
+        else:
+            self._tar = tarfile.open(fileobj=self._file, mode=ARCHIVE_MODES[suffix])
+
+    def add(self, name: str, data: bytes | memoryview) -> None:
+        if self._zip is not None:
+            zip_info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            self._zip.writestr(zip_info, bytes(data))
+        elif self._tar is not None:
+            tar_info = tarfile.TarInfo(name)
+            tar_info.size = len(data)
+            tar_info.mtime = int(time.time())
+            tar_info.mode = 0o644
+            self._tar.addfile(tar_info, BytesIO(data))
+
+    def add_all(self, parts: Iterable[tuple[str, bytes]]) -> None:
+        for name, data in parts:
+            self.add(name, data)
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        elif self._tar is not None:
+            self._tar.close()
+        self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+        if exc_type is not None:
+            os.unlink(self.path)
+
+
+class PartCollector:
+    """
+    Collects files in memory, in a worker process, for the parent process
+    to add them to its `ArchiveWriter`.
+    """
+
+    def __init__(self) -> None:
+        self.parts: list[tuple[str, bytes]] = []
+
+    def add(self, name: str, data: bytes | memoryview) -> None:
+        self.parts.append((name, bytes(data)))
+
+
+PartSink = Union[ArchiveWriter, PartCollector]
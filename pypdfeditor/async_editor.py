@@ -0,0 +1,249 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional
+
+from .editor import encrypt_pdf_stream, merge_pdf, split_pdf
+from .progress import CancellationToken, Progress, track_progress
+from .reader_cache import DEFAULT_PREFETCH
+from .type_definitions import STDIO, SplitMode, WriteOptions
+
+_default_executor: Optional[ThreadPoolExecutor] = None
+
+
+def default_executor() -> ThreadPoolExecutor:
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ThreadPoolExecutor(thread_name_prefix="pypdfeditor")
+    return _default_executor
+
+
+def staging_directory(directory: str) -> str:
+    return tempfile.mkdtemp(dir=directory or ".", prefix=".pypdfeditor-")
+
+
+def run_tracked(
+    job: Callable[[], None],
+    token: CancellationToken,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+) -> None:
+    with track_progress(on_progress, token):
+        job()
+
+
+def release_soon(
+    loop: asyncio.AbstractEventLoop, limiter: asyncio.Semaphore
+) -> Callable[[Future], None]:
+    """Done-callback of an executor job that releases `limiter` on its loop."""
+
+    def release(_: Future) -> None:
+        try:
+            loop.call_soon_threadsafe(limiter.release)
+        except RuntimeError:
+            # The loop, and the limiter with it, is gone.
+            pass
+
+    return release
+
+
+async def run_staged(
+    staging: str,
+    job: Callable[[], None],
+    executor: Optional[Executor] = None,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> None:
+    """
+    Run `job`, which writes its files into `staging`, on `executor`, a
+    thread pool by default, once `limiter` is acquired. Its files are only
+    moved to their destination by the caller once it is complete, so a job
+    that fails or is cancelled leaves no partial files: `staging` is
+    removed, once the executor is done with the job if it was already
+    running. Only then is `limiter` released too, so jobs still running
+    after being cancelled keep counting against it.
+
+    On a thread pool, progress is reported to `on_progress` from the
+    executor, and a running job is cancelled through a `CancellationToken`,
+    stopping at its next page. Other executors, e.g. a process pool, can not
+    share the token or the callback, so they run the job to its end.
+    """
+    executor = executor or default_executor()
+    if on_progress is not None and not isinstance(executor, ThreadPoolExecutor):
+        shutil.rmtree(staging, ignore_errors=True)
+        raise ValueError("Error: Progress can only be reported from a thread executor.")
+
+    try:
+        if limiter is not None:
+            await limiter.acquire()
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    token: Optional[CancellationToken] = None
+    future: Future
+    try:
+        if isinstance(executor, ThreadPoolExecutor):
+            token = CancellationToken()
+            future = executor.submit(run_tracked, job, token, on_progress)
+        else:
+            future = executor.submit(job)
+    except BaseException:
+        if limiter is not None:
+            limiter.release()
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    try:
+        await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        if token is not None:
+            token.cancel()
+        future.add_done_callback(lambda _: shutil.rmtree(staging, ignore_errors=True))
+        raise
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    finally:
+        if limiter is not None:
+            future.add_done_callback(release_soon(asyncio.get_running_loop(), limiter))
+
+
+async def split_pdf_async(
+    source_file: str,
+    page_range: str,
+    mode: SplitMode = SplitMode.SINGLE_FILE,
+    jobs: int = 1,
+    options: WriteOptions = WriteOptions(),
+    use_mmap: bool = False,
+    output_dir: str = ".",
+    archive: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    limiter: Optional[asyncio.Semaphore] = None,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+) -> list[str]:
+    """
+    `split_pdf` on `executor`, without blocking the event loop, returning
+    the paths of the files written. With a `limiter`, e.g. an
+    `asyncio.Semaphore` shared by the requests of a service, the split only
+    starts once it is acquired. `on_progress` is called from the executor.
+    """
+    if STDIO in (source_file, output_dir):
+        raise ValueError("Error: stdin and stdout can not be used by the async API.")
+
+    staging: str = staging_directory(
+        os.path.dirname(archive) if archive is not None else output_dir
+    )
+    await run_staged(
+        staging,
+        partial(
+            split_pdf,
+            source_file=source_file,
+            page_range=page_range,
+            mode=mode,
+            jobs=jobs,
+            options=options,
+            use_mmap=use_mmap,
+            output_dir=staging,
+            archive=(
+                None
+                if archive is None
+                else os.path.join(staging, os.path.basename(archive))
+            ),
+        ),
+        executor,
+        on_progress,
+        limiter,
+    )
+
+    output_files: list[str] = []
+    for name in sorted(os.listdir(staging)):
+        output_file: str = (
+            archive if archive is not None else os.path.join(output_dir, name)
+        )
+        os.replace(os.path.join(staging, name), output_file)
+        output_files.append(output_file)
+    os.rmdir(staging)
+    return output_files
+
+
+async def merge_pdf_async(
+    output_file: str,
+    input_files: list[str],
+    stream: bool = False,
+    options: WriteOptions = WriteOptions(),
+    use_mmap: bool = False,
+    executor: Optional[Executor] = None,
+    limiter: Optional[asyncio.Semaphore] = None,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> None:
+    """`merge_pdf` on `executor`, once `limiter` is acquired."""
+    if output_file == STDIO or STDIO in (
+        file.partition(":")[0] for file in input_files
+    ):
+        raise ValueError("Error: stdin and stdout can not be used by the async API.")
+
+    staging: str = staging_directory(os.path.dirname(output_file))
+    staged_file: str = os.path.join(staging, os.path.basename(output_file))
+    await run_staged(
+        staging,
+        partial(
+            merge_pdf,
+            output_file=staged_file,
+            input_files=input_files,
+            stream=stream,
+            options=options,
+            use_mmap=use_mmap,
+            prefetch=prefetch,
+        ),
+        executor,
+        on_progress,
+        limiter,
+    )
+    os.replace(staged_file, output_file)
+    os.rmdir(staging)
+
+
+def encrypt_pdf_file_to(
+    input_file: str,
+    output_file: str,
+    new_password: str,
+    current_password: Optional[str] = None,
+) -> None:
+    with open(input_file, "rb") as source, open(output_file, "wb") as output:
+        encrypt_pdf_stream(source, output, new_password, current_password)
+        output.flush()
+        os.fsync(output.fileno())
+    shutil.copymode(input_file, output_file)
+
+
+async def encrypt_pdf_async(
+    input_file: str,
+    new_password: str,
+    current_password: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> None:
+    """
+    `encrypt_pdf` on `executor`, once `limiter` is acquired. Nothing is
+    prompted for: encrypted files fail unless `current_password` is given.
+    """
+    staging: str = staging_directory(os.path.dirname(input_file))
+    staged_file: str = os.path.join(staging, os.path.basename(input_file))
+    await run_staged(
+        staging,
+        partial(
+            encrypt_pdf_file_to,
+            input_file,
+            staged_file,
+            new_password,
+            current_password,
+        ),
+        executor,
+        limiter=limiter,
+    )
+    os.replace(staged_file, input_file)
+    os.rmdir(staging)
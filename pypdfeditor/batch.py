@@ -0,0 +1,178 @@
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, get_type_hints
+
+from pypdfeditor.commands import CliCommand, create_command
+from pypdfeditor.type_definitions import (
+    Args,
+    CacheKey,
+    Command,
+    EncryptArgs,
+    MergeArgs,
+    SplitArgs,
+    SplitMode,
+)
+from pypdfeditor.validator import validate_args
+
+# CSV cells cannot hold lists, so `input_files` entries are separated by this.
+CSV_LIST_SEPARATOR = ";"
+
+JOB_OPTIONS: dict[Command, type] = {
+    Command.SPLIT: SplitArgs,
+    Command.MERGE: MergeArgs,
+    Command.ENCRYPT: EncryptArgs,
+}
+
+# Options for which an empty value means something, e.g. an empty
+# new_password removes the password; other empty CSV cells are left unset.
+JOB_EMPTY_OPTIONS: dict[Command, set[str]] = {
+    Command.ENCRYPT: {"new_password"},
+}
+
+# Options renamed since manifests were first written.
+JOB_OPTION_ALIASES: dict[Command, dict[str, str]] = {
+    Command.ENCRYPT: {"input_file": "input_files"},
+}
+
+
+class BatchJob(NamedTuple):
+    line: int
+    record: Any
+    error: Optional[str] = None
+
+
+class BatchResult(NamedTuple):
+    line: int
+    command: str
+    error: Optional[str]
+    seconds: float
+
+
+def parse_value(value: Any, annotation: Any) -> Any:
+    if annotation is bool:
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes")
+        return bool(value)
+    if annotation is int:
+        return int(value)
+    if annotation is SplitMode:
+        return SplitMode(value)
+    if annotation is CacheKey:
+        return CacheKey(value)
+    if annotation == list[str] and isinstance(value, str):
+        return [
+            item.strip() for item in value.split(CSV_LIST_SEPARATOR) if item.strip()
+        ]
+    return value
+
+
+def parse_job(record: Any) -> Args:
+    """Build the `Args` of a manifest record, e.g. {"command": "split", "source_file": ...}."""
+    if not isinstance(record, dict):
+        raise ValueError("Error: A batch job must be an object of options")
+
+    try:
+        command = Command(record.get("command"))
+        options_type: type = JOB_OPTIONS[command]
+    except (KeyError, ValueError):
+        raise ValueError(f"Error: Invalid batch command {record.get('command')!r}")
+
+    empty_options: set[str] = JOB_EMPTY_OPTIONS.get(command, set())
+    fields: dict[str, Any] = {
+        key: value
+        for key, value in record.items()
+        if key != "command"
+        and value is not None
+        and (value != "" or key in empty_options)
+    }
+
+    for alias, name in JOB_OPTION_ALIASES.get(command, {}).items():
+        if alias in fields:
+            fields.setdefault(name, fields.pop(alias))
+    hints: dict[str, Any] = get_type_hints(options_type)
+    unknown: set[str] = set(fields) - set(hints)
+    if unknown:
+        raise ValueError(
+            f"Error: Unknown {command} options: {', '.join(sorted(unknown))}"
+        )
+
+    try:
+        options = options_type(
+            **{key: parse_value(value, hints[key]) for key, value in fields.items()}
+        )
+    except TypeError as e:
+        raise ValueError(f"Error: Invalid {command} options: {e}")
+    if isinstance(options, EncryptArgs) and options.new_password is None:
+        # There is no terminal to prompt on in a batch.
+        raise ValueError("Error: Encrypt jobs require a new_password.")
+    return Args(command=command, options=options)
+
+
+def read_manifest(manifest: str) -> list[BatchJob]:
+    """Read a JSON-lines manifest, or a CSV one with a header row if it ends in `.csv`."""
+    with open(manifest, newline="") as file:
+        if Path(manifest).suffix.lower() == ".csv":
+            reader: csv.DictReader = csv.DictReader(file)
+            return [BatchJob(line=reader.line_num, record=record) for record in reader]
+
+        jobs: list[BatchJob] = []
+        for line, text in enumerate(file, start=1):
+            if text.strip():
+                try:
+                    jobs.append(BatchJob(line=line, record=json.loads(text)))
+                except json.JSONDecodeError as e:
+                    jobs.append(BatchJob(line, None, f"Error: Invalid JSON: {e}"))
+        return jobs
+
+
+def run_job(job: BatchJob, validate_only: bool = False) -> BatchResult:
+    start: float = time.perf_counter()
+    command: str = (
+        str(job.record.get("command")) if isinstance(job.record, dict) else "?"
+    )
+    try:
+        if job.error is not None:
+            raise ValueError(job.error)
+        args: Args = parse_job(job.record)
+        validate_args(args=args)
+        cli_command: CliCommand = create_command(args, prompt=False)
+        if validate_only:
+            cli_command.validate()
+        else:
+            cli_command.execute()
+    except Exception as e:
+        return BatchResult(job.line, command, str(e), time.perf_counter() - start)
+    return BatchResult(job.line, command, None, time.perf_counter() - start)
+
+
+def run_batch(
+    manifest: str, jobs: int = 1, validate_only: bool = False
+) -> list[BatchResult]:
+    batch_jobs: list[BatchJob] = read_manifest(manifest)
+    if jobs == 1:
+        return [run_job(job, validate_only) for job in batch_jobs]
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(
+            executor.map(run_job, batch_jobs, [validate_only] * len(batch_jobs))
+        )
+
+
+def print_batch_results(results: list[BatchResult]) -> bool:
+    """Print one line per job and a summary; return whether every job succeeded."""
+    failed: int = 0
+    for result in results:
+        if result.error is None:
+            print(f"[ok] line {result.line}: {result.command} ({result.seconds:.2f}s)")
+        else:
+            failed += 1
+            print(f"[failed] line {result.line}: {result.command}: {result.error}")
+
+    print(
+        f"Batch finished: {len(results) - failed} succeeded, {failed} failed, "
+        f"{len(results)} total"
+    )
+    return failed == 0
@@ -1,28 +1,100 @@
+import os
+import sys
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
-from re import I
-from typing import Generic
+from typing import TYPE_CHECKING, Generic, Optional
 
-from pypdfeditor.editor import encrypt_pdf, merge_pdf, split_pdf
-from pypdfeditor.type_definitions import EncryptArgs, MergeArgs, SplitArgs, T
+from pypdfeditor.type_definitions import (
+    Args,
+    BatchArgs,
+    CacheAction,
+    CacheArgs,
+    Command,
+    EncryptArgs,
+    STDIO,
+    MergeArgs,
+    ServeArgs,
+    SplitArgs,
+    T,
+    WriteOptions,
+)
+
+# The editor, and PyPDF2 with it, is only imported once a command runs, so
+# argument errors and --help are reported without loading them.
+if TYPE_CHECKING:
+    from pypdfeditor.reader_cache import ReaderCache
+    from pypdfeditor.result_cache import ResultCache
+
+
+def open_result_cache(options: SplitArgs | MergeArgs) -> Optional["ResultCache"]:
+    if options.cache_dir is None:
+        return None
+
+    from pypdfeditor.result_cache import MIB, ResultCache
+
+    return ResultCache(
+        options.cache_dir,
+        max_size=options.cache_max_size * MIB,
+        key_mode=options.cache_key,
+    )
+
+
+def progress_bar(options: SplitArgs | MergeArgs) -> AbstractContextManager:
+    if not options.progress:
+        return nullcontext()
+
+    from pypdfeditor.progress import show_progress
+
+    return show_progress()
 
 
 @dataclass
 class CliCommand(Generic[T]):
     options: T
+    readers: Optional["ReaderCache"] = None
 
     def execute(self) -> None:
         pass
 
+    def validate(self) -> None:
+        """Check the command against its input files without writing anything."""
+        pass
+
 
 @dataclass
 class SplitCommand(CliCommand[SplitArgs]):
     options: SplitArgs
 
     def execute(self) -> None:
-        split_pdf(
+        from pypdfeditor.editor import split_pdf
+
+        with progress_bar(self.options):
+            split_pdf(
+                source_file=self.options.source_file,
+                page_range=self.options.pages,
+                mode=self.options.mode,
+                jobs=self.options.jobs,
+                options=WriteOptions(
+                    dedupe=self.options.dedupe,
+                    optimize=self.options.optimize,
+                    compression_level=self.options.compression_level,
+                ),
+                readers=self.readers,
+                use_mmap=self.options.mmap,
+                cache=open_result_cache(self.options),
+                output_dir=self.options.output_dir,
+                archive=self.options.archive,
+            )
+
+    def validate(self) -> None:
+        from pypdfeditor.editor import check_split
+
+        check_split(
             source_file=self.options.source_file,
             page_range=self.options.pages,
             mode=self.options.mode,
+            readers=self.readers,
+            use_mmap=self.options.mmap,
         )
 
 
@@ -31,15 +103,134 @@ class MergeCommand(CliCommand[MergeArgs]):
     options: MergeArgs
 
     def execute(self) -> None:
-        merge_pdf(
-            output_file=self.options.output_file,
+        from pypdfeditor.editor import merge_pdf
+
+        output_file: str = self.options.output_file
+        if output_file != STDIO:
+            output_file = os.path.join(self.options.output_dir, output_file)
+        with progress_bar(self.options):
+            merge_pdf(
+                output_file=output_file,
+                input_files=self.options.input_files,
+                stream=self.options.stream,
+                options=WriteOptions(
+                    dedupe=self.options.dedupe,
+                    optimize=self.options.optimize,
+                    compression_level=self.options.compression_level,
+                ),
+                readers=self.readers,
+                use_mmap=self.options.mmap,
+                cache=open_result_cache(self.options),
+                prefetch=self.options.prefetch,
+            )
+
+    def validate(self) -> None:
+        from pypdfeditor.editor import check_merge
+
+        check_merge(
             input_files=self.options.input_files,
+            readers=self.readers,
+            use_mmap=self.options.mmap,
         )
 
 
 @dataclass
 class EncryptCommand(CliCommand[EncryptArgs]):
     options: EncryptArgs
+    # Batch and server jobs have no terminal to prompt on.
+    prompt: bool = True
+
+    def execute(self) -> None:
+        from pypdfeditor.editor import encrypt_pdf_files
+
+        encrypt_pdf_files(
+            input_files=self.options.input_files,
+            new_password=self.options.new_password,
+            current_password=self.options.current_password,
+            jobs=self.options.jobs,
+            prompt=self.prompt,
+        )
+
+    def validate(self) -> None:
+        from pypdfeditor.editor import check_encrypt
+
+        for input_file in self.options.input_files:
+            check_encrypt(
+                input_file=input_file,
+                current_password=self.options.current_password,
+            )
+
+
+@dataclass
+class BatchCommand(CliCommand[BatchArgs]):
+    options: BatchArgs
 
     def execute(self) -> None:
-        encrypt_pdf(input_file=self.options.input_file)
+        from pypdfeditor.batch import print_batch_results, run_batch
+
+        results = run_batch(manifest=self.options.manifest, jobs=self.options.jobs)
+        if not print_batch_results(results):
+            sys.exit(1)
+
+    def validate(self) -> None:
+        from pypdfeditor.batch import print_batch_results, run_batch
+
+        results = run_batch(
+            manifest=self.options.manifest,
+            jobs=self.options.jobs,
+            validate_only=True,
+        )
+        if not print_batch_results(results):
+            sys.exit(1)
+
+
+@dataclass
+class ServeCommand(CliCommand[ServeArgs]):
+    options: ServeArgs
+
+    def execute(self) -> None:
+        from pypdfeditor.server import serve
+
+        serve(
+            socket_path=self.options.socket,
+            port=self.options.port,
+            jobs=self.options.jobs,
+            max_queue=self.options.max_queue,
+            token=self.options.token,
+        )
+
+
+@dataclass
+class CacheCommand(CliCommand[CacheArgs]):
+    options: CacheArgs
+
+    def execute(self) -> None:
+        from pypdfeditor.result_cache import MIB, ResultCache, print_cache_stats
+
+        cache = ResultCache(self.options.cache_dir)
+        match self.options.action:
+            case CacheAction.STATS:
+                print_cache_stats(cache.stats())
+            case CacheAction.PRUNE:
+                removed: int = cache.prune(self.options.max_size * MIB)
+                print(f"Removed {removed} cache entries")
+
+
+def create_command(
+    args: Args, readers: Optional["ReaderCache"] = None, prompt: bool = True
+) -> CliCommand:
+    match args.command:
+        case Command.SPLIT:
+            return SplitCommand(options=args.options, readers=readers)
+        case Command.MERGE:
+            return MergeCommand(options=args.options, readers=readers)
+        case Command.ENCRYPT:
+            return EncryptCommand(options=args.options, prompt=prompt)
+        case Command.BATCH:
+            return BatchCommand(options=args.options)
+        case Command.SERVE:
+            return ServeCommand(options=args.options)
+        case Command.CACHE:
+            return CacheCommand(options=args.options)
+        case _:
+            raise ValueError(f"Invalid command {args.command}")
@@ -1,151 +1,862 @@
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager, nullcontext
 from functools import partial
 from getpass import getpass
+from io import BytesIO
 from pathlib import Path
-from typing import Callable
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Sequence, TextIO
 
 from PyPDF2 import PdfReader, PdfWriter
-from type_definitions import SplitMode
 
-from .parser import parse_page_range, parse_page_ranges
+from .archive import ArchiveWriter, PartCollector, PartSink, archive_suffix
+from .mapped_file import open_pdf_reader
+from .metrics import phase, record_output
+from .optimize import dedupe_writer
+from .page_range import PageSelection
+from .page_tree import get_page, page_count
+from .parallel import chunked, run_in_process_pool, worker_reader
+from .parser import parse_page_expression, parse_page_range, parse_page_ranges
+from .progress import add_total, advance, check_cancelled, track_pages
+from .reader_cache import DEFAULT_PREFETCH, ReaderCache, ReaderPrefetcher
+from .result_cache import ResultCache
+from .split_writer import write_page_selection
+from .stream_writer import StreamingPdfWriter, write_compact, write_object_copy
+from .type_definitions import STDIO, Command, SplitMode, WriteOptions
 
 
-def print_result(pages: int) -> None:
+def print_result(pages: int, file: Optional[TextIO] = None) -> None:
     if pages == 1:
-        print(f"The PDF file was successfully split into {pages} file")
+        print(f"The PDF file was successfully split into {pages} file", file=file)
     else:
-        print(f"The PDF file was successfully split into {pages} files")
+        print(f"The PDF file was successfully split into {pages} files", file=file)
 
 
-def split_pdf_file_by_pages(
+EMPTY_PAGE_RANGE_ERROR = "Error: The specified page range selects no pages."
+
+
+def check_page_range(
     reader: PdfReader,
-    filename: str,
-    page_range: set[int],
+    page_range: PageSelection,
+    error_message: str = "Error: The specified page range exceeds the number of pages in the PDF file.",
+    empty_message: str = EMPTY_PAGE_RANGE_ERROR,
 ) -> None:
-    if max(page_range) > len(reader.pages):
-        raise ValueError(
-            "Error: The specified page range exceeds the number of pages in the PDF file."
+    # An empty selection, such as `even` of a single page file, would be
+    # written as a file without pages.
+    if len(page_range) == 0:
+        raise ValueError(empty_message)
+    # The page count comes from the /Count of the page tree, so this does not
+    # load the pages themselves.
+    if page_range.max() > page_count(reader):
+        raise ValueError(error_message)
+
+
+def check_page_ranges(reader: PdfReader, page_ranges: list[PageSelection]) -> None:
+    """Check each range of a range_files split, which becomes a file of its own."""
+    for page_range in page_ranges:
+        check_page_range(
+            reader,
+            page_range,
+            empty_message="Error: A page range of the split selects no pages.",
         )
 
-    for i, page in enumerate(page_range):
-        output_filename: str = f"{filename}_{i+1}.pdf"
-        with open(output_filename, "wb") as out_file:
-            writer = PdfWriter()
-            writer.add_page(reader.pages[page - 1])
+
+def open_reader(
+    source_file: str,
+    readers: Optional[ReaderCache] = None,
+    use_mmap: bool = False,
+) -> PdfReader:
+    if readers is not None:
+        return readers.get(source_file, use_mmap)
+    with phase("open"):
+        return open_pdf_reader(source_file, use_mmap)
+
+
+@contextmanager
+def open_output(path: str, seekable: bool = True) -> Iterator[BinaryIO]:
+    """
+    Open `path` for writing, or stdout if it is `-`. Unless the writer only
+    needs to write (`seekable=False`), stdout output is buffered and copied
+    to stdout once complete.
+    """
+    if path != STDIO:
+        with open(path, "wb") as file:
+            yield file
+    elif not seekable:
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    else:
+        buffer = BytesIO()
+        yield buffer
+        sys.stdout.buffer.write(buffer.getbuffer())
+        sys.stdout.buffer.flush()
+
+
+@contextmanager
+def open_part(name: str, parts: Optional[PartSink] = None) -> Iterator[BinaryIO]:
+    """
+    Open the output file `name`, or a buffer added to `parts` under the base
+    name of `name` once it is complete.
+    """
+    if parts is None:
+        with open_output(name) as file:
+            yield file
+        return
+    buffer = BytesIO()
+    yield buffer
+    parts.add(Path(name).name, buffer.getbuffer())
+
+
+@contextmanager
+def replace_file(path: str) -> Iterator[BinaryIO]:
+    """
+    Write to a temporary file next to `path` and move it over `path` once it
+    is complete and synced, so a failed write never leaves a truncated file.
+    A symlink is followed, so its target is replaced and the link is kept.
+    """
+    path = os.path.realpath(path)
+    directory: str = os.path.dirname(path)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{Path(path).name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            yield file
+            with phase("fsync"):
+                file.flush()
+                os.fsync(file.fileno())
+            record_output(file.tell())
+        shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        # The rename itself is only durable once the directory is synced.
+        with phase("fsync"):
+            directory_descriptor: int = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_descriptor)
+            finally:
+                os.close(directory_descriptor)
+
+
+def file_state(path: str) -> Optional[tuple[int, int, int]]:
+    try:
+        stat: os.stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def removed_on_failure(paths: Sequence[str]) -> Iterator[None]:
+    """
+    Remove the files of `paths` written in the block if it fails or is
+    cancelled, e.g. by worker processes, so a job never leaves partial
+    output behind. Files it did not touch are kept.
+    """
+    states: list[Optional[tuple[int, int, int]]] = [file_state(path) for path in paths]
+    try:
+        yield
+    except BaseException:
+        for path, state in zip(paths, states):
+            if file_state(path) not in (None, state):
+                os.unlink(path)
+        raise
+
+
+def write_pdf(
+    writer: PdfWriter,
+    out_file: BinaryIO,
+    options: WriteOptions,
+) -> None:
+    with phase("write"):
+        if options.dedupe:
+            dedupe_writer(writer)
+        if options.optimize:
+            write_compact(writer, out_file, options.compression_level)
+        else:
             writer.write(out_file)
+    record_output(out_file.tell())
+    advance(bytes_written=out_file.tell())
+
+
+def write_pages(
+    reader: PdfReader,
+    pages: Iterable[int],
+    out_file: BinaryIO,
+    options: WriteOptions,
+) -> None:
+    # Each page counts as one step of the progress of a split, and the job
+    # stops there once it is cancelled.
+    pages = track_pages(pages)
+    if not (options.dedupe or options.optimize):
+        # Objects shared by the files split from `reader` are only
+        # serialized once; deduplication and optimization need a writer.
+        write_page_selection(reader, pages, out_file)
+        record_output(out_file.tell())
+        advance(bytes_written=out_file.tell())
+        return
+
+    writer = PdfWriter()
+    with phase("copy"):
+        for page in pages:
+            writer.add_page(get_page(reader, page - 1))
+    write_pdf(writer, out_file, options)
+
+
+def write_page_files(
+    reader: PdfReader,
+    filename: str,
+    pages: Sequence[tuple[int, int]],
+    options: WriteOptions,
+    parts: Optional[PartSink] = None,
+) -> int:
+    for i, page in pages:
+        with open_part(f"{filename}_{i}.pdf", parts) as out_file:
+            write_pages(reader, [page], out_file, options)
+    return len(pages)
+
+
+def write_page_files_in_worker(
+    filename: str,
+    pages: Sequence[tuple[int, int]],
+    options: WriteOptions,
+    collect: bool = False,
+) -> list[tuple[str, bytes]]:
+    """Write the files, or return them to be archived by the parent process if `collect` is set."""
+    collector: Optional[PartCollector] = PartCollector() if collect else None
+    write_page_files(worker_reader(), filename, pages, options, collector)
+    return [] if collector is None else collector.parts
+
+
+def split_pdf_file_by_pages(
+    reader: PdfReader,
+    filename: str,
+    page_range: PageSelection,
+    source_file: Optional[str] = None,
+    jobs: int = 1,
+    options: WriteOptions = WriteOptions(),
+    use_mmap: bool = False,
+    archive: Optional[ArchiveWriter] = None,
+) -> list[str]:
+    check_page_range(reader, page_range)
+
+    pages: list[tuple[int, int]] = list(enumerate(page_range, start=1))
+    output_files: list[str] = [f"{filename}_{i}.pdf" for i, _ in pages]
+    add_total(len(pages))
+    with removed_on_failure(output_files if archive is None else []):
+        if jobs > 1 and source_file is not None:
+            run_in_process_pool(
+                write_page_files_in_worker,
+                [
+                    (filename, chunk, options, archive is not None)
+                    for chunk in chunked(pages, jobs)
+                ],
+                jobs=jobs,
+                source_file=source_file,
+                use_mmap=use_mmap,
+                on_result=None if archive is None else archive.add_all,
+            )
+        else:
+            write_page_files(reader, filename, pages, options, archive)
 
     print_result(len(page_range))
+    return output_files
+
+
+def write_range_files(
+    reader: PdfReader,
+    filename: str,
+    page_ranges: Sequence[tuple[int, PageSelection]],
+    options: WriteOptions,
+    parts: Optional[PartSink] = None,
+) -> int:
+    for i, page_range in page_ranges:
+        with open_part(f"{filename}_{i}.pdf", parts) as out_file:
+            write_pages(reader, page_range, out_file, options)
+    return len(page_ranges)
+
+
+def write_range_files_in_worker(
+    filename: str,
+    page_ranges: Sequence[tuple[int, PageSelection]],
+    options: WriteOptions,
+    collect: bool = False,
+) -> list[tuple[str, bytes]]:
+    """Write the files, or return them to be archived by the parent process if `collect` is set."""
+    collector: Optional[PartCollector] = PartCollector() if collect else None
+    write_range_files(worker_reader(), filename, page_ranges, options, collector)
+    return [] if collector is None else collector.parts
 
 
 def split_pdf_file_by_ranges(
     reader: PdfReader,
     filename: str,
-    page_ranges: list[set[int]],
-) -> None:
-    pages: list[int] = sorted(set.union(*page_ranges))
-    if max(pages) > len(reader.pages):
-        raise ValueError(
-            "Error: The specified page range exceeds the number of pages in the PDF file."
-        )
+    page_ranges: list[PageSelection],
+    source_file: Optional[str] = None,
+    jobs: int = 1,
+    options: WriteOptions = WriteOptions(),
+    use_mmap: bool = False,
+    archive: Optional[ArchiveWriter] = None,
+) -> list[str]:
+    check_page_ranges(reader, page_ranges)
 
-    for i, page_range in enumerate(page_ranges):
-        output_filename: str = f"{filename}_{i+1}.pdf"
-        with open(output_filename, "wb") as out_file:
-            writer = PdfWriter()
-            for page in sorted(page_range):
-                writer.add_page(reader.pages[page - 1])
-            writer.write(out_file)
+    numbered_ranges: list[tuple[int, PageSelection]] = list(
+        enumerate(page_ranges, start=1)
+    )
+    output_files: list[str] = [f"{filename}_{i}.pdf" for i, _ in numbered_ranges]
+    add_total(sum(len(page_range) for page_range in page_ranges))
+    with removed_on_failure(output_files if archive is None else []):
+        if jobs > 1 and source_file is not None:
+            # Largest ranges are queued first so that they never end up running
+            # together on the last busy worker (longest-processing-time first).
+            largest_first: list[tuple[int, PageSelection]] = sorted(
+                numbered_ranges, key=lambda item: len(item[1]), reverse=True
+            )
+            run_in_process_pool(
+                write_range_files_in_worker,
+                [
+                    (filename, [numbered_range], options, archive is not None)
+                    for numbered_range in largest_first
+                ],
+                jobs=jobs,
+                source_file=source_file,
+                use_mmap=use_mmap,
+                on_result=None if archive is None else archive.add_all,
+            )
+        else:
+            write_range_files(reader, filename, numbered_ranges, options, archive)
 
     print_result(len(page_ranges))
+    return output_files
 
 
 def split_pdf_file(
     reader: PdfReader,
     filename: str,
-    page_range: set[int],
-) -> None:
-    if max(page_range) > len(reader.pages):
-        raise ValueError(
-            "Error: The specified page range exceeds the number of pages in the PDF file."
-        )
+    page_range: PageSelection,
+    options: WriteOptions = WriteOptions(),
+    output_file: Optional[str] = None,
+    archive: Optional[ArchiveWriter] = None,
+) -> list[str]:
+    check_page_range(reader, page_range)
 
-    with open(f"{filename}_split.pdf", "wb") as out_file:
-        writer = PdfWriter()
-        for page in page_range:
-            writer.add_page(reader.pages[page - 1])
-        writer.write(out_file)
-    print_result(1)
+    if output_file is None:
+        output_file = f"{filename}_split.pdf"
+    add_total(len(page_range))
+    with removed_on_failure(
+        [output_file] if archive is None and output_file != STDIO else []
+    ), open_part(output_file, archive) as out_file:
+        write_pages(reader, page_range, out_file, options)
+    # Messages must not end up in the PDF written to stdout.
+    print_result(1, sys.stderr if output_file == STDIO else None)
+    return [output_file]
 
 
 def split_pdf(
     source_file: str,
     page_range: str,
     mode: SplitMode = SplitMode.SINGLE_FILE,
+    jobs: int = 1,
+    options: WriteOptions = WriteOptions(),
+    readers: Optional[ReaderCache] = None,
+    use_mmap: bool = False,
+    cache: Optional[ResultCache] = None,
+    output_dir: str = ".",
+    archive: Optional[str] = None,
 ) -> None:
-    reader: PdfReader = PdfReader(source_file)
+    """
+    Split `source_file`, or stdin if it is `-`, into files named after it in
+    `output_dir`. With an `output_dir` of `-`, the single_file output is
+    written to stdout. With an `archive`, the files are written into that
+    ZIP or tar archive instead, as each one is finished. A split that fails
+    or is cancelled (see `track_progress`) removes the files it wrote.
+    """
+    filename: str = "stdin" if source_file == STDIO else Path(source_file).stem
+    if output_dir == STDIO and mode != SplitMode.SINGLE_FILE:
+        raise ValueError("Error: Only single_file splits can be written to stdout.")
+
+    key: Optional[str] = None
+    if cache is not None and STDIO not in (source_file, output_dir):
+        key = cache.key(
+            Command.SPLIT,
+            [source_file],
+            filename,
+            parse_page_expression(page_range),
+            mode,
+            options,
+            archive_suffix(archive) if archive is not None else None,
+        )
+        restored: Optional[list[str]] = (
+            cache.restore(key, directory=output_dir)
+            if archive is None
+            else cache.restore(key, [archive])
+        )
+        if restored is not None:
+            # An archive is restored as one file, whatever it holds.
+            print_result(cache.metadata(key).get("parts", len(restored)))
+            return
 
-    filename: str = Path(source_file).stem
+    reader: PdfReader = open_reader(source_file, readers, use_mmap)
+    pages: int = page_count(reader)
+    # Worker processes open the source themselves, which stdin does not allow.
+    worker_source: Optional[str] = None if source_file == STDIO else source_file
 
-    split_func: Callable[[PdfReader, str, set[int]], None] | Callable[
-        [PdfReader, str, list[set[int]]], None
+    split_func: Callable[[PdfReader, str, PageSelection], list[str]] | Callable[
+        [PdfReader, str, list[PageSelection]], list[str]
     ] | None = None
 
     match mode:
         case SplitMode.SINGLE_FILE:
             split_func = partial(
                 split_pdf_file,
-                page_range=parse_page_range(page_range),
+                page_range=parse_page_range(page_range, pages),
+                options=options,
+                output_file=STDIO if output_dir == STDIO else None,
             )
         case SplitMode.RANGE_FILES:
             split_func = partial(
                 split_pdf_file_by_ranges,
-                page_ranges=parse_page_ranges(page_range),
+                page_ranges=parse_page_ranges(page_range, pages),
+                source_file=worker_source,
+                jobs=jobs,
+                options=options,
+                use_mmap=use_mmap,
             )
         case SplitMode.MULTI_FILES:
             split_func = partial(
                 split_pdf_file_by_pages,
-                page_range=parse_page_range(page_range),
+                page_range=parse_page_range(page_range, pages),
+                source_file=worker_source,
+                jobs=jobs,
+                options=options,
+                use_mmap=use_mmap,
             )
         case _:
             raise ValueError(f"Error: Unsupported split mode: {mode}")
 
-    split_func(reader=reader, filename=filename)
+    with (
+        ArchiveWriter(archive) if archive is not None else nullcontext()
+    ) as archive_writer:
+        output_files: list[str] = split_func(
+            reader=reader,
+            filename=filename
+            if output_dir == STDIO
+            else os.path.join(output_dir, filename),
+            archive=archive_writer,
+        )
+    parts: int = len(output_files)
+    if archive is not None:
+        output_files = [archive]
+    if cache is not None and key is not None:
+        cache.store(key, output_files, {"parts": parts})
+
+
+def check_split(
+    source_file: str,
+    page_range: str,
+    mode: SplitMode = SplitMode.SINGLE_FILE,
+    readers: Optional[ReaderCache] = None,
+    use_mmap: bool = False,
+) -> None:
+    """Check a split against the page count of the source file without writing anything."""
+    reader: PdfReader = open_reader(source_file, readers, use_mmap)
+    if mode == SplitMode.RANGE_FILES:
+        check_page_ranges(reader, parse_page_ranges(page_range, page_count(reader)))
+    else:
+        check_page_range(reader, parse_page_range(page_range, page_count(reader)))
+
+
+def input_filename(file: str) -> str:
+    return file.partition(":")[0]
+
+
+def append_pages(
+    merger: PdfWriter,
+    reader: PdfReader,
+    page_range: Optional[str] = None,
+) -> int:
+    """Append the pages of `page_range`, or all pages, of `reader` and return their number."""
+    if page_range is not None:
+        pages: PageSelection = parse_page_range(page_range, page_count(reader))
+        if not pages:
+            raise ValueError(EMPTY_PAGE_RANGE_ERROR)
+        for page in pages:
+            check_cancelled()
+            merger.add_page(get_page(reader, page - 1))
+        return len(pages)
+    merger.append(reader)
+    return page_count(reader)
+
+
+def append_input_file(
+    merger: PdfWriter,
+    file: str,
+    inputs: ReaderPrefetcher,
+) -> PdfReader:
+    """Append the pages of `file`, whose reader is the next one of `inputs`."""
+    check_cancelled()
+    with phase("copy"):
+        reader: PdfReader = inputs.next_reader()
+        pages: int = append_pages(
+            merger, reader, file.partition(":")[2] if ":" in file else None
+        )
+    # Each input file counts as one step of the progress of a merge.
+    advance(steps=1, pages=pages)
+    return reader
+
+
+def merge_pdf_streaming(
+    output_file: str,
+    input_files: list[str],
+    options: WriteOptions = WriteOptions(),
+    readers: Optional[ReaderCache] = None,
+    use_mmap: bool = False,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> None:
+    with removed_on_failure([output_file] if output_file != STDIO else []), open_output(
+        output_file, seekable=False
+    ) as out_file:
+        merger = StreamingPdfWriter(
+            out_file,
+            dedupe=options.dedupe,
+            compression_level=options.compression_level if options.optimize else None,
+        )
+
+        def release_reader(reader: PdfReader) -> None:
+            merger.release(reader)
+            # The reader holds the whole input in memory, or a mapping of it,
+            # and sits in reference cycles, so its buffer is freed here rather
+            # than at the next GC run.
+            reader.stream.close()
+
+        # Readers of a shared cache are only released by this writer; the
+        # cache keeps them open for the next merge.
+        shared: bool = readers is not None
+        if readers is None:
+            readers = ReaderCache(on_evict=release_reader)
+        last_use: dict[Path, int] = {
+            Path(input_filename(file)).resolve(): i
+            for i, file in enumerate(input_files)
+        }
+        with ReaderPrefetcher(
+            readers, [input_filename(file) for file in input_files], use_mmap, prefetch
+        ) as inputs:
+            for i, file in enumerate(input_files):
+                reader: PdfReader = append_input_file(merger, file, inputs)
+                written: int = merger.bytes_written
+                with phase("write"):
+                    merger.flush()
+                advance(bytes_written=merger.bytes_written - written)
+                if last_use[Path(input_filename(file)).resolve()] == i:
+                    if shared:
+                        merger.release(reader)
+                    else:
+                        readers.discard(input_filename(file))
+        written = merger.bytes_written
+        with phase("write"):
+            merger.close()
+        advance(bytes_written=merger.bytes_written - written)
+        # stdout can not tell its position; the writer counts what it wrote.
+        record_output(merger.bytes_written)
+        if not shared:
+            readers.clear()
 
 
 def merge_pdf(
     output_file: str,
     input_files: list[str],
+    stream: bool = False,
+    options: WriteOptions = WriteOptions(),
+    readers: Optional[ReaderCache] = None,
+    use_mmap: bool = False,
+    cache: Optional[ResultCache] = None,
+    prefetch: int = DEFAULT_PREFETCH,
 ) -> None:
+    """
+    Merge `input_files` into `output_file`, in their order. One input file,
+    and the output file, can be `-` for stdin and stdout. The next
+    `prefetch` input files are opened and parsed on background threads
+    while one is merged, see `ReaderPrefetcher`. A merge that fails or is
+    cancelled removes its partial output file.
+    """
+    stdio: bool = output_file == STDIO or any(
+        input_filename(file) == STDIO for file in input_files
+    )
+    if cache is not None and not stdio:
+        # Streamed and buffered merges write the same pages, so they share
+        # their results.
+        key: str = cache.key(
+            Command.MERGE,
+            [input_filename(file) for file in input_files],
+            [
+                parse_page_expression(file.partition(":")[2]) if ":" in file else None
+                for file in input_files
+            ],
+            options,
+        )
+        if cache.restore(key, [output_file]) is None:
+            merge_pdf(
+                output_file=output_file,
+                input_files=input_files,
+                stream=stream,
+                options=options,
+                readers=readers,
+                use_mmap=use_mmap,
+                prefetch=prefetch,
+            )
+            cache.store(key, [output_file])
+        return
+
+    add_total(len(input_files))
+    if stream:
+        merge_pdf_streaming(
+            output_file=output_file,
+            input_files=input_files,
+            options=options,
+            readers=readers,
+            use_mmap=use_mmap,
+            prefetch=prefetch,
+        )
+        return
+
     merger = PdfWriter()
+    if readers is None:
+        readers = ReaderCache()
+    # Readers stay referenced until the write, even once evicted: the writer
+    # tracks copied objects by `id(reader)`, which a freed reader would hand
+    # over to the next one.
+    with ReaderPrefetcher(
+        readers, [input_filename(file) for file in input_files], use_mmap, prefetch
+    ) as inputs:
+        used_readers: list[PdfReader] = [
+            append_input_file(merger, file, inputs) for file in input_files
+        ]
+
+    with removed_on_failure([output_file] if output_file != STDIO else []), open_output(
+        output_file
+    ) as out_file:
+        write_pdf(merger, out_file, options)
+    merger.close()
+
+
+def check_merge(
+    input_files: list[str],
+    readers: Optional[ReaderCache] = None,
+    use_mmap: bool = False,
+) -> None:
+    """Check the page ranges of a merge against the page count of each input file."""
     for file in input_files:
+        reader: PdfReader = open_reader(input_filename(file), readers, use_mmap)
         if ":" in file:
-            filename: str
-            page_range: str
-            filename, page_range = file.split(":")
-            reader = PdfReader(filename)
-            for page in parse_page_range(page_range):
-                merger.add_page(reader.pages[page - 1])
-        else:
-            merger.append(file)
+            check_page_range(
+                reader,
+                parse_page_range(file.partition(":")[2], page_count(reader)),
+                f"Error: The page range of <{file}> exceeds the number of pages in the PDF file.",
+                f"Error: The page range of <{file}> selects no pages.",
+            )
 
-    merger.write(output_file)
-    merger.close()
 
+def encrypt_pdf(
+    input_file: str,
+    new_password: Optional[str] = None,
+    current_password: Optional[str] = None,
+    prompt: bool = True,
+) -> None:
+    """Encrypt `input_file` in place, or stdin to stdout if it is `-`."""
+    with phase("open"):
+        reader = open_pdf_reader(input_file)
 
-def encrypt_pdf(input_file: str) -> None:
-    reader = PdfReader(input_file)
-    writer = PdfWriter()
+    unlock_reader(reader, current_password, prompt)
+
+    if new_password is None:
+        if not prompt:
+            raise ValueError("Error: A new password is required.")
+        new_password = getpass(
+            prompt="Enter the new password (leave empty to remove the password): "
+        )
+
+    # Objects are copied one by one under their own numbers instead of
+    # cloning the whole document into a writer first.
+    with (
+        open_output(STDIO, seekable=False)
+        if input_file == STDIO
+        else replace_file(input_file)
+    ) as out_file:
+        write_object_copy(reader, out_file, new_password)
 
+
+def unlock_reader(
+    reader: PdfReader,
+    current_password: Optional[str] = None,
+    prompt: bool = True,
+) -> None:
     if reader.is_encrypted:
-        old_password: str = getpass(prompt="Enter the current password: ")
-        reader.decrypt(password=old_password)
+        if current_password is None:
+            if not prompt:
+                raise ValueError(
+                    "Error: The file is encrypted and no current password was given."
+                )
+            current_password = getpass(prompt="Enter the current password: ")
+        if not reader.decrypt(password=current_password):
+            raise ValueError("Error: The current password is incorrect.")
 
-    writer.clone_document_from_reader(reader)
-    new_password: str = getpass(
-        prompt="Enter the new password (leave empty to remove the password): "
-    )
 
-    if new_password is not "":
-        writer.encrypt(new_password)
+def encrypt_each_pdf_file(
+    input_files: Sequence[str],
+    new_password: str,
+    current_password: Optional[str],
+) -> list[tuple[str, str]]:
+    """Encrypt every file, returning the errors instead of stopping at the first one."""
+    errors: list[tuple[str, str]] = []
+    for input_file in input_files:
+        try:
+            encrypt_pdf(input_file, new_password, current_password, prompt=False)
+        except Exception as e:
+            errors.append((input_file, str(e)))
+    return errors
+
+
+def encrypt_pdf_files(
+    input_files: list[str],
+    new_password: Optional[str] = None,
+    current_password: Optional[str] = None,
+    jobs: int = 1,
+    prompt: bool = True,
+) -> None:
+    """
+    Encrypt several files with the same passwords, on `jobs` processes. The
+    new password is prompted for once; encrypted files fail unless
+    `current_password` is given. Every file is attempted before the failures
+    are reported. Nothing is prompted for unless `prompt` is set.
+    """
+    if len(input_files) == 1:
+        encrypt_pdf(input_files[0], new_password, current_password, prompt)
+        return
+
+    if new_password is None:
+        if not prompt:
+            raise ValueError("Error: A new password is required.")
+        new_password = getpass(
+            prompt="Enter the new password (leave empty to remove the password): "
+        )
+
+    errors: list[tuple[str, str]]
+    if jobs > 1:
+        results: list[list[tuple[str, str]]] = run_in_process_pool(
+            encrypt_each_pdf_file,
+            [
+                (chunk, new_password, current_password)
+                for chunk in chunked(input_files, jobs)
+            ],
+            jobs=jobs,
+        )
+        errors = [error for result in results for error in result]
+    else:
+        errors = encrypt_each_pdf_file(input_files, new_password, current_password)
+
+    for input_file, error in sorted(errors):
+        print(f"[failed] {input_file}: {error}")
+    print(f"Encrypted {len(input_files) - len(errors)} of {len(input_files)} files")
+    if errors:
+        raise ValueError(
+            f"Error: {len(errors)} of {len(input_files)} files could not be encrypted."
+        )
+
+
+def check_encrypt(input_file: str, current_password: Optional[str] = None) -> None:
+    """Check that `input_file` can be opened with `current_password`, when one is given."""
+    reader = open_pdf_reader(input_file)
+    if (
+        reader.is_encrypted
+        and current_password is not None
+        and not reader.decrypt(password=current_password)
+    ):
+        raise ValueError("Error: The current password is incorrect.")
+
 
-    with open(input_file, "wb") as file:
-        writer.write(file)
+def split_pdf_streams(
+    source: BinaryIO,
+    page_range: str,
+    mode: SplitMode = SplitMode.SINGLE_FILE,
+    options: WriteOptions = WriteOptions(),
+) -> list[BytesIO]:
+    """
+    Split the PDF read from `source` and return the files it is split into,
+    in order, as rewound in-memory streams.
+    """
+    reader = PdfReader(source)
+    pages: int = page_count(reader)
+
+    page_groups: Sequence[Iterable[int]]
+    match mode:
+        case SplitMode.SINGLE_FILE:
+            selection: PageSelection = parse_page_range(page_range, pages)
+            check_page_range(reader, selection)
+            page_groups = [selection]
+        case SplitMode.RANGE_FILES:
+            page_groups = parse_page_ranges(page_range, pages)
+            check_page_ranges(reader, page_groups)
+        case SplitMode.MULTI_FILES:
+            selection = parse_page_range(page_range, pages)
+            check_page_range(reader, selection)
+            page_groups = [[page] for page in selection]
+        case _:
+            raise ValueError(f"Error: Unsupported split mode: {mode}")
+
+    outputs: list[BytesIO] = []
+    for page_group in page_groups:
+        out_file = BytesIO()
+        write_pages(reader, page_group, out_file, options)
+        out_file.seek(0)
+        outputs.append(out_file)
+    return outputs
+
+
+def merge_pdf_streams(
+    inputs: Sequence[BinaryIO | tuple[BinaryIO, str]],
+    output: Optional[BinaryIO] = None,
+    options: WriteOptions = WriteOptions(),
+) -> BinaryIO:
+    """
+    Merge the PDFs read from `inputs`, each one a stream or a (stream, page
+    range) pair, into `output`, or a new in-memory stream which is returned
+    rewound.
+    """
+    merger = PdfWriter()
+    # Readers stay referenced until the write, as in `merge_pdf`.
+    readers: list[PdfReader] = []
+    for source in inputs:
+        page_range: Optional[str] = None
+        if isinstance(source, tuple):
+            source, page_range = source
+        readers.append(PdfReader(source))
+        with phase("copy"):
+            append_pages(merger, readers[-1], page_range)
+
+    out_file: BinaryIO = BytesIO() if output is None else output
+    write_pdf(merger, out_file, options)
+    merger.close()
+    if output is None:
+        out_file.seek(0)
+    return out_file
+
+
+def encrypt_pdf_stream(
+    source: BinaryIO,
+    output: BinaryIO,
+    new_password: str,
+    current_password: Optional[str] = None,
+) -> None:
+    """
+    Write the PDF read from `source` to `output` encrypted with
+    `new_password`, or unencrypted if it is empty.
+    """
+    reader = PdfReader(source)
+    unlock_reader(reader, current_password, prompt=False)
+    write_object_copy(reader, output, new_password)
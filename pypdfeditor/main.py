@@ -1,12 +1,12 @@
 #!/usr/bin/env python3
 
 from argparse import ArgumentError, ArgumentTypeError
-from typing import Optional
+from functools import partial
 
-from read_args import read_args
-from type_definitions import Args, EncryptArgs, MergeArgs, SplitArgs
-
-from pypdfeditor.commands import CliCommand, EncryptCommand, MergeCommand, SplitCommand
+from pypdfeditor.commands import CliCommand, create_command
+from pypdfeditor.metrics import collect_metrics, write_metrics_json
+from pypdfeditor.read_args import read_args
+from pypdfeditor.type_definitions import Args
 from pypdfeditor.validator import validate_args
 
 
@@ -15,18 +15,17 @@ def main() -> None:
         args: Args = read_args()
         validate_args(args=args)
 
-        command: Optional[CliCommand] = None
-
-        if isinstance(args.options, SplitArgs):
-            command = SplitCommand(options=args.options)
-        elif isinstance(args.options, MergeArgs):
-            command = MergeCommand(options=args.options)
-        elif isinstance(args.options, EncryptArgs):
-            command = EncryptCommand(options=args.options)
+        command: CliCommand = create_command(args)
+        if args.validate_only:
+            command.validate()
+            print("The arguments are valid.")
+        elif args.metrics_json is not None:
+            with collect_metrics(
+                command=args.command,
+                on_finish=partial(write_metrics_json, path=args.metrics_json),
+            ):
+                command.execute()
         else:
-            raise ValueError(f"Invalid command {args.command}")
-
-        if command is not None:
             command.execute()
 
     except (ArgumentTypeError, ArgumentError, ValueError) as e:
@@ -0,0 +1,32 @@
+import mmap
+import os
+import sys
+from io import BytesIO
+
+from PyPDF2 import PdfReader
+
+from .type_definitions import STDIO
+
+
+def open_pdf_reader(path: str, use_mmap: bool = False) -> PdfReader:
+    """
+    Open a `PdfReader` on `path`. Given a path, PyPDF2 reads the whole file
+    into memory first; with `use_mmap` it reads from a read-only mapping of
+    the file instead, so only the parts of the file that are parsed are
+    paged in, from the OS page cache shared with other processes.
+
+    The mapping is closed along with `reader.stream`. The file must not be
+    truncated while the reader is in use.
+
+    A `path` of `-` reads stdin, which can not be mapped, into memory.
+    """
+    if path == STDIO:
+        return PdfReader(BytesIO(sys.stdin.buffer.read()))
+    if not use_mmap:
+        return PdfReader(path)
+    with open(path, "rb") as file:
+        # An empty file can not be mapped; let PdfReader report it.
+        if os.fstat(file.fileno()).st_size == 0:
+            return PdfReader(file)
+        # The mapping keeps its own reference to the file.
+        return PdfReader(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
@@ -0,0 +1,136 @@
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+R = TypeVar("R")
+
+# reader open and xref parse, page copy, write and serialize, fsync
+PHASES = ("open", "copy", "write", "fsync")
+
+_recorder: ContextVar[Optional["Metrics"]] = ContextVar("metrics", default=None)
+
+
+@dataclass
+class Metrics:
+    """
+    Timings and output sizes of one command. Phase times are exclusive: time
+    spent opening a reader while copying pages counts as `open` only. Times
+    of worker processes are added up, so phases may sum to more than
+    `seconds`.
+    """
+
+    command: str = ""
+    seconds: float = 0.0
+    phases: dict[str, float] = field(
+        default_factory=lambda: {name: 0.0 for name in PHASES}
+    )
+    bytes_written: int = 0
+    files_written: int = 0
+    # Peak resident set size of the process so far, not only of this command.
+    peak_rss_bytes: int = 0
+    error: Optional[str] = None
+    _stack: list[list[Any]] = field(default_factory=list, repr=False)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def merge(self, other: "Metrics") -> None:
+        for name, seconds in other.phases.items():
+            self.add_phase(name, seconds)
+        self.bytes_written += other.bytes_written
+        self.files_written += other.files_written
+
+    def as_dict(self) -> dict[str, Any]:
+        metrics: dict[str, Any] = asdict(self)
+        del metrics["_stack"]
+        return metrics
+
+
+def current_metrics() -> Optional[Metrics]:
+    return _recorder.get()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the block as phase `name` of the metrics being collected, if any."""
+    metrics: Optional[Metrics] = _recorder.get()
+    if metrics is None:
+        yield
+        return
+
+    # [start, time spent in nested phases]
+    frame: list[float] = [time.perf_counter(), 0.0]
+    metrics._stack.append(frame)
+    try:
+        yield
+    finally:
+        metrics._stack.pop()
+        elapsed: float = time.perf_counter() - frame[0]
+        metrics.add_phase(name, elapsed - frame[1])
+        if metrics._stack:
+            metrics._stack[-1][1] += elapsed
+
+
+def record_output(size: int) -> None:
+    """Count a written file of `size` bytes."""
+    metrics: Optional[Metrics] = _recorder.get()
+    if metrics is not None:
+        metrics.bytes_written += size
+        metrics.files_written += 1
+
+
+def peak_rss_bytes() -> int:
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kibibytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@contextmanager
+def collect_metrics(
+    command: str = "",
+    on_finish: Optional[Callable[[Metrics], None]] = None,
+) -> Iterator[Metrics]:
+    """
+    Collect the metrics of the editor calls made in the block. `on_finish` is
+    called with them once the block ends, also when it raises, e.g. to send
+    them to a metrics store:
+
+        with collect_metrics("split", on_finish=store.send):
+            split_pdf(...)
+    """
+    metrics = Metrics(command=command)
+    token = _recorder.set(metrics)
+    start: float = time.perf_counter()
+    try:
+        yield metrics
+    except BaseException as e:
+        metrics.error = str(e)
+        raise
+    finally:
+        _recorder.reset(token)
+        metrics.seconds = time.perf_counter() - start
+        metrics.peak_rss_bytes = peak_rss_bytes()
+        if on_finish is not None:
+            on_finish(metrics)
+
+
+def call_with_metrics(func: Callable[..., R], *args: Any) -> tuple[R, Metrics]:
+    """Run `func(*args)` in a worker process and return its metrics with its result."""
+    with collect_metrics() as metrics:
+        result: R = func(*args)
+    return result, metrics
+
+
+def write_metrics_json(metrics: Metrics, path: str) -> None:
+    """Write `metrics` as JSON to `path`, or to stderr if `path` is '-'."""
+    text: str = json.dumps(metrics.as_dict(), indent=2)
+    if path == "-":
+        print(text, file=sys.stderr)
+        return
+    with open(path, "w") as file:
+        file.write(text + "\n")
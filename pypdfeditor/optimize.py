@@ -0,0 +1,98 @@
+from hashlib import sha256
+from io import BytesIO
+from typing import Any, Iterable
+
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NullObject,
+    PdfObject,
+    StreamObject,
+)
+
+# Dictionaries that only describe fonts can be shared once the font file
+# streams they point to have been merged.
+SHAREABLE_DICTIONARY_TYPES = ("/Font", "/FontDescriptor", "/Encoding")
+
+
+def is_shareable(obj: PdfObject) -> bool:
+    if isinstance(obj, StreamObject):
+        return True
+    return (
+        isinstance(obj, DictionaryObject)
+        and obj.get("/Type") in SHAREABLE_DICTIONARY_TYPES
+    )
+
+
+def object_digest(obj: PdfObject) -> bytes:
+    buffer = BytesIO()
+    obj.write_to_stream(buffer, None)
+    return sha256(buffer.getvalue()).digest()
+
+
+def replace_references(obj: Any, duplicates: dict[int, IndirectObject]) -> None:
+    """Point every direct reference of `obj` to a duplicate at its original."""
+    stack: list[Any] = [obj]
+    while stack:
+        data = stack.pop()
+        if isinstance(data, (DictionaryObject, ArrayObject)):
+            for key, value in data.items():
+                if isinstance(value, IndirectObject):
+                    original = duplicates.get(value.idnum)
+                    if original is not None and value.pdf is original.pdf:
+                        data[key] = original
+                else:
+                    stack.append(value)
+
+
+class StreamDeduplicator:
+    """
+    Merges identical streams (font files, images, form XObjects, ...) and the
+    font dictionaries using them. Duplicates are rewritten as `null` objects,
+    which keeps object numbers and the xref table valid.
+
+    Digests of the objects already kept are remembered between calls, so a
+    writer that emits its objects in several batches is deduplicated as a
+    whole.
+    """
+
+    def __init__(self) -> None:
+        self._originals: dict[bytes, IndirectObject] = {}
+        self.removed = 0
+
+    def dedupe(self, writer: PdfWriter, idnums: Iterable[int]) -> None:
+        idnums = list(idnums)
+        # Font dictionaries only become identical once the streams they
+        # reference are merged, so repeat until nothing changes.
+        while True:
+            duplicates: dict[int, IndirectObject] = {}
+            for idnum in idnums:
+                obj: PdfObject = writer._objects[idnum - 1]
+                if not is_shareable(obj):
+                    continue
+                digest: bytes = object_digest(obj)
+                original = self._originals.setdefault(
+                    digest, IndirectObject(idnum, 0, writer)
+                )
+                if original.idnum != idnum:
+                    duplicates[idnum] = original
+
+            if not duplicates:
+                return
+
+            for idnum in idnums:
+                replace_references(writer._objects[idnum - 1], duplicates)
+            for idnum in duplicates:
+                placeholder = NullObject()
+                placeholder.indirect_reference = IndirectObject(idnum, 0, writer)  # type: ignore[attr-defined]
+                writer._objects[idnum - 1] = placeholder
+            self.removed += len(duplicates)
+
+
+def dedupe_writer(writer: PdfWriter) -> int:
+    """Deduplicate every object of `writer` and return how many were merged."""
+    deduplicator = StreamDeduplicator()
+    deduplicator.dedupe(writer, range(1, len(writer._objects) + 1))
+    return deduplicator.removed
@@ -0,0 +1,111 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate, chain
+from typing import overload
+
+
+class PageSelection(Sequence[int]):
+    """
+    Pages in the order they were selected, repeated pages included, stored
+    as the ranges of the page expression, so `1-5000000` or `5000000-1`
+    costs a single range.
+    """
+
+    __slots__ = ("_ranges", "_ends")
+
+    def __init__(self, ranges: Iterable[range] = ()) -> None:
+        self._ranges: tuple[range, ...] = tuple(pages for pages in ranges if pages)
+        # Number of pages up to the end of each range, to index the selection.
+        self._ends: list[int] = list(accumulate(len(pages) for pages in self._ranges))
+
+    @property
+    def ranges(self) -> tuple[range, ...]:
+        return self._ranges
+
+    def max(self) -> int:
+        """The highest page selected, or 0 when no page is."""
+        if not self._ranges:
+            return 0
+        return max(max(pages[0], pages[-1]) for pages in self._ranges)
+
+    def min(self) -> int:
+        if not self._ranges:
+            raise ValueError("min() arg is an empty PageSelection")
+        return min(min(pages[0], pages[-1]) for pages in self._ranges)
+
+    @overload
+    def __getitem__(self, index: int) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "PageSelection":
+        ...
+
+    def __getitem__(self, index: int | slice) -> "int | PageSelection":
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += len(self)
+        position: int = bisect_right(self._ends, index)
+        if index < 0 or position == len(self._ranges):
+            raise IndexError("PageSelection index out of range")
+        return self._ranges[position][
+            index - (self._ends[position - 1] if position else 0)
+        ]
+
+    def _slice(self, index: slice) -> "PageSelection":
+        """The selection at the positions of `index`, cut from the ranges."""
+        positions: range = range(*index.indices(len(self)))
+        step: int = positions.step
+        ranges: list[range] = []
+        spans: list[tuple[int, int, range]] = list(
+            zip([0, *self._ends[:-1]], self._ends, self._ranges)
+        )
+        for start, end, pages in spans if step > 0 else reversed(spans):
+            # The positions of the slice from `start` to `end`, the ones of
+            # this range, are `positions[first:last]`.
+            if step > 0:
+                first: int = max(0, -((positions.start - start) // step))
+                last: int = max(0, -((positions.start - end) // step))
+            else:
+                first = max(0, -((end - 1 - positions.start) // -step))
+                last = max(0, -((start - 1 - positions.start) // -step))
+            count: int = min(last, len(positions)) - first
+            if count > 0:
+                page: int = pages[positions[first] - start]
+                pages_step: int = pages.step * step
+                ranges.append(range(page, page + count * pages_step, pages_step))
+        return PageSelection(ranges)
+
+    def __contains__(self, page: object) -> bool:
+        return isinstance(page, int) and any(page in pages for pages in self._ranges)
+
+    def __iter__(self) -> Iterator[int]:
+        return chain.from_iterable(self._ranges)
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PageSelection):
+            if self._ranges == other._ranges:
+                return True
+            # The same pages can be split into ranges differently, e.g.
+            # `1-3,4-5` and `1-5`, so they are compared one by one, without
+            # building either list.
+            return len(self) == len(other) and all(
+                page == other_page for page, other_page in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        spans: list[str] = []
+        for pages in self._ranges:
+            if len(pages) == 1:
+                spans.append(str(pages[0]))
+            else:
+                step: str = f":{abs(pages.step)}" if abs(pages.step) != 1 else ""
+                spans.append(f"{pages[0]}-{pages[-1]}{step}")
+        return f"PageSelection('{','.join(spans)}')"
@@ -0,0 +1,134 @@
+from bisect import bisect_right
+from typing import Any, Optional
+
+from PyPDF2 import PageObject, PdfReader
+from PyPDF2.generic import DictionaryObject, IndirectObject, NameObject
+
+# Page attributes a page takes from its ancestors when it does not set them.
+INHERITABLE_ATTRIBUTES = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+# Deeper trees are taken as broken, e.g. a /Kids entry pointing back up.
+MAX_DEPTH = 64
+
+
+class MalformedPageTree(Exception):
+    pass
+
+
+class PageTree:
+    """
+    Page lookups by descent of the page tree of `reader`, using the /Count
+    of each /Pages node to skip whole subtrees. Unlike `reader.pages`, which
+    loads every page of the document first, this only loads the nodes on the
+    way to the requested pages, and the kids before them at each level.
+    """
+
+    def __init__(self, reader: PdfReader) -> None:
+        self.reader = reader
+        self._pages: dict[int, PageObject] = {}
+        # Number of pages up to the end of each kid scanned so far, by
+        # object number of the node.
+        self._ends: dict[int, list[int]] = {}
+
+    def root(self) -> IndirectObject:
+        # Left unresolved, so the counts of the root are cached by its number.
+        return self.reader.trailer["/Root"].get_object().raw_get("/Pages")
+
+    def __len__(self) -> int:
+        count: Any = self.root().get_object().get("/Count")
+        if not isinstance(count, int):
+            raise MalformedPageTree()
+        return count
+
+    def _kid_count(self, kid: DictionaryObject) -> int:
+        if kid.get("/Type") == "/Page" or "/Kids" not in kid:
+            return 1
+        count: Any = kid.get("/Count")
+        if not isinstance(count, int) or count < 0:
+            raise MalformedPageTree()
+        return count
+
+    def _find_kid(self, reference: Any, index: int) -> tuple[Any, int]:
+        """Return the kid of the node holding its page `index` and the index within the kid."""
+        node: DictionaryObject = reference.get_object()
+        kids: list[Any] = node.get("/Kids", [])
+        ends: list[int] = (
+            self._ends.setdefault(reference.idnum, [])
+            if isinstance(reference, IndirectObject)
+            else []
+        )
+        while (not ends or ends[-1] <= index) and len(ends) < len(kids):
+            count: int = self._kid_count(kids[len(ends)].get_object())
+            ends.append((ends[-1] if ends else 0) + count)
+        position: int = bisect_right(ends, index)
+        if position == len(ends):
+            raise MalformedPageTree()
+        return kids[position], index - (ends[position - 1] if position else 0)
+
+    def __getitem__(self, index: int) -> PageObject:
+        page: Optional[PageObject] = self._pages.get(index)
+        if page is not None:
+            return page
+
+        inherited: dict[str, Any] = {}
+        reference: Any = self.root()
+        offset: int = index
+        for _ in range(MAX_DEPTH):
+            node: DictionaryObject = reference.get_object()
+            if node.get("/Type") == "/Page" or "/Kids" not in node:
+                break
+            for name in INHERITABLE_ATTRIBUTES:
+                if name in node:
+                    inherited[name] = node[name]
+            reference, offset = self._find_kid(reference, offset)
+        else:
+            raise MalformedPageTree()
+        if offset != 0:
+            raise MalformedPageTree()
+
+        page = PageObject(
+            self.reader, reference if isinstance(reference, IndirectObject) else None
+        )
+        page.update(node)
+        for name, value in inherited.items():
+            if name not in page:
+                page[NameObject(name)] = value
+        self._pages[index] = page
+        return page
+
+
+# The tree, and the pages it caches, refer to the reader, so it is kept on
+# the reader itself and freed along with it.
+PAGE_TREE_ATTRIBUTE = "_pypdfeditor_page_tree"
+
+
+def page_tree(reader: PdfReader) -> PageTree:
+    tree: Optional[PageTree] = getattr(reader, PAGE_TREE_ATTRIBUTE, None)
+    if tree is None:
+        tree = PageTree(reader)
+        setattr(reader, PAGE_TREE_ATTRIBUTE, tree)
+    return tree
+
+
+def page_count(reader: PdfReader) -> int:
+    """Number of pages of `reader`, read from the /Count of its page tree."""
+    if reader.flattened_pages is None:
+        try:
+            return len(page_tree(reader))
+        except (MalformedPageTree, KeyError, AttributeError):
+            pass
+    return len(reader.pages)
+
+
+def get_page(reader: PdfReader, index: int) -> PageObject:
+    """
+    Page `index` (from 0) of `reader`, like `reader.pages[index]` but without
+    loading the other pages. Falls back to `reader.pages` once they are
+    loaded, or if the page tree is broken.
+    """
+    if reader.flattened_pages is None and 0 <= index:
+        try:
+            return page_tree(reader)[index]
+        except (MalformedPageTree, KeyError, AttributeError):
+            pass
+    return reader.pages[index]
@@ -0,0 +1,95 @@
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Iterable, Optional, Sequence, TypeVar
+
+from PyPDF2 import PdfReader
+
+from .mapped_file import open_pdf_reader
+from .metrics import Metrics, call_with_metrics, current_metrics
+from .progress import (
+    ProgressCounts,
+    ProgressTracker,
+    call_with_progress,
+    current_tracker,
+)
+
+R = TypeVar("R")
+S = TypeVar("S")
+
+# Chunks handed out per worker, so a slow chunk does not leave the pool idle.
+CHUNKS_PER_JOB = 4
+
+_worker_reader: Optional[PdfReader] = None
+
+
+def init_worker_reader(source_file: str, use_mmap: bool = False) -> None:
+    global _worker_reader
+    _worker_reader = open_pdf_reader(source_file, use_mmap)
+
+
+def worker_reader() -> PdfReader:
+    if _worker_reader is None:
+        raise RuntimeError("Error: Worker reader was not initialized.")
+    return _worker_reader
+
+
+def chunked(items: Sequence[S], jobs: int) -> list[Sequence[S]]:
+    size: int = max(1, -(-len(items) // (jobs * CHUNKS_PER_JOB)))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def run_in_process_pool(
+    func: Callable[..., R],
+    tasks: Iterable[tuple],
+    jobs: int,
+    source_file: Optional[str] = None,
+    use_mmap: bool = False,
+    on_result: Optional[Callable[[R], None]] = None,
+) -> list[R]:
+    """
+    Run `func(*task)` for every task on a pool of `jobs` processes, each one
+    holding its own `PdfReader` on `source_file` if one is given, memory
+    mapped if `use_mmap` is set so the workers share its pages. The first
+    failing task cancels the remaining ones and its exception is re-raised.
+    `on_result` is called with each result as soon as its task finishes.
+
+    When metrics are being collected, each task collects its own in the worker
+    and they are added to the current ones. The same goes for progress, which
+    is reported as each task finishes; once the job is cancelled, the
+    remaining tasks are too.
+    """
+    metrics: Optional[Metrics] = current_metrics()
+    tracker: Optional[ProgressTracker] = current_tracker()
+    if tracker is not None:
+        func = partial(call_with_progress, func)
+    results: list[R] = []
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=None if source_file is None else init_worker_reader,
+        initargs=() if source_file is None else (source_file, use_mmap),
+    ) as executor:
+        futures: list[Future] = [
+            executor.submit(func, *task)
+            if metrics is None
+            else executor.submit(call_with_metrics, func, *task)
+            for task in tasks
+        ]
+        try:
+            for future in as_completed(futures):
+                if metrics is None:
+                    result = future.result()
+                else:
+                    result, task_metrics = future.result()
+                    metrics.merge(task_metrics)
+                if tracker is not None:
+                    counts: ProgressCounts
+                    result, counts = result
+                    tracker.advance(*counts)
+                if on_result is not None:
+                    on_result(result)
+                results.append(result)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
@@ -1,25 +1,118 @@
-def parse_page_range(pages: str) -> set[int]:
-    page_ranges = []
-    for page_range in pages.split(","):
-        if "-" in page_range:
-            start, end = map(int, page_range.split("-"))
-            page_ranges.append(set(range(start, end + 1)))
-        else:
-            page_ranges.append({int(page_range)})
+import re
+from functools import lru_cache, partial
+from typing import NamedTuple, Optional
+
+from .page_range import PageSelection
+
+# Bound of a span standing for the last page; bounds below zero count from
+# the end of the document.
+LAST = -1
+
+# One comma separated item of a page expression: `a` or `a-b` (matched on
+# their own, as they make up most of long expressions), `odd`, `even`, or
+# `[start]-[end][:step]` where a bound is a page number or `last`. Anything
+# that is not an item at the position reached is caught by the last group,
+# so consecutive matches cover the whole expression in a single pass.
+SPAN_PATTERN = re.compile(
+    r"(?:([1-9]\d*)(?:-([1-9]\d*))?|(odd|even)|(last|[1-9]\d*)?(-)?(last|[1-9]\d*)?(?::([1-9]\d*))?)(,|\Z)"
+    r"|([\s\S]+)"
+)
+
+
+class PageSpan(NamedTuple):
+    """
+    Pages from `start` to `end` included, backwards if `end` is a page
+    number before `start`. A span running to the last page never runs
+    backwards: once it starts past that page, an `odd` or `even` `keyword`
+    span selects nothing, and any other only its missing first page, which
+    the page check then reports.
+    """
+
+    start: int
+    end: int
+    step: int = 1
+    keyword: bool = False
+
+    def resolve(self, page_count: Optional[int] = None) -> range:
+        start: int = self.start
+        end: int = self.end
+        if start < 0 or end < 0:
+            if page_count is None:
+                raise ValueError(
+                    "Error: Open page ranges need the page count of the file."
+                )
+            start = start if start > 0 else page_count + 1 + start
+            end = end if end > 0 else page_count + 1 + end
+        if start <= end:
+            return range(start, end + 1, self.step)
+        if self.end < 0:
+            return range(0) if self.keyword else range(start, start + 1)
+        return range(start, end - 1, -self.step)
 
-    pages_set = set()
-    for page_set in page_ranges:
-        pages_set |= page_set
 
-    return pages_set
+# Builds a span without the argument handling of `PageSpan()`, which is most
+# of the cost of parsing a simple item.
+new_span = partial(tuple.__new__, PageSpan)
 
 
-def parse_page_ranges(pages: str) -> list[set[int]]:
-    page_ranges = []
-    for page_range in pages.split(","):
-        if "-" in page_range:
-            start, end = map(int, page_range.split("-"))
-            page_ranges.append(set(range(start, end + 1)))
+def parse_bound(bound: str) -> int:
+    return LAST if bound == "last" else int(bound)
+
+
+def parse_span(
+    keyword: Optional[str],
+    start: Optional[str],
+    dash: Optional[str],
+    end: Optional[str],
+    step: Optional[str],
+) -> PageSpan:
+    if keyword is not None:
+        return PageSpan(1 if keyword == "odd" else 2, LAST, 2, keyword=True)
+    if dash is None:
+        # Single pages are matched on their own, so this is `last` or garbage.
+        if start != "last" or end is not None or step is not None:
+            raise ValueError("Error: Invalid range format.")
+        return PageSpan(LAST, LAST)
+    if start is None and end is None:
+        raise ValueError("Error: Invalid range format.")
+    return PageSpan(
+        1 if start is None else parse_bound(start),
+        LAST if end is None else parse_bound(end),
+        1 if step is None else int(step),
+    )
+
+
+@lru_cache(maxsize=256)
+def parse_page_expression(pages: str) -> tuple[PageSpan, ...]:
+    """
+    Parse a page expression such as `1-3,8-,last`, `10-1`, `1-100:2` or
+    `odd`. The spans are resolved against the page count of the file once it
+    is open; the validator and the editor share the parsed result.
+    """
+    spans: list[PageSpan] = []
+    for first, last, *groups, separator, rest in SPAN_PATTERN.findall(pages):
+        if rest:
+            break
+        if first:
+            start: int = int(first)
+            spans.append(new_span((start, int(last) if last else start, 1, False)))
         else:
-            page_ranges.append({int(page_range)})
-    return page_ranges
+            spans.append(parse_span(*(group or None for group in groups)))
+        if not separator:
+            return tuple(spans)
+    raise ValueError("Error: Invalid range format.")
+
+
+def parse_page_range(pages: str, page_count: Optional[int] = None) -> PageSelection:
+    return PageSelection(
+        span.resolve(page_count) for span in parse_page_expression(pages)
+    )
+
+
+def parse_page_ranges(
+    pages: str, page_count: Optional[int] = None
+) -> list[PageSelection]:
+    return [
+        PageSelection([span.resolve(page_count)])
+        for span in parse_page_expression(pages)
+    ]
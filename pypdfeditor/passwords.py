@@ -0,0 +1,45 @@
+import os
+from argparse import ArgumentTypeError
+
+PASSWORD_SOURCES = ("env", "fd", "file")
+
+
+def read_password(source: str) -> str:
+    """
+    Read a password from `env:NAME` (an environment variable), `fd:N` (the
+    first line read from a file descriptor) or `file:PATH` (the first line
+    of a key file).
+    """
+    kind, _, value = source.partition(":")
+    match kind:
+        case "env":
+            if value not in os.environ:
+                raise ArgumentTypeError(
+                    f"Error: Environment variable {value} is not set."
+                )
+            return os.environ[value]
+        case "fd":
+            try:
+                descriptor: int = int(value)
+            except ValueError:
+                raise ArgumentTypeError(f"Error: Invalid file descriptor {value!r}.")
+            try:
+                with open(descriptor, closefd=False) as file:
+                    return file.readline().rstrip("\r\n")
+            except OSError as e:
+                raise ArgumentTypeError(
+                    f"Error: Can not read file descriptor {descriptor}: {e.strerror}."
+                )
+        case "file":
+            try:
+                with open(value) as file:
+                    return file.readline().rstrip("\r\n")
+            except OSError as e:
+                raise ArgumentTypeError(
+                    f"Error: Can not read key file <{value}>: {e.strerror}."
+                )
+        case _:
+            raise ArgumentTypeError(
+                f"Error: Invalid password source {source!r}, "
+                f"expected one of {', '.join(f'{kind}:...' for kind in PASSWORD_SOURCES)}."
+            )
@@ -0,0 +1,244 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TextIO,
+    TypeVar,
+)
+
+R = TypeVar("R")
+
+_tracker: ContextVar[Optional["ProgressTracker"]] = ContextVar("progress", default=None)
+
+
+class JobCancelled(Exception):
+    def __init__(self) -> None:
+        super().__init__("Error: The job was cancelled.")
+
+
+class CancellationToken:
+    """
+    Asks a job to stop. The job checks it between pages, raises
+    `JobCancelled` and removes the files it wrote. It can be cancelled from
+    any thread.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class Progress(NamedTuple):
+    """
+    Progress of a job: `done` of its `total` steps, which are the pages of a
+    split and the input files of a merge.
+    """
+
+    done: int
+    total: int
+    pages: int
+    bytes_written: int
+    seconds: float
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the rate so far, or None before the first step."""
+        if self.done == 0 or self.total == 0:
+            return None
+        return self.seconds * max(0, self.total - self.done) / self.done
+
+
+class ProgressCounts(NamedTuple):
+    steps: int = 0
+    pages: int = 0
+    bytes_written: int = 0
+
+
+class ProgressTracker:
+    """Counts the work of a job for `on_progress` and checks `token` as it goes."""
+
+    def __init__(
+        self,
+        on_progress: Optional[Callable[[Progress], None]] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> None:
+        self.on_progress = on_progress
+        self.token = token
+        self.total = 0
+        self.counts = ProgressCounts()
+        self._start: float = time.perf_counter()
+
+    def check_cancelled(self) -> None:
+        if self.token is not None and self.token.cancelled:
+            raise JobCancelled()
+
+    def add_total(self, steps: int) -> None:
+        self.total += steps
+        self._report()
+
+    def advance(self, steps: int = 0, pages: int = 0, bytes_written: int = 0) -> None:
+        """Count work done and raise `JobCancelled` if the job was cancelled meanwhile."""
+        self.counts = ProgressCounts(
+            self.counts.steps + steps,
+            self.counts.pages + pages,
+            self.counts.bytes_written + bytes_written,
+        )
+        self._report()
+        self.check_cancelled()
+
+    def _report(self) -> None:
+        if self.on_progress is not None:
+            self.on_progress(
+                Progress(
+                    done=self.counts.steps,
+                    total=self.total,
+                    pages=self.counts.pages,
+                    bytes_written=self.counts.bytes_written,
+                    seconds=time.perf_counter() - self._start,
+                )
+            )
+
+
+def current_tracker() -> Optional[ProgressTracker]:
+    return _tracker.get()
+
+
+@contextmanager
+def track_progress(
+    on_progress: Optional[Callable[[Progress], None]] = None,
+    token: Optional[CancellationToken] = None,
+) -> Iterator[ProgressTracker]:
+    """
+    Report the progress of the editor calls made in the block to
+    `on_progress`, and stop them once `token` is cancelled:
+
+        token = CancellationToken()
+        with track_progress(on_progress=print, token=token):
+            split_pdf(...)
+    """
+    tracker = ProgressTracker(on_progress, token)
+    reset_token = _tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _tracker.reset(reset_token)
+
+
+def check_cancelled() -> None:
+    """Raise `JobCancelled` if the job being tracked was cancelled."""
+    tracker: Optional[ProgressTracker] = _tracker.get()
+    if tracker is not None:
+        tracker.check_cancelled()
+
+
+def add_total(steps: int) -> None:
+    tracker: Optional[ProgressTracker] = _tracker.get()
+    if tracker is not None:
+        tracker.add_total(steps)
+
+
+def advance(steps: int = 0, pages: int = 0, bytes_written: int = 0) -> None:
+    tracker: Optional[ProgressTracker] = _tracker.get()
+    if tracker is not None:
+        tracker.advance(steps, pages, bytes_written)
+
+
+def track_pages(pages: Iterable[int]) -> Iterator[int]:
+    """Yield `pages`, counting each one as a step once it is taken."""
+    tracker: Optional[ProgressTracker] = _tracker.get()
+    if tracker is None:
+        yield from pages
+        return
+    for page in pages:
+        tracker.check_cancelled()
+        yield page
+        tracker.advance(steps=1, pages=1)
+
+
+def call_with_progress(func: Callable[..., R], *args: Any) -> tuple[R, ProgressCounts]:
+    """Run `func(*args)` in a worker process and return its progress with its result."""
+    with track_progress() as tracker:
+        result: R = func(*args)
+    return result, tracker.counts
+
+
+def format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+class ProgressBar:
+    """
+    Draws the progress of a job on one line of `file`, at most every
+    `interval` seconds, and ends the line once the job is done.
+    """
+
+    def __init__(
+        self,
+        file: Optional[TextIO] = None,
+        width: int = 30,
+        interval: float = 0.1,
+    ) -> None:
+        self.file: TextIO = sys.stderr if file is None else file
+        self.width = width
+        self.interval = interval
+        self._drawn: float = 0.0
+        self._open = False
+        self._finished = False
+
+    def __call__(self, progress: Progress) -> None:
+        if self._finished:
+            return
+        finished: bool = progress.total > 0 and progress.done >= progress.total
+        now: float = time.monotonic()
+        if not finished and now - self._drawn < self.interval:
+            return
+        self._drawn = now
+
+        fraction: float = progress.done / progress.total if progress.total else 0.0
+        filled: int = int(self.width * min(fraction, 1.0))
+        eta: Optional[float] = progress.eta
+        self.file.write(
+            f"\r[{'#' * filled}{' ' * (self.width - filled)}] {fraction:4.0%}"
+            f" {progress.done}/{progress.total}"
+            f" {progress.bytes_written / (1024 * 1024):.1f} MiB"
+            f" ETA {'-:--:--' if eta is None else format_duration(eta)}"
+        )
+        self._open = True
+        if finished:
+            self._finished = True
+            self.close()
+        else:
+            self.file.flush()
+
+    def close(self) -> None:
+        if self._open:
+            self.file.write("\n")
+            self.file.flush()
+            self._open = False
+
+
+@contextmanager
+def show_progress(file: Optional[TextIO] = None) -> Iterator[ProgressTracker]:
+    """Track the progress of the editor calls made in the block with a `ProgressBar` on `file`, stderr by default."""
+    bar = ProgressBar(file)
+    try:
+        with track_progress(on_progress=bar) as tracker:
+            yield tracker
+    finally:
+        bar.close()
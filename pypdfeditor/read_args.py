@@ -1,33 +1,158 @@
 from argparse import (
     ArgumentError,
     ArgumentParser,
+    ArgumentTypeError,
     Namespace,
     RawTextHelpFormatter,
     _SubParsersAction,
 )
+from glob import glob
 
-from type_definitions import Args, Command, EncryptArgs, MergeArgs, SplitArgs, SplitMode
+from pypdfeditor.passwords import read_password
+
+from pypdfeditor.type_definitions import (
+    Args,
+    BatchArgs,
+    CacheAction,
+    CacheArgs,
+    CacheKey,
+    Command,
+    EncryptArgs,
+    MergeArgs,
+    ServeArgs,
+    SplitArgs,
+    SplitMode,
+)
+
+
+PASSWORD_SOURCES_HELP = """
+    Available sources:
+    - env:NAME: The environment variable NAME.
+    - fd:N: The first line read from file descriptor N.
+    - file:PATH: The first line of the key file PATH."""
+
+
+def expand_input_files(patterns: list[str]) -> list[str]:
+    """Expand the glob patterns left to us by the shell, e.g. quoted ones."""
+    files: list[str] = []
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches: list[str] = sorted(glob(pattern, recursive=True))
+            if not matches:
+                raise ArgumentTypeError(f"Error: No file matches <{pattern}>")
+            files.extend(matches)
+        else:
+            files.append(pattern)
+    # A file listed twice would be encrypted twice at the same time.
+    return list(dict.fromkeys(files))
 
 
 def read_args() -> Args:
-    parser = ArgumentParser(description="Python PDF editor")
+    parser = ArgumentParser(prog="pypdfeditor", description="Python PDF editor")
     subparser: _SubParsersAction = parser.add_subparsers(
         dest="command",
         required=True,
     )
 
+    validate_parser = ArgumentParser(add_help=False)
+    validate_parser.add_argument(
+        "-n",
+        "--validate-only",
+        "--dry-run",
+        help="Check the arguments, page ranges and page counts without writing any file.",
+        action="store_true",
+    )
+
+    mmap_parser = ArgumentParser(add_help=False)
+    mmap_parser.add_argument(
+        "--mmap",
+        help="""Read the input files through a memory mapping instead of loading them whole.
+    Only the parts of a file that are used are read, e.g. a few pages of a large scan.""",
+        action="store_true",
+    )
+
+    optimize_parser = ArgumentParser(add_help=False)
+    optimize_parser.add_argument(
+        "--optimize",
+        help="""Compress the streams that are not compressed yet, pack the other objects
+    into object streams with a cross-reference stream (PDF 1.5), and leave out unused objects.""",
+        action="store_true",
+    )
+    optimize_parser.add_argument(
+        "--compression-level",
+        help="Flate compression level used by --optimize, from 0 (none) to 9 (smallest). Defaults to 6.",
+        default=6,
+        type=int,
+        metavar="N",
+    )
+
+    cache_parser = ArgumentParser(add_help=False)
+    cache_parser.add_argument(
+        "--cache-dir",
+        help="""Reuse the files written by an earlier run with the same input files and options,
+    kept in the cache directory DIR, and keep the files written for later runs.
+    Files taken from the cache are hard links to it.""",
+        metavar="DIR",
+    )
+    cache_parser.add_argument(
+        "--cache-key",
+        help=f"""How input files are recognized in the cache. Defaults to {CacheKey.STAT}.
+
+    Available keys:
+    - stat: The device, inode, modification time and size of the file.
+    - content: A hash of the contents of the file, which also matches its copies.""",
+        choices=list(CacheKey),
+        default=CacheKey.STAT,
+        type=CacheKey,
+        metavar="KEY",
+    )
+    cache_parser.add_argument(
+        "--cache-max-size",
+        help="Size in MiB above which the least recently used cache entries are removed. Defaults to 1024.",
+        default=1024,
+        type=int,
+        metavar="MIB",
+    )
+
+    metrics_parser = ArgumentParser(add_help=False)
+    metrics_parser.add_argument(
+        "--metrics-json",
+        help="""Write the timings of each phase (open, copy, write, fsync),
+    the peak memory and the bytes written as JSON to FILE, or to stderr if FILE is '-'.""",
+        metavar="FILE",
+    )
+
+    progress_parser = ArgumentParser(add_help=False)
+    progress_parser.add_argument(
+        "--progress",
+        help="Show a progress bar on stderr with the pages done, the bytes written and the time left.",
+        action="store_true",
+    )
+
     split_parser: ArgumentParser = subparser.add_parser(
         Command.SPLIT,
+        parents=[
+            validate_parser,
+            mmap_parser,
+            optimize_parser,
+            cache_parser,
+            metrics_parser,
+            progress_parser,
+        ],
         help="Split a PDF file into multiple files based on page ranges.",
         formatter_class=RawTextHelpFormatter,
     )
-    split_parser.add_argument("source_file", help="Path to the source PDF file")
+    split_parser.add_argument(
+        "source_file", help="Path to the source PDF file, or '-' for stdin"
+    )
     split_parser.add_argument(
         "-p",
         "--pages",
-        help="Specify page ranges to split on (e.g. '1-5,8-10')",
+        help="""Specify page ranges to split on (e.g. '1-5,8-10').
+    Ranges can be open ('5-', '-3'), use 'last', go backwards ('10-1'),
+    take every Nth page ('1-100:2'), or select the 'odd' or 'even' pages.""",
         required=True,
-        metavar="",
+        metavar="PAGES",
     )
     split_parser.add_argument(
         "-m",
@@ -42,18 +167,54 @@ def read_args() -> Args:
         choices=list(SplitMode),
         default=SplitMode.SINGLE_FILE,
         type=SplitMode,
-        metavar="",
+        metavar="MODE",
+    )
+    split_parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes used by the range_files and multi_files modes. Defaults to 1.",
+        default=1,
+        type=int,
+        metavar="N",
+    )
+    split_parser.add_argument(
+        "--dedupe",
+        help="Merge identical font, image and XObject streams before writing each file.",
+        action="store_true",
+    )
+    split_parser.add_argument(
+        "-d",
+        "--output-dir",
+        help="""Directory the files are written to. Defaults to the current directory.
+    With '-', the file of the single_file mode is written to stdout.""",
+        default=".",
+        metavar="DIR",
+    )
+    split_parser.add_argument(
+        "--archive",
+        help="""Write the files into the archive FILE instead, each one as soon as it is split,
+    under the name it would have had. The format is given by the extension of FILE:
+    .zip (deflated), .tar, .tar.gz or .tgz, .tar.bz2, .tar.xz.""",
+        metavar="FILE",
     )
 
     merge_parser: ArgumentParser = subparser.add_parser(
         Command.MERGE,
+        parents=[
+            validate_parser,
+            mmap_parser,
+            optimize_parser,
+            cache_parser,
+            metrics_parser,
+            progress_parser,
+        ],
         help="Merge multiple PDF files into one PDF file",
         formatter_class=RawTextHelpFormatter,
     )
     merge_parser.add_argument(
         "-o",
         "--output-file",
-        help="Specify the name of the resulting merged PDF file",
+        help="Specify the name of the resulting merged PDF file, or '-' for stdout",
         required=True,
         metavar="FILE",
     )
@@ -63,28 +224,185 @@ def read_args() -> Args:
         help="""Specify two or more input PDF files to merge into a single PDF file. At least 2 input files are required.
 
     Available formats:
-    - filename: Path to an existing PDF file.
+    - filename: Path to an existing PDF file, or '-' for stdin.
     - filename:page_range: Path to an existing PDF file and a page range to merge from that file.
+      A page range of stdin is given as --input-files=-:page_range.
 
     Example usage:
     - file1.pdf
     - file2.pdf:1-3
     - file3.pdf:4,6-8
+    - file4.pdf:last-1
         """,
         required=True,
         action="append",
         metavar="FILE",
     )
+    merge_parser.add_argument(
+        "-s",
+        "--stream",
+        help="""Write the pages of each input file as soon as it is merged and release it.
+    Peak memory then depends on the largest input files, the one merged and the ones
+    prefetched, instead of the sum of all of them.""",
+        action="store_true",
+    )
+    merge_parser.add_argument(
+        "--dedupe",
+        help="Merge identical font, image and XObject streams of the input files.",
+        action="store_true",
+    )
+    merge_parser.add_argument(
+        "-d",
+        "--output-dir",
+        help="Directory the merged file is written to. Defaults to the current directory.",
+        default=".",
+        metavar="DIR",
+    )
+    merge_parser.add_argument(
+        "--prefetch",
+        help="""Number of upcoming input files opened and parsed on background threads
+    while the current one is merged. 0 opens each file only when it is merged. Defaults to 4.""",
+        default=4,
+        type=int,
+        metavar="N",
+    )
 
     encrypt_parser: ArgumentParser = subparser.add_parser(
         Command.ENCRYPT,
-        help="Encrypts a PDF file by adding or replacing the password.",
+        parents=[validate_parser, metrics_parser],
+        help="Encrypts PDF files by adding or replacing the password.",
+        formatter_class=RawTextHelpFormatter,
     )
     encrypt_parser.add_argument(
-        "input_file",
-        help="Path to an existing PDF file",
+        "input_files",
+        help="""Paths of existing PDF files, or glob patterns matching them
+    (e.g. 'statements/**/*.pdf'). A single '-' encrypts stdin to stdout.""",
+        nargs="+",
         metavar="FILE",
     )
+    encrypt_parser.add_argument(
+        "--new-password",
+        help=f"""Read the new password from SOURCE instead of prompting for it.
+    An empty password removes the password.
+{PASSWORD_SOURCES_HELP}""",
+        type=read_password,
+        metavar="SOURCE",
+    )
+    encrypt_parser.add_argument(
+        "--current-password",
+        help=f"""Read the current password of encrypted files from SOURCE.
+    When several files are encrypted it is never prompted for.
+{PASSWORD_SOURCES_HELP}""",
+        type=read_password,
+        metavar="SOURCE",
+    )
+    encrypt_parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes used when several files are encrypted. Defaults to 1.",
+        default=1,
+        type=int,
+        metavar="N",
+    )
+
+    batch_parser: ArgumentParser = subparser.add_parser(
+        Command.BATCH,
+        parents=[validate_parser],
+        help="Run the split, merge and encrypt jobs of a manifest in one process.",
+        formatter_class=RawTextHelpFormatter,
+    )
+    batch_parser.add_argument(
+        "manifest",
+        help="""Path to a JSON-lines manifest, or a CSV one with a header row (.csv).
+    Each job names its command and the options of that command.
+
+    Example usage:
+    - {"command": "split", "source_file": "doc.pdf", "pages": "1-3", "mode": "multi_files"}
+    - {"command": "merge", "output_file": "out.pdf", "input_files": ["a.pdf", "b.pdf:1-2"]}
+    - {"command": "encrypt", "input_files": ["doc.pdf"], "new_password": "secret"}
+    In CSV manifests, input_files are separated by ';'.""",
+        metavar="MANIFEST",
+    )
+    batch_parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of jobs to run at the same time. Defaults to 1.",
+        default=1,
+        type=int,
+        metavar="N",
+    )
+
+    serve_parser: ArgumentParser = subparser.add_parser(
+        Command.SERVE,
+        help="Run as a warm worker that accepts split, merge and encrypt jobs.",
+        formatter_class=RawTextHelpFormatter,
+    )
+    serve_address = serve_parser.add_mutually_exclusive_group(required=True)
+    serve_address.add_argument(
+        "--socket",
+        help="""Listen on a Unix domain socket.
+    Each line sent is a JSON job, in the format of a batch manifest line,
+    and is answered with one JSON result line.""",
+        metavar="PATH",
+    )
+    serve_address.add_argument(
+        "--port",
+        help="""Listen for JSON jobs sent with POST on http://127.0.0.1:PORT.
+    Requests must carry the header "Authorization: Bearer TOKEN".""",
+        type=int,
+        metavar="PORT",
+    )
+    serve_parser.add_argument(
+        "--token",
+        help=f"""Read the token of the HTTP server from SOURCE.
+    A random token is printed at startup when it is not given.
+{PASSWORD_SOURCES_HELP}""",
+        type=read_password,
+        metavar="SOURCE",
+    )
+    serve_parser.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of worker processes. Defaults to 1.",
+        default=1,
+        type=int,
+        metavar="N",
+    )
+    serve_parser.add_argument(
+        "--max-queue",
+        help="Number of jobs waiting for a worker before new jobs are rejected. Defaults to 16.",
+        default=16,
+        type=int,
+        metavar="N",
+    )
+
+    cache_command_parser: ArgumentParser = subparser.add_parser(
+        Command.CACHE,
+        help="Show or shrink the result cache of split and merge jobs.",
+        formatter_class=RawTextHelpFormatter,
+    )
+    cache_command_parser.add_argument(
+        "action",
+        help="""Available actions:
+    - stats: Print the number of entries and the size of the cache.
+    - prune: Remove the least recently used entries until the cache fits in --max-size.""",
+        choices=list(CacheAction),
+        type=CacheAction,
+        metavar="ACTION",
+    )
+    cache_command_parser.add_argument(
+        "--cache-dir",
+        help="Path to the cache directory.",
+        required=True,
+        metavar="DIR",
+    )
+    cache_command_parser.add_argument(
+        "--max-size",
+        help="Size in MiB the cache is pruned to. 0 empties it. Defaults to 1024.",
+        default=1024,
+        type=int,
+        metavar="MIB",
+    )
 
     args: Namespace = parser.parse_args()
 
@@ -96,7 +414,20 @@ def read_args() -> Args:
                     source_file=args.source_file,
                     pages=args.pages,
                     mode=args.mode,
+                    jobs=args.jobs,
+                    dedupe=args.dedupe,
+                    optimize=args.optimize,
+                    compression_level=args.compression_level,
+                    mmap=args.mmap,
+                    cache_dir=args.cache_dir,
+                    cache_key=args.cache_key,
+                    cache_max_size=args.cache_max_size,
+                    output_dir=args.output_dir,
+                    archive=args.archive,
+                    progress=args.progress,
                 ),
+                validate_only=args.validate_only,
+                metrics_json=args.metrics_json,
             )
         case Command.MERGE:
             return Args[MergeArgs](
@@ -104,12 +435,58 @@ def read_args() -> Args:
                 options=MergeArgs(
                     input_files=args.input_files,
                     output_file=args.output_file,
+                    stream=args.stream,
+                    dedupe=args.dedupe,
+                    optimize=args.optimize,
+                    compression_level=args.compression_level,
+                    mmap=args.mmap,
+                    cache_dir=args.cache_dir,
+                    cache_key=args.cache_key,
+                    cache_max_size=args.cache_max_size,
+                    output_dir=args.output_dir,
+                    progress=args.progress,
+                    prefetch=args.prefetch,
                 ),
+                validate_only=args.validate_only,
+                metrics_json=args.metrics_json,
             )
         case Command.ENCRYPT:
             return Args[EncryptArgs](
                 command=args.command,
-                options=EncryptArgs(input_file=args.input_file),
+                options=EncryptArgs(
+                    input_files=expand_input_files(args.input_files),
+                    new_password=args.new_password,
+                    current_password=args.current_password,
+                    jobs=args.jobs,
+                ),
+                validate_only=args.validate_only,
+                metrics_json=args.metrics_json,
+            )
+        case Command.BATCH:
+            return Args[BatchArgs](
+                command=args.command,
+                options=BatchArgs(manifest=args.manifest, jobs=args.jobs),
+                validate_only=args.validate_only,
+            )
+        case Command.SERVE:
+            return Args[ServeArgs](
+                command=args.command,
+                options=ServeArgs(
+                    socket=args.socket,
+                    port=args.port,
+                    jobs=args.jobs,
+                    max_queue=args.max_queue,
+                    token=args.token,
+                ),
+            )
+        case Command.CACHE:
+            return Args[CacheArgs](
+                command=args.command,
+                options=CacheArgs(
+                    action=args.action,
+                    cache_dir=args.cache_dir,
+                    max_size=args.max_size,
+                ),
             )
         case _:
             raise ArgumentError(None, "Error: Invalid command")
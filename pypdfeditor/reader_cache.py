@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Callable, Optional, Sequence
+
+from PyPDF2 import PdfReader
+
+from .mapped_file import open_pdf_reader
+from .metrics import phase
+from .type_definitions import STDIO
+
+MAX_OPEN_READERS = 16
+
+# Input files opened ahead of the one being merged.
+DEFAULT_PREFETCH = 4
+
+
+class ReaderCache:
+    """
+    LRU cache of open `PdfReader`s keyed by resolved path and modification
+    time, so a source listed several times is parsed only once. At most
+    `max_readers` readers stay open; `on_evict` is called with each reader
+    dropped from the cache.
+    """
+
+    def __init__(
+        self,
+        max_readers: int = MAX_OPEN_READERS,
+        on_evict: Optional[Callable[[PdfReader], None]] = None,
+    ) -> None:
+        self.max_readers = max_readers
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._readers: OrderedDict[tuple[str, int], PdfReader] = OrderedDict()
+
+    @staticmethod
+    def _key(filename: str) -> tuple[str, int]:
+        if filename == STDIO:
+            # Read once, and kept until it is evicted.
+            return STDIO, 0
+        path: Path = Path(filename).resolve()
+        return str(path), path.stat().st_mtime_ns
+
+    def get(
+        self,
+        filename: str,
+        use_mmap: bool = False,
+        opener: Optional[Callable[[], PdfReader]] = None,
+    ) -> PdfReader:
+        """
+        Return the reader of `filename`, opening it through a memory mapping
+        if `use_mmap` is set and it is not cached yet, or taking it from
+        `opener`, e.g. a reader opened in advance.
+        """
+        key: tuple[str, int] = self._key(filename)
+
+        reader: Optional[PdfReader] = self._readers.get(key)
+        if reader is not None:
+            self.hits += 1
+            self._readers.move_to_end(key)
+            return reader
+
+        self.misses += 1
+        with phase("open"):
+            reader = (
+                opener() if opener is not None else open_pdf_reader(key[0], use_mmap)
+            )
+        self._readers[key] = reader
+        while len(self._readers) > self.max_readers:
+            self._evict()
+        return reader
+
+    def _evict(self) -> None:
+        _, reader = self._readers.popitem(last=False)
+        if self.on_evict is not None:
+            self.on_evict(reader)
+
+    def discard(self, filename: str) -> None:
+        reader: Optional[PdfReader] = self._readers.pop(self._key(filename), None)
+        if reader is not None and self.on_evict is not None:
+            self.on_evict(reader)
+
+    def clear(self) -> None:
+        while self._readers:
+            self._evict()
+
+    def __contains__(self, filename: str) -> bool:
+        return self._key(filename) in self._readers
+
+    def __len__(self) -> int:
+        return len(self._readers)
+
+
+class ReaderPrefetcher:
+    """
+    Hands out the readers of `filenames` from `readers`, one after another in
+    their order, while up to `lookahead` of the next files are opened and
+    parsed on a thread pool, so reading them overlaps the work done on the
+    current one. At most `lookahead` readers are held ahead of the cache;
+    they join it as they are handed out. Files that are cached already, or
+    can not be opened, are left to `ReaderCache.get`, so errors are raised in
+    the order of `filenames`. stdin is never read ahead.
+    """
+
+    def __init__(
+        self,
+        readers: ReaderCache,
+        filenames: Sequence[str],
+        use_mmap: bool = False,
+        lookahead: int = DEFAULT_PREFETCH,
+    ) -> None:
+        self.readers = readers
+        self.filenames = filenames
+        self.use_mmap = use_mmap
+        self.lookahead = lookahead
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=lookahead, thread_name_prefix="pypdfeditor-prefetch"
+            )
+            if lookahead > 0
+            else None
+        )
+        # Readers being opened, by cache key.
+        self._pending: dict[tuple[str, int], Future] = {}
+        self._position = 0
+        self._prefetched = 0
+
+    def _prefetch(self) -> None:
+        if self._executor is None:
+            return
+        end: int = min(len(self.filenames), self._position + self.lookahead)
+        while self._prefetched < end:
+            filename: str = self.filenames[self._prefetched]
+            self._prefetched += 1
+            if filename == STDIO:
+                continue
+            try:
+                key: tuple[str, int] = self.readers._key(filename)
+            except OSError:
+                continue
+            if key in self._pending or filename in self.readers:
+                continue
+            self._pending[key] = self._executor.submit(
+                open_pdf_reader, key[0], self.use_mmap
+            )
+
+    def next_reader(self) -> PdfReader:
+        """Return the reader of the next file of `filenames`."""
+        filename: str = self.filenames[self._position]
+        self._position += 1
+        self._prefetch()
+        future: Optional[Future] = (
+            None
+            if filename == STDIO
+            else self._pending.pop(self.readers._key(filename), None)
+        )
+        return self.readers.get(
+            filename, self.use_mmap, None if future is None else future.result
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            # Readers still being opened are dropped once they are.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+
+    def __enter__(self) -> "ReaderPrefetcher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Sequence
+
+import PyPDF2
+
+from .type_definitions import CacheKey
+
+MIB = 1024 * 1024
+DEFAULT_MAX_SIZE = 1024 * MIB
+
+# Changed whenever the entries, or the files a command writes, change, so
+# results of an older version are never handed out.
+CACHE_FORMAT = 2
+
+MANIFEST = "manifest.json"
+
+
+class CacheEntry(NamedTuple):
+    path: Path
+    size: int
+    last_use: float
+
+
+class CacheStats(NamedTuple):
+    entries: int
+    size: int
+    oldest_use: Optional[float]
+    newest_use: Optional[float]
+
+
+def file_identity(path: str, key_mode: CacheKey) -> list[Any]:
+    if key_mode == CacheKey.CONTENT:
+        with open(path, "rb") as file:
+            return [hashlib.file_digest(file, "sha256").hexdigest()]
+    stat: os.stat_result = os.stat(path)
+    return [stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def link_or_copy(source: Path, target: str) -> None:
+    """
+    Hard-link `source` as `target`, replacing it, or copy it when they are
+    on different file systems.
+    """
+    try:
+        if os.path.samefile(source, target):
+            return
+    except FileNotFoundError:
+        pass
+    temporary_path: str = os.path.join(
+        os.path.dirname(os.path.abspath(target)),
+        f".{Path(target).name}.{secrets.token_hex(4)}.tmp",
+    )
+    try:
+        os.link(source, temporary_path)
+    except OSError:
+        shutil.copyfile(source, temporary_path)
+    try:
+        os.replace(temporary_path, target)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+class ResultCache:
+    """
+    On-disk cache of the files written by split and merge jobs, keyed by the
+    identity of their input files and their options. Entries are hard links
+    to the files written, evicted least recently used first once they take
+    more than `max_size` bytes.
+
+    With `CacheKey.STAT`, input files are identified by their device, inode,
+    modification time and size; with `CacheKey.CONTENT` by a hash of their
+    contents, which also matches copies of the same file.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+        key_mode: CacheKey = CacheKey.STAT,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.key_mode = key_mode
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def entries_directory(self) -> Path:
+        return self.directory / "entries"
+
+    def key(self, command: str, input_files: Sequence[str], *options: Any) -> str:
+        """Key of a `command` run on `input_files` with `options`, which must be JSON serializable."""
+        return hashlib.sha256(
+            json.dumps(
+                [
+                    CACHE_FORMAT,
+                    PyPDF2.__version__,
+                    command,
+                    [file_identity(file, self.key_mode) for file in input_files],
+                    options,
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def lookup(self, key: str) -> Optional[list[Path]]:
+        """Return the files stored under `key`, or None if there are none or they were modified."""
+        entry: Path = self.entries_directory / key
+        try:
+            manifest_text: str = (entry / MANIFEST).read_text()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            manifest: dict[str, Any] = json.loads(manifest_text)
+            files: list[Path] = []
+            for name, size, mtime_ns in manifest["files"]:
+                stat: os.stat_result = (entry / name).stat()
+                # The files are hard links to outputs that may since have
+                # been rewritten in place.
+                if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                    raise ValueError(f"Error: Cached file {name} was modified")
+                files.append(entry / name)
+            os.utime(entry / MANIFEST)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            self._remove(entry)
+            return None
+        self.hits += 1
+        return files
+
+    def restore(
+        self,
+        key: str,
+        targets: Optional[Sequence[str]] = None,
+        directory: str = ".",
+    ) -> Optional[list[str]]:
+        """
+        Link the files stored under `key` as `targets`, or under their own
+        names in `directory`, and return their paths. Returns None on a
+        cache miss.
+        """
+        files: Optional[list[Path]] = self.lookup(key)
+        if files is None:
+            return None
+        if targets is None:
+            targets = [os.path.join(directory, file.name) for file in files]
+        for file, target in zip(files, targets):
+            link_or_copy(file, target)
+        return list(targets)
+
+    def metadata(self, key: str) -> dict[str, Any]:
+        """The metadata stored with the files of `key`, empty if there is none."""
+        try:
+            manifest: Any = json.loads(
+                (self.entries_directory / key / MANIFEST).read_text()
+            )
+            return dict(manifest.get("metadata", {}))
+        except (OSError, ValueError, AttributeError, TypeError):
+            return {}
+
+    def store(
+        self,
+        key: str,
+        output_files: Sequence[str],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Store `output_files` under `key`, with JSON serializable `metadata`,
+        and evict old entries. A cache that can not be written to is left as
+        it is; the outputs are not affected.
+        """
+        try:
+            self.entries_directory.mkdir(parents=True, exist_ok=True)
+            temporary_entry = Path(
+                tempfile.mkdtemp(dir=self.directory, prefix=".entry-")
+            )
+        except OSError:
+            return
+        try:
+            files: list[tuple[str, int, int]] = []
+            for output_file in output_files:
+                name: str = Path(output_file).name
+                link_or_copy(Path(output_file), str(temporary_entry / name))
+                stat: os.stat_result = (temporary_entry / name).stat()
+                files.append((name, stat.st_size, stat.st_mtime_ns))
+            (temporary_entry / MANIFEST).write_text(
+                json.dumps({"files": files, "metadata": metadata or {}})
+            )
+            # Fails if another job stored the same key first.
+            os.rename(temporary_entry, self.entries_directory / key)
+        except OSError:
+            shutil.rmtree(temporary_entry, ignore_errors=True)
+            return
+        self.prune(self.max_size)
+
+    def entries(self) -> list[CacheEntry]:
+        try:
+            paths: list[Path] = list(self.entries_directory.iterdir())
+        except FileNotFoundError:
+            return []
+        entries: list[CacheEntry] = []
+        for path in paths:
+            try:
+                size: int = sum(file.stat().st_size for file in path.iterdir())
+                last_use: float = (path / MANIFEST).stat().st_mtime
+            except FileNotFoundError:
+                # Removed meanwhile, or left incomplete: evicted first.
+                size, last_use = 0, 0.0
+            entries.append(CacheEntry(path, size, last_use))
+        return entries
+
+    def stats(self) -> CacheStats:
+        entries: list[CacheEntry] = self.entries()
+        last_uses: list[float] = [entry.last_use for entry in entries]
+        return CacheStats(
+            entries=len(entries),
+            size=sum(entry.size for entry in entries),
+            oldest_use=min(last_uses, default=None),
+            newest_use=max(last_uses, default=None),
+        )
+
+    def prune(self, max_size: int) -> int:
+        """Evict the least recently used entries until the cache takes at most `max_size` bytes."""
+        entries: list[CacheEntry] = sorted(
+            self.entries(), key=lambda entry: entry.last_use
+        )
+        size: int = sum(entry.size for entry in entries)
+        removed: int = 0
+        for entry in entries:
+            if size <= max_size and entry.last_use:
+                break
+            self._remove(entry.path)
+            size -= entry.size
+            removed += 1
+        return removed
+
+    def _remove(self, entry: Path) -> None:
+        # Renamed first, so other jobs never see a partly removed entry.
+        trash: Path = self.directory / f".trash-{secrets.token_hex(8)}"
+        try:
+            os.rename(entry, trash)
+        except OSError:
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+
+def print_cache_stats(stats: CacheStats) -> None:
+    def format_time(timestamp: Optional[float]) -> str:
+        if timestamp is None:
+            return "-"
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+    print(f"Entries: {stats.entries}")
+    print(f"Size: {stats.size} bytes")
+    print(f"Oldest use: {format_time(stats.oldest_use)}")
+    print(f"Newest use: {format_time(stats.newest_use)}")
@@ -0,0 +1,228 @@
+import hmac
+import json
+import os
+import secrets
+import stat
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import StreamRequestHandler, ThreadingUnixStreamServer
+from typing import Any, Optional
+
+from pypdfeditor.batch import parse_job
+from pypdfeditor.commands import create_command
+from pypdfeditor.reader_cache import ReaderCache
+from pypdfeditor.type_definitions import Args
+from pypdfeditor.validator import validate_args
+
+HOST = "127.0.0.1"
+
+# Largest job body taken over HTTP; a job record is a few options.
+MAX_BODY_SIZE = 1024 * 1024
+
+_worker_readers: Optional[ReaderCache] = None
+
+
+def init_server_worker() -> None:
+    global _worker_readers
+    _worker_readers = ReaderCache()
+
+
+def run_request(record: Any) -> dict[str, Any]:
+    """Run one job record in a worker process, reusing the readers of earlier jobs."""
+    start: float = time.perf_counter()
+    try:
+        args: Args = parse_job(record)
+        validate_args(args=args)
+        create_command(args, readers=_worker_readers, prompt=False).execute()
+    except Exception as e:
+        return {"status": "failed", "error": str(e)}
+    return {"status": "ok", "seconds": round(time.perf_counter() - start, 6)}
+
+
+class JobDispatcher:
+    """
+    Runs job records on a pool of `jobs` worker processes. At most
+    `jobs + max_queue` jobs are accepted at once; further ones are rejected
+    right away instead of piling up.
+    """
+
+    def __init__(self, jobs: int, max_queue: int) -> None:
+        self._executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_server_worker,
+        )
+        self._slots = threading.BoundedSemaphore(jobs + max_queue)
+
+    def dispatch(self, record: Any) -> dict[str, Any]:
+        if not self._slots.acquire(blocking=False):
+            return {
+                "status": "rejected",
+                "error": "Error: Server is busy, retry later.",
+            }
+        try:
+            return self._executor.submit(run_request, record).result()
+        except Exception as e:
+            return {"status": "failed", "error": str(e)}
+        finally:
+            self._slots.release()
+
+    def dispatch_line(self, line: bytes) -> dict[str, Any]:
+        try:
+            record: Any = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {"status": "failed", "error": f"Error: Invalid JSON: {e}"}
+        return self.dispatch(record)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+
+class SocketJobHandler(StreamRequestHandler):
+    """One JSON job per line in, one JSON result per line out."""
+
+    server: "JobUnixServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            result: dict[str, Any] = self.server.dispatcher.dispatch_line(line)
+            self.wfile.write(json.dumps(result).encode() + b"\n")
+            self.wfile.flush()
+
+
+class JobUnixServer(ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, dispatcher: JobDispatcher) -> None:
+        self.dispatcher = dispatcher
+        super().__init__(socket_path, SocketJobHandler)
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        # Only the owner may connect; nothing can before the socket listens.
+        os.chmod(self.server_address, 0o600)
+
+
+class HttpJobHandler(BaseHTTPRequestHandler):
+    """
+    POST a JSON job to any path, with `Content-Type: application/json` and
+    `Authorization: Bearer <token>`; the status code tells how it went.
+    """
+
+    server: "JobHttpServer"
+
+    STATUS_CODES: dict[str, int] = {"ok": 200, "failed": 422, "rejected": 503}
+
+    def do_POST(self) -> None:
+        if not self.is_authorized():
+            self.send_result(
+                401, {"status": "failed", "error": "Error: Invalid token."}
+            )
+            return
+        content_type: str = self.headers.get("Content-Type", "")
+        if content_type.partition(";")[0].strip().lower() != "application/json":
+            self.send_result(
+                415,
+                {"status": "failed", "error": "Error: Jobs must be sent as JSON."},
+            )
+            return
+        try:
+            length: int = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.send_result(
+                400,
+                {"status": "failed", "error": "Error: Invalid Content-Length."},
+            )
+            return
+        if length > MAX_BODY_SIZE:
+            self.send_result(
+                413,
+                {
+                    "status": "failed",
+                    "error": f"Error: Jobs can not be larger than {MAX_BODY_SIZE} bytes.",
+                },
+            )
+            return
+        result: dict[str, Any] = self.server.dispatcher.dispatch_line(
+            self.rfile.read(length)
+        )
+        self.send_result(self.STATUS_CODES[result["status"]], result)
+
+    def is_authorized(self) -> bool:
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            token.strip().encode(), self.server.token.encode()
+        )
+
+    def send_result(self, code: int, result: dict[str, Any]) -> None:
+        body: bytes = json.dumps(result).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class JobHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, dispatcher: JobDispatcher, token: str) -> None:
+        if not token:
+            raise ValueError("Error: The server token can not be empty.")
+        self.dispatcher = dispatcher
+        self.token = token
+        super().__init__((HOST, port), HttpJobHandler)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    if not os.path.exists(socket_path):
+        return
+    if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+        raise ValueError(f"Error: <{socket_path}> exists and is not a socket.")
+    os.unlink(socket_path)
+
+
+def serve(
+    socket_path: Optional[str] = None,
+    port: Optional[int] = None,
+    jobs: int = 1,
+    max_queue: int = 16,
+    token: Optional[str] = None,
+) -> None:
+    """
+    Serve jobs on `socket_path`, which only its owner can connect to, or on
+    `port`, which only takes requests carrying `token`. A token is
+    generated and printed when none is given.
+    """
+    dispatcher = JobDispatcher(jobs=jobs, max_queue=max_queue)
+    server: JobUnixServer | JobHttpServer
+    if socket_path is not None:
+        remove_stale_socket(socket_path)
+        server = JobUnixServer(socket_path, dispatcher)
+        print(f"Listening on {socket_path}")
+    elif port is not None:
+        if token is None:
+            token = secrets.token_urlsafe(32)
+            print(f"Token: {token}")
+        server = JobHttpServer(port, dispatcher, token)
+        print(f"Listening on http://{HOST}:{server.server_address[1]}")
+    else:
+        raise ValueError("Error: Either a socket path or a port is required.")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        dispatcher.shutdown()
+        if socket_path is not None:
+            remove_stale_socket(socket_path)
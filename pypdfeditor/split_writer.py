@@ -0,0 +1,204 @@
+from io import BytesIO
+from typing import BinaryIO, Iterable, Optional
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    PdfObject,
+    TextStringObject,
+)
+
+from .metrics import phase
+from .page_tree import get_page
+from .stream_writer import BINARY_COMMENT, CountingStream, iter_references
+
+
+def serialize_object(idnum: int, generation: int, obj: PdfObject) -> bytes:
+    buffer = BytesIO()
+    buffer.write(f"{idnum} {generation} obj\n".encode())
+    obj.write_to_stream(buffer, None)
+    buffer.write(b"\nendobj\n")
+    return buffer.getvalue()
+
+
+class SerializedObjects:
+    """
+    Objects of `reader` serialized under their own numbers, each with the
+    references it holds. Files split from the reader keep the numbers of its
+    objects, so an object several of them use, e.g. a font, is parsed and
+    serialized once and its bytes are copied into each file.
+    """
+
+    def __init__(self, reader: PdfReader) -> None:
+        self.reader = reader
+        self._objects: dict[int, tuple[bytes, tuple[IndirectObject, ...]]] = {}
+        # Numbers from here on are free for the objects of each file.
+        self.first_free: int = max(
+            [int(reader.trailer.get("/Size", 0))]
+            + [max(entries, default=0) + 1 for entries in reader.xref.values()]
+            + [max(reader.xref_objStm, default=0) + 1]
+        )
+
+    def get(
+        self, reference: IndirectObject
+    ) -> tuple[bytes, tuple[IndirectObject, ...]]:
+        entry: Optional[tuple[bytes, tuple[IndirectObject, ...]]] = self._objects.get(
+            reference.idnum
+        )
+        if entry is None:
+            obj: Optional[PdfObject] = self.reader.get_object(reference)
+            if obj is None:
+                obj = NullObject()
+            elif (
+                isinstance(obj, DictionaryObject)
+                and obj.get("/Type") == "/Page"
+                and "/Parent" in obj
+            ):
+                # A page reached through a link or an annotation; it is not
+                # part of the page tree of the file.
+                obj = DictionaryObject(
+                    {key: value for key, value in obj.items() if key != "/Parent"}
+                )
+            entry = (
+                serialize_object(reference.idnum, reference.generation, obj),
+                tuple(iter_references(obj)),
+            )
+            self._objects[reference.idnum] = entry
+        return entry
+
+
+# Kept on the reader, which the objects refer to, so they are freed along
+# with it.
+SERIALIZED_OBJECTS_ATTRIBUTE = "_pypdfeditor_serialized_objects"
+
+
+def serialized_objects(reader: PdfReader) -> SerializedObjects:
+    objects: Optional[SerializedObjects] = getattr(
+        reader, SERIALIZED_OBJECTS_ATTRIBUTE, None
+    )
+    if objects is None:
+        objects = SerializedObjects(reader)
+        setattr(reader, SERIALIZED_OBJECTS_ATTRIBUTE, objects)
+    return objects
+
+
+def write_xref(
+    output: CountingStream, offsets: dict[int, tuple[int, int]], size: int
+) -> None:
+    """
+    Write a single xref subsection from 0 to `size`, as a file that was never
+    updated must have; numbers that were not written are free.
+    """
+    output.write(f"xref\n0 {size}\n".encode())
+    output.write(f"{0:0>10} {65535:0>5} f \n".encode())
+    for idnum in range(1, size):
+        offset, generation = offsets.get(idnum, (0, 65535))
+        state: str = "n" if idnum in offsets else "f"
+        output.write(f"{offset:0>10} {generation:0>5} {state} \n".encode())
+
+
+def write_page_selection(
+    reader: PdfReader, pages: Iterable[int], stream: BinaryIO
+) -> None:
+    """
+    Write the `pages` (from 1) of `reader` to `stream` as a new file, copying
+    the serialized bytes of the objects they use from `serialized_objects`.
+    Objects keep their numbers from `reader`; the numbers of the ones left
+    out are free in the xref table.
+    """
+    objects: SerializedObjects = serialized_objects(reader)
+    next_number: int = objects.first_free
+    catalog, page_tree, info = next_number, next_number + 1, next_number + 2
+    next_number += 3
+
+    written: list[tuple[int, int, bytes]] = []
+    kids = ArrayObject()
+    pending: list[IndirectObject] = []
+    seen: set[int] = set()
+    with phase("copy"):
+        for page_number in pages:
+            page = get_page(reader, page_number - 1)
+            reference: Optional[IndirectObject] = page.indirect_reference
+            idnum: int
+            generation: int
+            if reference is None or reference.idnum in seen:
+                # A page object has a single parent, so repeated pages are
+                # copies sharing everything else.
+                idnum, generation = next_number, 0
+                next_number += 1
+            else:
+                idnum, generation = reference.idnum, reference.generation
+            seen.add(idnum)
+
+            page_object = DictionaryObject(
+                {key: value for key, value in page.items() if key != "/Parent"}
+            )
+            page_object[NameObject("/Parent")] = IndirectObject(page_tree, 0, reader)
+            written.append(
+                (idnum, generation, serialize_object(idnum, generation, page_object))
+            )
+            kids.append(IndirectObject(idnum, generation, reader))
+            pending.extend(iter_references(page_object, ("/Parent",)))
+
+        while pending:
+            reference = pending.pop()
+            if reference.idnum in seen:
+                continue
+            seen.add(reference.idnum)
+            data, references = objects.get(reference)
+            written.append((reference.idnum, reference.generation, data))
+            pending.extend(references)
+
+    with phase("write"):
+        output = CountingStream(stream)
+        output.write(reader.pdf_header.encode() + b"\n" + BINARY_COMMENT)
+        offsets: dict[int, tuple[int, int]] = {}
+        for idnum, generation, data in written:
+            offsets[idnum] = (output.tell(), generation)
+            output.write(data)
+
+        for idnum, obj in (
+            (
+                page_tree,
+                DictionaryObject(
+                    {
+                        NameObject("/Type"): NameObject("/Pages"),
+                        NameObject("/Kids"): kids,
+                        NameObject("/Count"): NumberObject(len(kids)),
+                    }
+                ),
+            ),
+            (
+                catalog,
+                DictionaryObject(
+                    {
+                        NameObject("/Type"): NameObject("/Catalog"),
+                        NameObject("/Pages"): IndirectObject(page_tree, 0, reader),
+                    }
+                ),
+            ),
+            (
+                info,
+                DictionaryObject({NameObject("/Producer"): TextStringObject("PyPDF2")}),
+            ),
+        ):
+            offsets[idnum] = (output.tell(), 0)
+            output.write(serialize_object(idnum, 0, obj))
+
+        xref_location: int = output.tell()
+        write_xref(output, offsets, next_number)
+        trailer = DictionaryObject(
+            {
+                NameObject("/Size"): NumberObject(next_number),
+                NameObject("/Root"): IndirectObject(catalog, 0, reader),
+                NameObject("/Info"): IndirectObject(info, 0, reader),
+            }
+        )
+        output.write(b"trailer\n")
+        trailer.write_to_stream(output, None)
+        output.write(f"\nstartxref\n{xref_location}\n%%EOF\n".encode())
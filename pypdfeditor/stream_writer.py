@@ -0,0 +1,594 @@
+import codecs
+import secrets
+import struct
+import zlib
+from functools import lru_cache
+from hashlib import md5
+from io import BytesIO
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Optional
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2._security import _alg33, _alg35
+from PyPDF2._writer import ALL_DOCUMENT_PERMISSIONS
+from PyPDF2.generic import (
+    ArrayObject,
+    ByteStringObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    NumberObject,
+    PdfObject,
+    StreamObject,
+    TextStringObject,
+    encode_pdfdocencoding,
+)
+
+from .metrics import phase
+from .optimize import StreamDeduplicator
+
+BINARY_COMMENT = b"%\xE2\xE3\xCF\xD3\n"
+
+# Objects that only describe how the source file was laid out.
+LAYOUT_OBJECT_TYPES = ("/ObjStm", "/XRef")
+
+# Objects parsed between two releases of the reader's object cache. Objects
+# of an object stream share its decoded data, so it is kept for a while.
+OBJECTS_PER_RELEASE = 256
+
+# Objects packed into each object stream of a compact file.
+OBJECTS_PER_OBJECT_STREAM = 100
+
+
+class CountingStream:
+    """Write-only wrapper that tracks the offset, so the output needs no `tell`."""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.position = 0
+
+    def write(self, data: bytes) -> int:
+        self.stream.write(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+
+def iter_references(
+    obj: Any, skip_keys: tuple[str, ...] = ()
+) -> Iterator[IndirectObject]:
+    """Yield the indirect references held directly by `obj`, without resolving them."""
+    stack: list[Any] = [obj]
+    while stack:
+        data = stack.pop()
+        if isinstance(data, IndirectObject):
+            yield data
+        elif isinstance(data, DictionaryObject):
+            stack.extend(value for key, value in data.items() if key not in skip_keys)
+        elif isinstance(data, ArrayObject):
+            stack.extend(data)
+
+
+def reachable_ids(writer: PdfWriter, roots: Iterable[IndirectObject]) -> set[int]:
+    """Numbers of the objects of `writer` reachable from `roots`."""
+    ids: set[int] = set()
+    stack: list[IndirectObject] = list(roots)
+    while stack:
+        reference: IndirectObject = stack.pop()
+        if reference.pdf is not writer or reference.idnum in ids:
+            continue
+        ids.add(reference.idnum)
+        stack.extend(iter_references(writer._objects[reference.idnum - 1]))
+    return ids
+
+
+class CompactSerializer:
+    """
+    Writes objects the way PDF 1.5 allows: streams on their own, compressed
+    with Flate at `level` if they have no filter yet, the other objects packed
+    by `OBJECTS_PER_OBJECT_STREAM` into object streams, and a cross-reference
+    stream instead of the xref table and trailer.
+
+    `allocate` returns a free object number for each object stream and for
+    the cross-reference stream.
+    """
+
+    def __init__(
+        self, output: CountingStream, level: int, allocate: Callable[[], int]
+    ) -> None:
+        self.output = output
+        self.level = level
+        self.allocate = allocate
+        # Cross-reference entry of each object: (1, offset, 0) for objects
+        # written on their own, (2, object stream, index) for packed ones.
+        self.entries: dict[int, tuple[int, int, int]] = {}
+        self._pending: list[tuple[int, PdfObject]] = []
+
+    def __contains__(self, idnum: int) -> bool:
+        return idnum in self.entries or any(
+            idnum == pending for pending, _ in self._pending
+        )
+
+    def add(self, idnum: int, obj: PdfObject) -> None:
+        if isinstance(obj, StreamObject):
+            self._write_stream(idnum, obj, obj._data)
+            return
+        self._pending.append((idnum, obj))
+        if len(self._pending) == OBJECTS_PER_OBJECT_STREAM:
+            self.flush()
+
+    def _write_stream(
+        self, idnum: int, dictionary: DictionaryObject, data: bytes
+    ) -> None:
+        dictionary = DictionaryObject(
+            (key, value) for key, value in dictionary.items() if key != "/Length"
+        )
+        # XMP metadata is left readable to tools that do not parse the file.
+        if (
+            self.level > 0
+            and "/Filter" not in dictionary
+            and dictionary.get("/Type") != "/Metadata"
+        ):
+            compressed: bytes = zlib.compress(data, self.level)
+            if len(compressed) < len(data):
+                dictionary[NameObject("/Filter")] = NameObject("/FlateDecode")
+                data = compressed
+        dictionary[NameObject("/Length")] = NumberObject(len(data))
+
+        self.entries[idnum] = (1, self.output.tell(), 0)
+        self.output.write(f"{idnum} 0 obj\n".encode())
+        dictionary.write_to_stream(self.output, None)
+        self.output.write(b"\nstream\n" + data + b"\nendstream\nendobj\n")
+
+    def flush(self) -> None:
+        """Write the objects added since the last flush as an object stream."""
+        if not self._pending:
+            return
+        number: int = self.allocate()
+        offsets: list[str] = []
+        body = BytesIO()
+        for index, (idnum, obj) in enumerate(self._pending):
+            offsets.append(f"{idnum} {body.tell()}")
+            obj.write_to_stream(body, None)
+            body.write(b"\n")
+            self.entries[idnum] = (2, number, index)
+        header: bytes = " ".join(offsets).encode() + b"\n"
+        dictionary = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/ObjStm"),
+                NameObject("/N"): NumberObject(len(self._pending)),
+                NameObject("/First"): NumberObject(len(header)),
+            }
+        )
+        self._pending = []
+        self._write_stream(number, dictionary, header + body.getvalue())
+
+    def finish(self, trailer: DictionaryObject) -> None:
+        """Write the pending objects and a cross-reference stream holding `trailer`."""
+        self.flush()
+        number: int = self.allocate()
+        size: int = max([number, *self.entries]) + 1
+        self.entries[number] = (1, self.output.tell(), 0)
+        # Numbers without an entry, e.g. unused objects, are free.
+        rows: list[tuple[int, int, int]] = [
+            self.entries.get(idnum, (0, 0, 0)) for idnum in range(size)
+        ]
+        rows[0] = (0, 0, 65535)
+        widths: list[int] = [
+            1,
+            max(1, (max(row[1] for row in rows).bit_length() + 7) // 8),
+            max(1, (max(row[2] for row in rows).bit_length() + 7) // 8),
+        ]
+        data: bytes = b"".join(
+            b"".join(field.to_bytes(width, "big") for field, width in zip(row, widths))
+            for row in rows
+        )
+
+        dictionary = DictionaryObject(trailer)
+        dictionary.update(
+            {
+                NameObject("/Type"): NameObject("/XRef"),
+                NameObject("/Size"): NumberObject(size),
+                NameObject("/W"): ArrayObject(NumberObject(width) for width in widths),
+            }
+        )
+        xref_location: int = self.output.tell()
+        self._write_stream(number, dictionary, data)
+        self.output.write(f"startxref\n{xref_location}\n%%EOF\n".encode())
+
+
+def write_compact(writer: PdfWriter, stream: BinaryIO, level: int) -> None:
+    """
+    Write `writer` to `stream` with `CompactSerializer`, leaving out the
+    objects that nothing refers to any more, e.g. merged duplicates.
+    """
+    if not writer._root:
+        writer._root = writer._add_object(writer._root_object)
+    writer._sweep_indirect_references(writer._root)
+    if writer.pdf_header < b"%PDF-1.5":
+        writer.pdf_header = b"%PDF-1.5"
+
+    output = CountingStream(stream)
+    output.write(writer.pdf_header + b"\n" + BINARY_COMMENT)
+    serializer = CompactSerializer(
+        output, level, lambda: writer._add_object(NullObject()).idnum
+    )
+    for idnum in sorted(reachable_ids(writer, [writer._root, writer._info])):
+        serializer.add(idnum, writer._objects[idnum - 1])
+
+    trailer = DictionaryObject(
+        {NameObject("/Root"): writer._root, NameObject("/Info"): writer._info}
+    )
+    if hasattr(writer, "_ID"):
+        trailer[NameObject("/ID")] = writer._ID
+    serializer.finish(trailer)
+
+
+class StreamingPdfWriter(PdfWriter):
+    """
+    `PdfWriter` that serializes objects to `stream` as soon as they are
+    finished instead of holding all of them until `write`.
+
+    Pages are added with the usual `PdfWriter` API; `flush` then writes every
+    object only reachable from the pages added since the last flush and drops
+    it from memory. Document-level objects (catalog, page tree, outline, name
+    trees) stay in memory and are written by `close`, together with the xref
+    table and trailer.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        dedupe: bool = False,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self._output = CountingStream(stream)
+        self._offsets: dict[int, int] = {}
+        self._flushed_kids = 0
+        self._written_header: Optional[bytes] = None
+        self._deduplicator: Optional[StreamDeduplicator] = (
+            StreamDeduplicator() if dedupe else None
+        )
+        # With a compression level, objects go through a CompactSerializer
+        # instead of being written with an xref table.
+        self._serializer: Optional[CompactSerializer] = None
+        if compression_level is not None:
+            self.pdf_header = b"%PDF-1.5"
+            self._serializer = CompactSerializer(
+                self._output,
+                compression_level,
+                lambda: self._add_object(NullObject()).idnum,
+            )
+
+    @property
+    def bytes_written(self) -> int:
+        """Bytes written to the stream so far, which need not be seekable."""
+        return self._output.tell()
+
+    def _is_written(self, idnum: int) -> bool:
+        return idnum in self._offsets or (
+            self._serializer is not None and idnum in self._serializer
+        )
+
+    def _write_header_once(self) -> None:
+        if self._written_header is None:
+            self._written_header = self.pdf_header
+            self._output.write(self.pdf_header + b"\n" + BINARY_COMMENT)
+
+    def _localize(self, obj: PdfObject) -> None:
+        """Clone references to objects of other documents into this one."""
+        stack: list[Any] = [obj]
+        while stack:
+            data = stack.pop()
+            if isinstance(data, (DictionaryObject, ArrayObject)):
+                for key, value in data.items():
+                    if isinstance(value, IndirectObject):
+                        if value.pdf is not self:
+                            data[key] = value.clone(self)
+                    else:
+                        stack.append(value)
+
+    def _write_object(self, idnum: int) -> None:
+        obj: PdfObject = self._objects[idnum - 1]
+        if self._serializer is not None:
+            self._serializer.add(idnum, obj)
+        else:
+            self._offsets[idnum] = self._output.tell()
+            self._output.write(f"{idnum} 0 obj\n".encode())
+            obj.write_to_stream(self._output, None)
+            self._output.write(b"\nendobj\n")
+
+        placeholder = NullObject()
+        placeholder.indirect_reference = IndirectObject(idnum, 0, self)  # type: ignore[attr-defined]
+        self._objects[idnum - 1] = placeholder
+
+    def _document_ids(self) -> set[int]:
+        """Ids of the objects reachable from the catalog and info, outside of pages."""
+        ids: set[int] = {self._root.idnum, self._info.idnum, self._pages.idnum}
+        stack: list[PdfObject] = [self._root_object, self._info.get_object()]
+        while stack:
+            for reference in iter_references(stack.pop(), ("/Pages",)):
+                if (
+                    reference.pdf is not self
+                    or reference.idnum in ids
+                    or self._is_written(reference.idnum)
+                ):
+                    continue
+                obj: PdfObject = self._objects[reference.idnum - 1]
+                if isinstance(obj, DictionaryObject) and obj.get("/Type") == "/Page":
+                    continue
+                ids.add(reference.idnum)
+                stack.append(obj)
+        return ids
+
+    def flush(self) -> None:
+        """Write the pages added since the last flush and everything only they use."""
+        kids: ArrayObject = self._pages.get_object()["/Kids"]  # type: ignore[index]
+        pending: list[int] = [kid.idnum for kid in kids[self._flushed_kids :]]
+        self._flushed_kids = len(kids)
+        if not pending:
+            return
+
+        self._write_header_once()
+        keep: set[int] = self._document_ids()
+        seen: set[int] = set(pending)
+        finished: list[int] = []
+        while pending:
+            idnum: int = pending.pop()
+            if self._is_written(idnum) or idnum in keep:
+                continue
+            obj: PdfObject = self._objects[idnum - 1]
+            self._localize(obj)
+            for reference in iter_references(obj, ("/Parent",)):
+                if reference.pdf is self and reference.idnum not in seen:
+                    seen.add(reference.idnum)
+                    pending.append(reference.idnum)
+            finished.append(idnum)
+
+        if self._deduplicator is not None:
+            self._deduplicator.dedupe(self, finished)
+        for idnum in finished:
+            self._write_object(idnum)
+
+    def release(self, reader: PdfReader) -> None:
+        """
+        Forget a reader whose pages were all added: its object translation
+        table and the objects it parsed, which are only kept for copying.
+        """
+        self._id_translated.pop(id(reader), None)
+        reader.resolved_objects.clear()
+
+    def close(self) -> None:
+        """Write the remaining objects, the xref table and the trailer."""
+        self._write_header_once()
+        if self.pdf_header > self._written_header:  # type: ignore[operator]
+            # The header is already out; a later version goes in the catalog.
+            self._root_object[NameObject("/Version")] = NameObject(
+                "/" + self.pdf_header[5:].decode()
+            )
+
+        idnum: int = 1
+        while idnum <= len(self._objects):
+            if not self._is_written(idnum):
+                self._localize(self._objects[idnum - 1])
+            idnum += 1
+        remaining: list[int] = [
+            idnum for idnum in range(1, idnum) if not self._is_written(idnum)
+        ]
+        if self._deduplicator is not None:
+            self._deduplicator.dedupe(self, remaining)
+        if self._serializer is not None:
+            # Objects left unused, e.g. merged duplicates, are dropped.
+            used: set[int] = reachable_ids(self, [self._root, self._info])
+            remaining = [idnum for idnum in remaining if idnum in used]
+        for idnum in remaining:
+            self._write_object(idnum)
+
+        if self._serializer is not None:
+            self._serializer.finish(
+                DictionaryObject(
+                    {NameObject("/Root"): self._root, NameObject("/Info"): self._info}
+                )
+            )
+            return
+
+        xref_location: int = self._output.tell()
+        self._output.write(f"xref\n0 {len(self._objects) + 1}\n".encode())
+        self._output.write(f"{0:0>10} {65535:0>5} f \n".encode())
+        for idnum in range(1, len(self._objects) + 1):
+            self._output.write(f"{self._offsets[idnum]:0>10} {0:0>5} n \n".encode())
+
+        trailer = DictionaryObject(
+            {
+                NameObject("/Size"): NumberObject(len(self._objects) + 1),
+                NameObject("/Root"): self._root,
+                NameObject("/Info"): self._info,
+            }
+        )
+        self._output.write(b"trailer\n")
+        trailer.write_to_stream(self._output, None)
+        self._output.write(f"\nstartxref\n{xref_location}\n%%EOF\n".encode())
+
+
+def rc4(key: bytes, data: bytes) -> bytes:
+    """RC4, about three times faster than the byte-by-byte one of PyPDF2."""
+    state: list[int] = list(range(256))
+    j: int = 0
+    for i in range(256):
+        j = (j + state[i] + key[i % len(key)]) & 255
+        state[i], state[j] = state[j], state[i]
+
+    output = bytearray(data)
+    i = j = 0
+    for k in range(len(output)):
+        i = (i + 1) & 255
+        si: int = state[i]
+        j = (j + si) & 255
+        sj: int = state[j]
+        state[i] = sj
+        state[j] = si
+        output[k] ^= state[(si + sj) & 255]
+    return bytes(output)
+
+
+def encrypt_object(obj: PdfObject, key: bytes) -> PdfObject:
+    """Encrypt the strings and stream data of `obj`, in place where possible."""
+    if isinstance(obj, TextStringObject):
+        # Encoded the way TextStringObject.write_to_stream does.
+        try:
+            data: bytes = encode_pdfdocencoding(obj)
+        except UnicodeEncodeError:
+            data = codecs.BOM_UTF16_BE + obj.encode("utf-16be")
+        return ByteStringObject(rc4(key, data))
+    if isinstance(obj, ByteStringObject):
+        return ByteStringObject(rc4(key, bytes(obj)))
+    if isinstance(obj, DictionaryObject):
+        for name, value in obj.items():
+            obj[name] = encrypt_object(value, key)
+        if isinstance(obj, StreamObject):
+            obj._data = rc4(key, obj._data)
+    elif isinstance(obj, ArrayObject):
+        for i, value in enumerate(obj):
+            obj[i] = encrypt_object(value, key)
+    return obj
+
+
+def object_key(encrypt_key: bytes, idnum: int, generation: int) -> bytes:
+    """RC4 key of one object (algorithm 1 of the PDF specification)."""
+    key: bytes = (
+        encrypt_key + struct.pack("<i", idnum)[:3] + struct.pack("<i", generation)[:2]
+    )
+    return md5(key).digest()[: min(16, len(encrypt_key) + 5)]
+
+
+@lru_cache(maxsize=16)
+def owner_entry(password: str) -> ByteStringObject:
+    # The only part of the key derivation that does not depend on the /ID of
+    # the document, so it is computed once per password.
+    return ByteStringObject(_alg33(password, password, 3, 16))
+
+
+def standard_encryption(password: str) -> tuple[DictionaryObject, ArrayObject, bytes]:
+    """
+    /Encrypt dictionary, new /ID and file key of 128-bit RC4 encryption (the
+    standard security handler, revision 3), as `PdfWriter.encrypt` makes them.
+    The /ID is random, so no two documents share a key.
+    """
+    owner: ByteStringObject = owner_entry(password)
+    document_id = ArrayObject(
+        [ByteStringObject(secrets.token_bytes(16)) for _ in range(2)]
+    )
+    user, key = _alg35(
+        password, 3, 16, owner, ALL_DOCUMENT_PERMISSIONS, document_id[0], False
+    )
+    encryption = DictionaryObject(
+        {
+            NameObject("/Filter"): NameObject("/Standard"),
+            NameObject("/V"): NumberObject(2),
+            NameObject("/Length"): NumberObject(128),
+            NameObject("/R"): NumberObject(3),
+            NameObject("/O"): owner,
+            NameObject("/U"): ByteStringObject(user),
+            NameObject("/P"): NumberObject(ALL_DOCUMENT_PERMISSIONS),
+        }
+    )
+    return encryption, document_id, key
+
+
+def live_objects(reader: PdfReader) -> list[tuple[int, int]]:
+    """Number and generation of every object in the xref of `reader`."""
+    objects: set[tuple[int, int]] = {(idnum, 0) for idnum in reader.xref_objStm}
+    for generation, entries in reader.xref.items():
+        free: dict[int, bool] = reader.xref_free_entry.get(generation, {})
+        objects.update(
+            (idnum, generation)
+            for idnum in entries
+            if idnum != 0 and not free.get(idnum, False)
+        )
+    return sorted(objects)
+
+
+def write_object_copy(reader: PdfReader, stream: BinaryIO, password: str = "") -> None:
+    """
+    Copy every object of `reader` to `stream` under its own number, encrypted
+    with `password`, or unencrypted if it is empty. Objects are read, written
+    and dropped one at a time, so besides the reader only the objects between
+    two cache releases are held in memory. A (decrypted) reader is left with
+    an empty object cache.
+    """
+    output = CountingStream(stream)
+    trailer = DictionaryObject({NameObject("/Root"): reader.trailer.raw_get("/Root")})
+    if "/Info" in reader.trailer:
+        trailer[NameObject("/Info")] = reader.trailer.raw_get("/Info")
+
+    skipped: set[int] = set()
+    if "/Encrypt" in reader.trailer:
+        encrypt_reference = reader.trailer.raw_get("/Encrypt")
+        if isinstance(encrypt_reference, IndirectObject):
+            skipped.add(encrypt_reference.idnum)
+
+    objects: list[tuple[int, int]] = live_objects(reader)
+    size: int = max((idnum for idnum, _ in objects), default=0) + 1
+    header: bytes = reader.pdf_header.encode()
+    encrypt_key: Optional[bytes] = None
+    encryption: Optional[DictionaryObject] = None
+    if password:
+        encryption, trailer[NameObject("/ID")], encrypt_key = standard_encryption(
+            password
+        )
+        trailer[NameObject("/Encrypt")] = IndirectObject(size, 0, None)
+        # 128-bit RC4 needs PDF 1.4.
+        header = max(header, b"%PDF-1.4")
+    elif "/ID" in reader.trailer:
+        trailer[NameObject("/ID")] = reader.trailer["/ID"]
+
+    output.write(header + b"\n" + BINARY_COMMENT)
+    offsets: dict[int, tuple[int, int]] = {}
+    for count, (idnum, generation) in enumerate(objects, start=1):
+        if count % OBJECTS_PER_RELEASE == 0:
+            reader.resolved_objects.clear()
+        if idnum in skipped:
+            continue
+        with phase("copy"):
+            obj: Optional[PdfObject] = reader.get_object(
+                IndirectObject(idnum, generation, reader)
+            )
+        if obj is None or (
+            isinstance(obj, StreamObject) and obj.get("/Type") in LAYOUT_OBJECT_TYPES
+        ):
+            continue
+        if isinstance(obj, DictionaryObject) and "/Linearized" in obj:
+            # Its offsets would be wrong once the objects move.
+            continue
+
+        with phase("write"):
+            offsets[idnum] = (output.tell(), generation)
+            output.write(f"{idnum} {generation} obj\n".encode())
+            if encrypt_key is not None:
+                obj = encrypt_object(obj, object_key(encrypt_key, idnum, generation))
+            obj.write_to_stream(output, None)
+            output.write(b"\nendobj\n")
+    reader.resolved_objects.clear()
+
+    if encryption is not None:
+        offsets[size] = (output.tell(), 0)
+        output.write(f"{size} 0 obj\n".encode())
+        encryption.write_to_stream(output, None)
+        output.write(b"\nendobj\n")
+        size += 1
+
+    xref_location: int = output.tell()
+    output.write(f"xref\n0 {size}\n".encode())
+    output.write(f"{0:0>10} {65535:0>5} f \n".encode())
+    for idnum in range(1, size):
+        offset, generation = offsets.get(idnum, (0, 65535))
+        state: str = "n" if idnum in offsets else "f"
+        output.write(f"{offset:0>10} {generation:0>5} {state} \n".encode())
+
+    trailer[NameObject("/Size")] = NumberObject(size)
+    output.write(b"trailer\n")
+    trailer.write_to_stream(output, None)
+    output.write(f"\nstartxref\n{xref_location}\n%%EOF\n".encode())
@@ -1,11 +1,18 @@
 from enum import StrEnum
-from typing import Generic, NamedTuple, TypeVar
+from typing import Generic, NamedTuple, Optional, TypeVar
+
+
+# Path standing for stdin as an input file, and stdout as an output.
+STDIO = "-"
 
 
 class Command(StrEnum):
     SPLIT = "split"
     MERGE = "merge"
     ENCRYPT = "encrypt"
+    BATCH = "batch"
+    SERVE = "serve"
+    CACHE = "cache"
 
 
 class SplitMode(StrEnum):
@@ -14,24 +21,86 @@ class SplitMode(StrEnum):
     MULTI_FILES = "multi_files"
 
 
+class CacheKey(StrEnum):
+    STAT = "stat"
+    CONTENT = "content"
+
+
+class CacheAction(StrEnum):
+    STATS = "stats"
+    PRUNE = "prune"
+
+
+class WriteOptions(NamedTuple):
+    dedupe: bool = False
+    optimize: bool = False
+    compression_level: int = 6
+
+
 class SplitArgs(NamedTuple):
     source_file: str
     pages: str
     mode: SplitMode = SplitMode.SINGLE_FILE
+    jobs: int = 1
+    dedupe: bool = False
+    optimize: bool = False
+    compression_level: int = 6
+    mmap: bool = False
+    cache_dir: Optional[str] = None
+    cache_key: CacheKey = CacheKey.STAT
+    cache_max_size: int = 1024
+    output_dir: str = "."
+    archive: Optional[str] = None
+    progress: bool = False
 
 
 class MergeArgs(NamedTuple):
     output_file: str
     input_files: list[str]
+    stream: bool = False
+    dedupe: bool = False
+    optimize: bool = False
+    compression_level: int = 6
+    mmap: bool = False
+    cache_dir: Optional[str] = None
+    cache_key: CacheKey = CacheKey.STAT
+    cache_max_size: int = 1024
+    output_dir: str = "."
+    progress: bool = False
+    prefetch: int = 4
 
 
 class EncryptArgs(NamedTuple):
-    input_file: str
+    input_files: list[str]
+    new_password: Optional[str] = None
+    current_password: Optional[str] = None
+    jobs: int = 1
+
+
+class BatchArgs(NamedTuple):
+    manifest: str
+    jobs: int = 1
+
+
+class ServeArgs(NamedTuple):
+    socket: Optional[str] = None
+    port: Optional[int] = None
+    jobs: int = 1
+    max_queue: int = 16
+    token: Optional[str] = None
+
+
+class CacheArgs(NamedTuple):
+    action: CacheAction
+    cache_dir: str
+    max_size: int = 1024
 
 
-T = TypeVar("T", SplitArgs, MergeArgs, EncryptArgs)
+T = TypeVar("T", SplitArgs, MergeArgs, EncryptArgs, BatchArgs, ServeArgs, CacheArgs)
 
 
 class Args(NamedTuple, Generic[T]):
     command: Command
     options: T
+    validate_only: bool = False
+    metrics_json: Optional[str] = None
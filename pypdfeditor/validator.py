@@ -4,7 +4,20 @@ from argparse import ArgumentTypeError
 from pathlib import Path
 from typing import Optional
 
-from type_definitions import Args, Command, EncryptArgs, MergeArgs, SplitArgs
+from pypdfeditor.archive import ARCHIVE_MODES, archive_suffix
+from pypdfeditor.parser import parse_page_expression
+from pypdfeditor.type_definitions import (
+    Args,
+    BatchArgs,
+    CacheArgs,
+    Command,
+    EncryptArgs,
+    MergeArgs,
+    STDIO,
+    ServeArgs,
+    SplitArgs,
+    SplitMode,
+)
 
 
 def file_exists(path: str, error_message: str) -> None:
@@ -27,31 +40,79 @@ def is_valid_pdf_name(name: str, error_message: str) -> None:
 
 
 def is_valid_pages(pages: str) -> None:
-    # pattern = r"^(?!0)((\d+(-\d+)?)(,(\d+(-\d+)?))*)$"
-    # pattern = r"^((((([1-9]\d)*)|[1-9]+)-?)+\,?)+[^,\-]$"
     """
-    should select valid page ranges such as:
+    should select valid page expressions such as:
     - 1-2,5
-    - 1,2,5
-    - 1-2,5-10
-    - 1,2,5-10
+    - 5-,-3,last
+    - 10-1
+    - 1-100:2
+    - odd,even
     """
-    pattern = r"^(((([1-9]\d*)|[1-9]+)-(([1-9]\d*)|[1-9]+))|(([1-9]\d*)|[1-9]+))(,(((([1-9]\d*)|[1-9]+)-(([1-9]\d*)|[1-9]+))|(([1-9]\d*)|[1-9]+))|(([1-9]\d*)|[1-9]+))*$"
-
-    if not re.match(
-        pattern,
-        pages,
-    ):
+    try:
+        parse_page_expression(pages)
+    except ValueError:
         raise ArgumentTypeError("Error: Invalid range format.")
 
 
+def is_valid_jobs(jobs: int) -> None:
+    if jobs < 1:
+        raise ArgumentTypeError("Error: The number of jobs must be at least 1.")
+
+
+def is_valid_compression_level(level: int) -> None:
+    if not 0 <= level <= 9:
+        raise ArgumentTypeError("Error: The compression level must be between 0 and 9.")
+
+
+def is_valid_cache_size(size: int) -> None:
+    if size < 0:
+        raise ArgumentTypeError("Error: The cache size can not be negative.")
+
+
+def is_valid_prefetch(prefetch: int) -> None:
+    if prefetch < 0:
+        raise ArgumentTypeError(
+            "Error: The number of prefetched files can not be negative."
+        )
+
+
+def is_valid_output_dir(output_dir: str) -> None:
+    if output_dir != STDIO and not Path(output_dir).is_dir():
+        raise ArgumentTypeError(
+            f"Error: Output directory <{output_dir}> does not exist"
+        )
+
+
+def is_valid_archive(archive: str) -> None:
+    if archive_suffix(archive) is None:
+        raise ArgumentTypeError(
+            f"Error: The archive must end in one of {', '.join(ARCHIVE_MODES)}."
+        )
+    directory: Path = Path(archive).parent
+    if not directory.is_dir():
+        raise ArgumentTypeError(f"Error: Output directory <{directory}> does not exist")
+
+
 def validate_split_args(args: SplitArgs) -> None:
-    file_exists(args.source_file, "Error: Source file does not exist.")
-    is_valid_pdf(args.source_file)
+    if args.source_file != STDIO:
+        file_exists(args.source_file, "Error: Source file does not exist.")
+        is_valid_pdf(args.source_file)
     is_valid_pages(args.pages)
+    is_valid_output_dir(args.output_dir)
+    if args.output_dir == STDIO and args.mode != SplitMode.SINGLE_FILE:
+        raise ArgumentTypeError(
+            "Error: Only single_file splits can be written to stdout."
+        )
+    if args.archive is not None:
+        is_valid_archive(args.archive)
+    is_valid_jobs(args.jobs)
+    is_valid_compression_level(args.compression_level)
+    is_valid_cache_size(args.cache_max_size)
 
 
 def validate_output_file(output_file: str) -> None:
+    if output_file == STDIO:
+        return
     is_valid_pdf_name(output_file, "Error: Invalid Output file name.")
 
 
@@ -63,13 +124,14 @@ def validate_input_files(input_files: list[str]) -> None:
         if ":" in file:
             filename: str
             page_range: str | None = None
-            filename, page_range = file.split(":")
+            filename, _, page_range = file.partition(":")
             input_file_error_message: str = (
                 f"Error: Input file <{filename}>does not exist"
             )
-            file_exists(filename, input_file_error_message)
+            if filename != STDIO:
+                file_exists(filename, input_file_error_message)
             is_valid_pages(page_range)
-        else:
+        elif file != STDIO:
             input_file_error_message: str = f"Error: Input file <{file}> does not exist"
             file_exists(file, input_file_error_message)
 
@@ -77,14 +139,48 @@ def validate_input_files(input_files: list[str]) -> None:
 def validate_merge_args(args: MergeArgs) -> None:
     validate_output_file(args.output_file)
     validate_input_files(args.input_files)
+    is_valid_output_dir(args.output_dir)
+    is_valid_compression_level(args.compression_level)
+    is_valid_cache_size(args.cache_max_size)
+    is_valid_prefetch(args.prefetch)
 
 
 def validate_encrypt_args(args: EncryptArgs) -> None:
+    if not args.input_files:
+        raise ValueError("Error: At least 1 input file is required for encrypting.")
+    for input_file in args.input_files:
+        if input_file == STDIO:
+            if len(args.input_files) > 1:
+                raise ArgumentTypeError(
+                    "Error: stdin can only be encrypted on its own."
+                )
+            continue
+        file_exists(input_file, f"Error: Input file <{input_file}> does not exist")
+        is_valid_pdf(input_file)
+    is_valid_jobs(args.jobs)
+
+
+def validate_batch_args(args: BatchArgs) -> None:
+    file_exists(args.manifest, f"Error: Manifest <{args.manifest}> does not exist")
+    is_valid_jobs(args.jobs)
+
+
+def validate_serve_args(args: ServeArgs) -> None:
+    is_valid_jobs(args.jobs)
+    if args.max_queue < 0:
+        raise ArgumentTypeError("Error: The queue size can not be negative.")
+    if args.token is not None:
+        if args.port is None:
+            raise ArgumentTypeError("Error: A token can only be used with --port.")
+        if not args.token:
+            raise ArgumentTypeError("Error: The server token can not be empty.")
+
+
+def validate_cache_args(args: CacheArgs) -> None:
     file_exists(
-        args.input_file,
-        f"Error: Input file <{args.input_file}> does not exist",
+        args.cache_dir, f"Error: Cache directory <{args.cache_dir}> does not exist"
     )
-    is_valid_pdf(args.input_file)
+    is_valid_cache_size(args.max_size)
 
 
 def validate_args(args: Args) -> None:
@@ -95,3 +191,9 @@ def validate_args(args: Args) -> None:
             validate_merge_args(args=args.options)
         case Command.ENCRYPT:
             validate_encrypt_args(args=args.options)
+        case Command.BATCH:
+            validate_batch_args(args=args.options)
+        case Command.SERVE:
+            validate_serve_args(args=args.options)
+        case Command.CACHE:
+            validate_cache_args(args=args.options)
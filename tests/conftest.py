@@ -0,0 +1,12 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def source_file(tmp_path: Path) -> Path:
+    """A copy of doc.pdf in `tmp_path`, which a test may change or remove."""
+    source_file: Path = tmp_path / "doc.pdf"
+    shutil.copy("doc.pdf", source_file)
+    return source_file
@@ -0,0 +1,257 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+from PyPDF2 import PdfReader
+
+from pypdfeditor import async_editor
+from pypdfeditor.async_editor import encrypt_pdf_async, merge_pdf_async, split_pdf_async
+from pypdfeditor.type_definitions import SplitMode
+
+
+def staging_directories(directory: Path) -> list[Path]:
+    return list(directory.glob(".pypdfeditor-*"))
+
+
+class TestAsyncEditor:
+    def test_split_pdf_async(self, tmp_path: Path, source_file: Path) -> None:
+        """
+        Test case: should split in the executor and return the paths of the files written
+        """
+        output_dir: Path = tmp_path / "out"
+        output_dir.mkdir()
+        output_files: list[str] = asyncio.run(
+            split_pdf_async(
+                str(source_file),
+                "1-2,4",
+                SplitMode.RANGE_FILES,
+                output_dir=str(output_dir),
+            )
+        )
+
+        assert [Path(file).name for file in output_files] == ["doc_1.pdf", "doc_2.pdf"]
+        assert [len(PdfReader(file).pages) for file in output_files] == [2, 1]
+        assert staging_directories(output_dir) == []
+
+    def test_merge_and_encrypt_pdf_async(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should merge and then encrypt the merged file in place
+        """
+        output_file: Path = tmp_path / "merged.pdf"
+
+        async def merge_and_encrypt() -> None:
+            await merge_pdf_async(str(output_file), [f"{source_file}:1-2", "lorem.pdf"])
+            await encrypt_pdf_async(str(output_file), new_password="secret")
+
+        asyncio.run(merge_and_encrypt())
+
+        merged = PdfReader(output_file)
+        assert merged.decrypt("secret")
+        assert len(merged.pages) == 2 + len(PdfReader("lorem.pdf").pages)
+        assert staging_directories(tmp_path) == []
+
+    def test_failed_job_leaves_no_files(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should remove the files of a failed job and raise its error
+        """
+        with pytest.raises(ValueError):
+            asyncio.run(
+                split_pdf_async(str(source_file), "1-50", output_dir=str(tmp_path))
+            )
+        assert [path.name for path in tmp_path.iterdir()] == ["doc.pdf"]
+
+    def test_cancelled_job_leaves_no_files(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should remove the files of a running job once it stops after being cancelled
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_split(output_dir: str, **_) -> None:
+            (Path(output_dir) / "doc_1.pdf").write_bytes(b"partial")
+            started.set()
+            release.wait()
+
+        monkeypatch.setattr(async_editor, "split_pdf", slow_split)
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        async def cancel_split() -> None:
+            task = asyncio.create_task(
+                split_pdf_async(
+                    str(source_file), "1", output_dir=str(tmp_path), executor=executor
+                )
+            )
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_split())
+        assert len(staging_directories(tmp_path)) == 1
+        release.set()
+        executor.shutdown(wait=True)
+        assert [path.name for path in tmp_path.iterdir()] == ["doc.pdf"]
+
+    def test_limiter_serializes_jobs(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should only run as many jobs at once as the limiter allows
+        """
+        running: list[int] = [0]
+        most_running: list[int] = [0]
+        lock = threading.Lock()
+        split_pdf = async_editor.split_pdf
+
+        def counting_split(**kwargs) -> None:
+            with lock:
+                running[0] += 1
+                most_running[0] = max(most_running[0], running[0])
+            try:
+                split_pdf(**kwargs)
+            finally:
+                with lock:
+                    running[0] -= 1
+
+        monkeypatch.setattr(async_editor, "split_pdf", counting_split)
+
+        async def split_all() -> list[list[str]]:
+            limiter = asyncio.Semaphore(1)
+            return await asyncio.gather(
+                *(
+                    split_pdf_async(
+                        str(source_file),
+                        str(page),
+                        output_dir=str(tmp_path / str(page)),
+                        executor=executor,
+                        limiter=limiter,
+                    )
+                    for page in range(1, 5)
+                )
+            )
+
+        for page in range(1, 5):
+            (tmp_path / str(page)).mkdir()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results: list[list[str]] = asyncio.run(split_all())
+
+        assert most_running[0] == 1
+        assert [len(output_files) for output_files in results] == [1, 1, 1, 1]
+
+    def test_cancelled_job_holds_limiter_until_it_stops(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should keep a cancelled job counted by the limiter until the executor is done with it
+        """
+        started = threading.Event()
+        release = threading.Event()
+        running: list[int] = [0]
+        most_running: list[int] = [0]
+        lock = threading.Lock()
+
+        def slow_split(**_) -> None:
+            with lock:
+                running[0] += 1
+                most_running[0] = max(most_running[0], running[0])
+            started.set()
+            release.wait()
+            with lock:
+                running[0] -= 1
+
+        monkeypatch.setattr(async_editor, "split_pdf", slow_split)
+
+        async def cancel_and_resubmit() -> None:
+            limiter = asyncio.Semaphore(1)
+            first = asyncio.create_task(
+                split_pdf_async(
+                    str(source_file),
+                    "1",
+                    output_dir=str(tmp_path),
+                    executor=executor,
+                    limiter=limiter,
+                )
+            )
+            await asyncio.get_running_loop().run_in_executor(None, started.wait)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+
+            second = asyncio.create_task(
+                split_pdf_async(
+                    str(source_file),
+                    "1",
+                    output_dir=str(tmp_path),
+                    executor=executor,
+                    limiter=limiter,
+                )
+            )
+            await asyncio.sleep(0.1)
+            assert not second.done()
+            assert limiter.locked()
+            release.set()
+            await second
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            asyncio.run(cancel_and_resubmit())
+
+        assert most_running[0] == 1
+        assert staging_directories(tmp_path) == []
+
+    def test_stdio_is_rejected(self, source_file: Path) -> None:
+        """
+        Test case: should refuse stdin and stdout, which the async API can not stage
+        """
+        with pytest.raises(ValueError) as e:
+            asyncio.run(split_pdf_async(str(source_file), "1", output_dir="-"))
+        assert (
+            str(e.value) == "Error: stdin and stdout can not be used by the async API."
+        )
+
+    def test_split_pdf_async_on_process_pool(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should run the split on a process pool, which can not share a cancellation token
+        """
+
+        async def split_in_process(executor: ProcessPoolExecutor) -> list[str]:
+            output_files: list[str] = await split_pdf_async(
+                str(source_file),
+                "1-3",
+                SplitMode.MULTI_FILES,
+                output_dir=str(tmp_path),
+                executor=executor,
+            )
+            with pytest.raises(ValueError) as e:
+                await split_pdf_async(
+                    str(source_file),
+                    "1",
+                    output_dir=str(tmp_path),
+                    executor=executor,
+                    on_progress=print,
+                )
+            assert (
+                str(e.value)
+                == "Error: Progress can only be reported from a thread executor."
+            )
+            return output_files
+
+        with ProcessPoolExecutor(2) as executor:
+            output_files: list[str] = asyncio.run(split_in_process(executor))
+
+        assert [Path(file).name for file in output_files] == [
+            "doc_1.pdf",
+            "doc_2.pdf",
+            "doc_3.pdf",
+        ]
+        assert staging_directories(tmp_path) == []
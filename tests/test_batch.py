@@ -0,0 +1,173 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from pypdfeditor.batch import BatchResult, parse_job, read_manifest, run_batch
+from pypdfeditor.editor import encrypt_pdf
+from pypdfeditor.type_definitions import (
+    Args,
+    Command,
+    EncryptArgs,
+    MergeArgs,
+    SplitArgs,
+    SplitMode,
+)
+
+
+class TestBatch:
+    def test_parse_job_converts_csv_values(self) -> None:
+        """
+        Test case: should convert the text values of a CSV record to the option types
+        """
+        args: Args = parse_job(
+            {
+                "command": "split",
+                "source_file": "doc.pdf",
+                "pages": "1-3",
+                "mode": "multi_files",
+                "jobs": "2",
+                "dedupe": "true",
+                "output_file": "",
+            }
+        )
+        assert args == Args(
+            command=Command.SPLIT,
+            options=SplitArgs(
+                source_file="doc.pdf",
+                pages="1-3",
+                mode=SplitMode.MULTI_FILES,
+                jobs=2,
+                dedupe=True,
+            ),
+        )
+        assert parse_job(
+            {
+                "command": "merge",
+                "output_file": "out.pdf",
+                "input_files": "a.pdf; b.pdf:1",
+            }
+        ).options == MergeArgs(output_file="out.pdf", input_files=["a.pdf", "b.pdf:1"])
+        assert parse_job(
+            {"command": "encrypt", "input_file": "doc.pdf", "new_password": "secret"}
+        ).options == EncryptArgs(input_files=["doc.pdf"], new_password="secret")
+
+    def test_parse_job_keeps_empty_new_password(self) -> None:
+        """
+        Test case: should keep an empty new_password, which removes the password
+        """
+        assert parse_job(
+            {"command": "encrypt", "input_file": "doc.pdf", "new_password": ""}
+        ).options == EncryptArgs(input_files=["doc.pdf"], new_password="")
+
+    @pytest.mark.parametrize(
+        "record, error",
+        [
+            (
+                {"command": "batch", "manifest": "m.jsonl"},
+                "Error: Invalid batch command 'batch'",
+            ),
+            ({"source_file": "doc.pdf"}, "Error: Invalid batch command None"),
+            (
+                {"command": "split", "pages": "1", "color": "red"},
+                "Error: Unknown split options: color",
+            ),
+            (
+                {"command": "encrypt", "input_file": "doc.pdf"},
+                "Error: Encrypt jobs require a new_password.",
+            ),
+        ],
+    )
+    def test_parse_job_invalid_records(self, record: dict, error: str) -> None:
+        """
+        Test case: should raise an exception for unknown commands, unknown options and prompting jobs
+        """
+        with pytest.raises(ValueError) as e:
+            parse_job(record)
+        assert str(e.value) == error
+
+    def test_read_manifest_csv(self, tmp_path: Path) -> None:
+        """
+        Test case: should read one job per CSV row with the line it comes from
+        """
+        manifest: Path = tmp_path / "jobs.csv"
+        manifest.write_text(
+            "command,source_file,pages\nsplit,doc.pdf,1\nsplit,doc.pdf,2\n"
+        )
+        jobs = read_manifest(str(manifest))
+        assert [job.line for job in jobs] == [2, 3]
+        assert jobs[1].record == {
+            "command": "split",
+            "source_file": "doc.pdf",
+            "pages": "2",
+        }
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_run_batch_reports_every_job(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path, jobs: int
+    ) -> None:
+        """
+        Test case: should run every job of the manifest and report each result in manifest order
+        """
+        shutil.copy("doc.pdf", tmp_path / "doc.pdf")
+        shutil.copy("lorem.pdf", tmp_path / "lorem.pdf")
+        records: list[dict] = [
+            {
+                "command": "split",
+                "source_file": "doc.pdf",
+                "pages": "1-2",
+                "mode": "multi_files",
+            },
+            {
+                "command": "merge",
+                "output_file": "out.pdf",
+                "input_files": ["doc.pdf", "lorem.pdf:2"],
+            },
+            {"command": "split", "source_file": "doc.pdf", "pages": "9"},
+        ]
+        manifest: Path = tmp_path / "jobs.jsonl"
+        manifest.write_text(
+            "\n".join(json.dumps(record) for record in records) + "\n\nnot json\n"
+        )
+        monkeypatch.chdir(tmp_path)
+
+        results: list[BatchResult] = run_batch(str(manifest), jobs=jobs)
+
+        assert [(result.line, result.error is None) for result in results] == [
+            (1, True),
+            (2, True),
+            (3, False),
+            (5, False),
+        ]
+        assert (tmp_path / "doc_2.pdf").exists()
+        assert (tmp_path / "out.pdf").exists()
+
+    def test_run_batch_encrypted_input_without_current_password(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should fail an encrypt job of an encrypted file without a current password instead of prompting
+        """
+        shutil.copy("doc.pdf", tmp_path / "doc.pdf")
+        monkeypatch.chdir(tmp_path)
+        encrypt_pdf("doc.pdf", new_password="secret")
+
+        def no_prompt(prompt: str) -> str:
+            raise AssertionError(f"Prompted for {prompt!r}")
+
+        monkeypatch.setattr("pypdfeditor.editor.getpass", no_prompt)
+        manifest: Path = tmp_path / "jobs.jsonl"
+        manifest.write_text(
+            json.dumps(
+                {"command": "encrypt", "input_file": "doc.pdf", "new_password": "x"}
+            )
+            + "\n"
+        )
+
+        results: list[BatchResult] = run_batch(str(manifest))
+
+        assert [result.error for result in results] == [
+            "Error: The file is encrypted and no current password was given."
+        ]
@@ -0,0 +1,118 @@
+import io
+import shutil
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+from PyPDF2 import PdfReader
+
+from pypdfeditor import editor
+from pypdfeditor.editor import encrypt_pdf, encrypt_pdf_files, encrypt_pdf_stream
+
+
+class TestEncryptPdf:
+    def test_encrypt_pdf_round_trip(self, source_file: Path) -> None:
+        """
+        Test case: should add, replace and remove the password and keep every page and the metadata
+        """
+        original = PdfReader("doc.pdf")
+        texts: list[str] = [page.extract_text() for page in original.pages]
+
+        encrypt_pdf(str(source_file), new_password="first")
+        encrypt_pdf(str(source_file), new_password="second", current_password="first")
+        encrypted = PdfReader(source_file, strict=True)
+        assert encrypted.is_encrypted
+        assert not encrypted.decrypt("first")
+        assert encrypted.decrypt("second")
+        assert [page.extract_text() for page in encrypted.pages] == texts
+        assert encrypted.metadata == original.metadata
+
+        encrypt_pdf(str(source_file), new_password="", current_password="second")
+        decrypted = PdfReader(source_file, strict=True)
+        assert not decrypted.is_encrypted
+        assert [page.extract_text() for page in decrypted.pages] == texts
+
+    def test_encrypt_pdf_wrong_password(self, source_file: Path) -> None:
+        """
+        Test case: should refuse a wrong current password and leave the file untouched
+        """
+        encrypt_pdf(str(source_file), new_password="secret")
+        content: bytes = source_file.read_bytes()
+        with pytest.raises(ValueError) as e:
+            encrypt_pdf(
+                str(source_file), new_password="other", current_password="wrong"
+            )
+        assert str(e.value) == "Error: The current password is incorrect."
+        assert source_file.read_bytes() == content
+
+    def test_encrypt_pdf_through_symlink(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should encrypt the target of a symlink and keep the link
+        """
+        link: Path = tmp_path / "link.pdf"
+        link.symlink_to(source_file)
+
+        encrypt_pdf(str(link), new_password="secret")
+
+        assert link.is_symlink()
+        assert PdfReader(source_file).is_encrypted
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "doc.pdf",
+            "link.pdf",
+        ]
+
+    def test_encrypt_pdf_failed_write(
+        self, monkeypatch: MonkeyPatch, source_file: Path
+    ) -> None:
+        """
+        Test case: should keep the original file and remove the temporary one when writing fails
+        """
+
+        def failing_copy(reader, stream, password) -> None:
+            stream.write(b"%PDF-1.7\n")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(editor, "write_object_copy", failing_copy)
+        with pytest.raises(OSError):
+            encrypt_pdf(str(source_file), new_password="secret")
+        assert source_file.read_bytes() == Path("doc.pdf").read_bytes()
+        assert [path.name for path in source_file.parent.iterdir()] == ["doc.pdf"]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_encrypt_pdf_files(
+        self, capsys: pytest.CaptureFixture, tmp_path: Path, jobs: int
+    ) -> None:
+        """
+        Test case: should encrypt every file and report the ones that failed after trying all of them
+        """
+        input_files: list[str] = []
+        for i in range(4):
+            shutil.copy("doc.pdf", tmp_path / f"doc_{i}.pdf")
+            input_files.append(str(tmp_path / f"doc_{i}.pdf"))
+        broken: Path = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+
+        with pytest.raises(ValueError) as e:
+            encrypt_pdf_files(
+                [*input_files, str(broken)], new_password="secret", jobs=jobs
+            )
+        assert str(e.value) == "Error: 1 of 5 files could not be encrypted."
+        assert f"[failed] {broken}:" in capsys.readouterr().out
+        for input_file in input_files:
+            assert PdfReader(input_file).decrypt("secret")
+
+    def test_encrypt_pdf_stream(self) -> None:
+        """
+        Test case: should write an encrypted copy of a stream to another stream
+        """
+        output = io.BytesIO()
+        with open("doc.pdf", "rb") as source:
+            encrypt_pdf_stream(source, output, new_password="secret")
+
+        output.seek(0)
+        encrypted = PdfReader(output)
+        assert encrypted.is_encrypted
+        assert encrypted.decrypt("secret")
+        assert len(encrypted.pages) == 5
@@ -0,0 +1,31 @@
+import mmap
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+from PyPDF2.errors import EmptyFileError
+
+from pypdfeditor.mapped_file import open_pdf_reader
+
+
+class TestOpenPdfReader:
+    def test_open_pdf_reader_with_mmap(self) -> None:
+        """
+        Test case: should read the same pages from a memory mapping as from a regular reader
+        """
+        mapped: PdfReader = open_pdf_reader("lorem.pdf", use_mmap=True)
+        regular: PdfReader = open_pdf_reader("lorem.pdf")
+        assert isinstance(mapped.stream, mmap.mmap)
+        assert [page.extract_text() for page in mapped.pages] == [
+            page.extract_text() for page in regular.pages
+        ]
+        mapped.stream.close()
+
+    def test_open_pdf_reader_with_mmap_empty_file(self, tmp_path: Path) -> None:
+        """
+        Test case: should report an empty file as PdfReader does instead of failing to map it
+        """
+        empty_file: Path = tmp_path / "empty.pdf"
+        empty_file.touch()
+        with pytest.raises(EmptyFileError):
+            open_pdf_reader(str(empty_file), use_mmap=True)
@@ -0,0 +1,231 @@
+import io
+import shutil
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+from pypdfeditor.editor import check_merge, merge_pdf, merge_pdf_streams
+from pypdfeditor.type_definitions import WriteOptions
+
+INPUT_FILES: list[str] = ["doc.pdf", "lorem.pdf:2", "doc.pdf:3-4", "lorem.pdf"]
+
+
+class TestMergePdf:
+    @pytest.mark.parametrize(
+        "stream, use_mmap", [(False, False), (True, False), (False, True), (True, True)]
+    )
+    def test_merge_pdf_pages(
+        self, tmp_path: Path, stream: bool, use_mmap: bool
+    ) -> None:
+        """
+        Test case: should write every selected page of every input file in order
+        """
+        output_file: Path = tmp_path / "merged.pdf"
+        merge_pdf(
+            output_file=str(output_file),
+            input_files=INPUT_FILES,
+            stream=stream,
+            use_mmap=use_mmap,
+        )
+
+        merged = PdfReader(output_file, strict=True)
+        doc = PdfReader("doc.pdf")
+        lorem = PdfReader("lorem.pdf")
+        expected_pages = [
+            *doc.pages,
+            lorem.pages[1],
+            doc.pages[2],
+            doc.pages[3],
+            *lorem.pages,
+        ]
+        assert len(merged.pages) == len(expected_pages)
+        for page, expected_page in zip(merged.pages, expected_pages):
+            assert page.extract_text() == expected_page.extract_text()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_prefetch_keeps_input_order(
+        self, tmp_path: Path, stream: bool
+    ) -> None:
+        """
+        Test case: should merge prefetched input files in the order they are given
+        """
+        input_files: list[str] = []
+        for i in range(8):
+            shutil.copy("doc.pdf", tmp_path / f"doc_{i}.pdf")
+            input_files.append(f"{tmp_path / f'doc_{i}.pdf'}:{i % 5 + 1}")
+        input_files.append(input_files[0])
+
+        texts: list[list[str]] = []
+        for prefetch in [0, 3]:
+            output_file: Path = tmp_path / f"merged_{prefetch}.pdf"
+            merge_pdf(
+                output_file=str(output_file),
+                input_files=input_files,
+                stream=stream,
+                prefetch=prefetch,
+            )
+            texts.append([page.extract_text() for page in PdfReader(output_file).pages])
+
+        assert (
+            texts[0] == texts[1] == [f"Page{i % 5 + 1}" for i in range(8)] + ["Page1"]
+        )
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_page_order(self, tmp_path: Path, stream: bool) -> None:
+        """
+        Test case: should merge the pages of a page range in the requested order, repeats included
+        """
+        output_file: Path = tmp_path / "merged.pdf"
+        merge_pdf(
+            output_file=str(output_file),
+            input_files=["doc.pdf:last-4,2", "lorem.pdf:2,1,2"],
+            stream=stream,
+        )
+
+        merged = PdfReader(output_file, strict=True)
+        lorem = PdfReader("lorem.pdf")
+        assert [page.extract_text() for page in merged.pages] == [
+            "Page5",
+            "Page4",
+            "Page2",
+            *(lorem.pages[i].extract_text() for i in [1, 0, 1]),
+        ]
+
+    def test_merge_pdf_streaming_matches_regular_merge(self, tmp_path: Path) -> None:
+        """
+        Test case: streaming merge should keep the outline and the size of a regular merge
+        """
+        regular_file: Path = tmp_path / "regular.pdf"
+        streamed_file: Path = tmp_path / "streamed.pdf"
+        merge_pdf(output_file=str(regular_file), input_files=INPUT_FILES)
+        merge_pdf(output_file=str(streamed_file), input_files=INPUT_FILES, stream=True)
+
+        regular = PdfReader(regular_file)
+        streamed = PdfReader(streamed_file)
+        assert [item["/Title"] for item in streamed.outline] == [
+            item["/Title"] for item in regular.outline
+        ]
+        assert streamed_file.stat().st_size == regular_file.stat().st_size
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_dedupe(self, tmp_path: Path, stream: bool) -> None:
+        """
+        Test case: should store the fonts and images shared by copies of a file only once
+        """
+        input_files: list[str] = []
+        for name in ("first.pdf", "second.pdf"):
+            shutil.copy("lorem.pdf", tmp_path / name)
+            input_files.append(str(tmp_path / name))
+
+        regular_file: Path = tmp_path / "regular.pdf"
+        deduped_file: Path = tmp_path / "deduped.pdf"
+        merge_pdf(output_file=str(regular_file), input_files=input_files, stream=stream)
+        merge_pdf(
+            output_file=str(deduped_file),
+            input_files=input_files,
+            stream=stream,
+            options=WriteOptions(dedupe=True),
+        )
+
+        deduped = PdfReader(deduped_file, strict=True)
+        assert len(deduped.pages) == 4
+        assert deduped.pages[3].extract_text() == deduped.pages[1].extract_text()
+        assert deduped_file.stat().st_size < regular_file.stat().st_size * 0.75
+
+    def test_check_merge_page_range_exceeds_page_count(self) -> None:
+        """
+        Test case: should name the input file whose page range exceeds its page count
+        """
+        check_merge(INPUT_FILES)
+        with pytest.raises(ValueError) as e:
+            check_merge(["doc.pdf", "lorem.pdf:2-3"])
+        assert (
+            str(e.value)
+            == "Error: The page range of <lorem.pdf:2-3> exceeds the number of pages in the PDF file."
+        )
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_empty_page_range(self, tmp_path: Path, stream: bool) -> None:
+        """
+        Test case: should refuse an input file whose page range selects no pages
+        """
+        input_file: Path = tmp_path / "page.pdf"
+        writer = PdfWriter()
+        writer.add_page(PdfReader("doc.pdf").pages[0])
+        with open(input_file, "wb") as file:
+            writer.write(file)
+        output_file: Path = tmp_path / "merged.pdf"
+        input_files: list[str] = ["doc.pdf", f"{input_file}:even"]
+
+        with pytest.raises(ValueError) as e:
+            check_merge(input_files)
+        assert (
+            str(e.value)
+            == f"Error: The page range of <{input_file}:even> selects no pages."
+        )
+        with pytest.raises(ValueError) as e:
+            merge_pdf(str(output_file), input_files, stream=stream)
+        assert str(e.value) == "Error: The specified page range selects no pages."
+        assert not output_file.exists()
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_optimize(self, tmp_path: Path, stream: bool) -> None:
+        """
+        Test case: should write a smaller PDF 1.5 file with object streams and the same pages
+        """
+        regular_file: Path = tmp_path / "regular.pdf"
+        optimized_file: Path = tmp_path / "optimized.pdf"
+        merge_pdf(output_file=str(regular_file), input_files=INPUT_FILES, stream=stream)
+        merge_pdf(
+            output_file=str(optimized_file),
+            input_files=INPUT_FILES,
+            stream=stream,
+            options=WriteOptions(optimize=True, compression_level=9),
+        )
+
+        regular = PdfReader(regular_file)
+        optimized = PdfReader(optimized_file, strict=True)
+        assert optimized.pdf_header >= "%PDF-1.5"
+        assert optimized.xref_objStm
+        assert [page.extract_text() for page in optimized.pages] == [
+            page.extract_text() for page in regular.pages
+        ]
+        assert [item["/Title"] for item in optimized.outline] == [
+            item["/Title"] for item in regular.outline
+        ]
+        assert optimized_file.stat().st_size < regular_file.stat().st_size
+
+    def test_merge_pdf_streams(self) -> None:
+        """
+        Test case: should merge streams, and page ranges of streams, into a returned stream
+        """
+        with open("doc.pdf", "rb") as doc, open("lorem.pdf", "rb") as lorem:
+            output = merge_pdf_streams([(doc, "2,1"), lorem, (doc, "5")])
+
+        merged = PdfReader(output, strict=True)
+        texts: list[str] = [page.extract_text() for page in merged.pages]
+        assert texts[:2] == ["Page2", "Page1"]
+        assert texts[-1] == "Page5"
+        assert len(texts) == 3 + len(PdfReader("lorem.pdf").pages)
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_stdin_to_stdout(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        capsysbinary: pytest.CaptureFixture,
+        stream: bool,
+    ) -> None:
+        """
+        Test case: should read stdin once, even when listed twice, and write the merged file to stdout
+        """
+        monkeypatch.setattr(
+            "sys.stdin", io.TextIOWrapper(io.BytesIO(Path("doc.pdf").read_bytes()))
+        )
+        merge_pdf(
+            output_file="-", input_files=["-:1", "lorem.pdf:1", "-:5"], stream=stream
+        )
+
+        merged = PdfReader(io.BytesIO(capsysbinary.readouterr().out), strict=True)
+        assert len(merged.pages) == 3
+        assert merged.pages[2].extract_text() == "Page5"
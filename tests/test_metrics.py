@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from pypdfeditor.editor import merge_pdf, split_pdf
+from pypdfeditor.metrics import Metrics, collect_metrics, current_metrics, phase
+from pypdfeditor.type_definitions import SplitMode
+
+
+class TestMetrics:
+    def test_nested_phases_are_exclusive(self) -> None:
+        """
+        Test case: time spent in a nested phase should not be counted in the outer one
+        """
+        with collect_metrics() as metrics:
+            with phase("copy"):
+                with phase("open"):
+                    pass
+        assert metrics.phases["open"] > 0
+        assert metrics.phases["copy"] + metrics.phases["open"] <= metrics.seconds
+
+    def test_phase_without_collector(self) -> None:
+        """
+        Test case: should run the block and record nothing when no metrics are collected
+        """
+        with phase("write"):
+            pass
+        assert current_metrics() is None
+
+    def test_collect_metrics_reports_errors(self) -> None:
+        """
+        Test case: should call on_finish with the error when the block raises
+        """
+        finished: list[Metrics] = []
+        with pytest.raises(IndexError):
+            with collect_metrics("merge", on_finish=finished.append):
+                merge_pdf(output_file="out.pdf", input_files=["doc.pdf", "lorem.pdf:9"])
+        assert finished[0].command == "merge"
+        assert finished[0].error is not None
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_split_metrics(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path, jobs: int
+    ) -> None:
+        """
+        Test case: should count every written file, also those written by worker processes
+        """
+        source_file: str = str(Path("doc.pdf").resolve())
+        monkeypatch.chdir(tmp_path)
+        with collect_metrics("split") as metrics:
+            split_pdf(
+                source_file=source_file,
+                page_range="1-4",
+                mode=SplitMode.MULTI_FILES,
+                jobs=jobs,
+            )
+
+        assert metrics.files_written == 4
+        assert metrics.bytes_written == sum(
+            path.stat().st_size for path in tmp_path.iterdir()
+        )
+        assert metrics.phases["copy"] > 0
+        assert metrics.phases["write"] > 0
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+
+from pypdfeditor.page_tree import get_page, page_count
+
+
+def write_pdf(path: Path, objects: list[bytes]) -> None:
+    """Write `objects` as objects 1, 2, ... of a PDF file whose catalog is object 1."""
+    content: bytes = b"%PDF-1.4\n"
+    offsets: list[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref: int = len(content)
+    content += b"xref\n0 %d\n0000000000 65535 f\r\n" % (len(objects) + 1)
+    content += b"".join(b"%010d 00000 n\r\n" % offset for offset in offsets)
+    content += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(content)
+
+
+@pytest.fixture
+def nested_pdf(tmp_path: Path) -> str:
+    """Three pages under two /Pages nodes, with attributes inherited from both levels."""
+    path: Path = tmp_path / "nested.pdf"
+    write_pdf(
+        path,
+        [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 3 /MediaBox [0 0 100 100] /Rotate 90 >>",
+            b"<< /Type /Pages /Parent 2 0 R /Kids [5 0 R 6 0 R] /Count 2 /MediaBox [0 0 200 200] >>",
+            b"<< /Type /Pages /Parent 2 0 R /Kids [7 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 3 0 R >>",
+            b"<< /Type /Page /Parent 3 0 R /Rotate 180 >>",
+            b"<< /Type /Page /Parent 4 0 R /MediaBox [0 0 300 300] >>",
+        ],
+    )
+    return str(path)
+
+
+class TestPageTree:
+    def test_get_page_without_loading_page_tree(self, nested_pdf: str) -> None:
+        """
+        Test case: should find pages and their inherited attributes without loading every page
+        """
+        reader = PdfReader(nested_pdf)
+        assert page_count(reader) == 3
+        pages = [get_page(reader, i) for i in [2, 0, 1]]
+        assert reader.flattened_pages is None
+
+        assert [page.indirect_reference.idnum for page in pages] == [7, 5, 6]
+        assert [list(page.mediabox) for page in pages] == [
+            [0, 0, 300, 300],
+            [0, 0, 200, 200],
+            [0, 0, 200, 200],
+        ]
+        assert [page["/Rotate"] for page in pages] == [90, 90, 180]
+        assert get_page(reader, 0) is pages[1]
+
+    def test_get_page_with_broken_page_tree(self, tmp_path: Path) -> None:
+        """
+        Test case: should fall back to loading every page when the /Count entries are wrong
+        """
+        path: Path = tmp_path / "broken.pdf"
+        write_pdf(
+            path,
+            [
+                b"<< /Type /Catalog /Pages 2 0 R >>",
+                b"<< /Type /Pages /Kids [3 0 R 4 0 R] >>",
+                b"<< /Type /Pages /Parent 2 0 R /Kids [5 0 R] /Count 0 >>",
+                b"<< /Type /Page /Parent 2 0 R >>",
+                b"<< /Type /Page /Parent 3 0 R >>",
+            ],
+        )
+        reader = PdfReader(path)
+        assert page_count(PdfReader(path)) == 2
+        assert get_page(reader, 1).indirect_reference.idnum == 4
+        assert reader.flattened_pages is not None
@@ -1,49 +1,154 @@
 import pytest
 
-from pypdfeditor.parser import parse_page_range, parse_page_ranges
+from pypdfeditor.page_range import PageSelection
+from pypdfeditor.parser import (
+    parse_page_expression,
+    parse_page_range,
+    parse_page_ranges,
+)
 
 
 class TestParsePageRange:
     @pytest.mark.parametrize(
         "page_range, expected_page_range",
         [
-            ("1-10,11", {1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11}),
-            ("1-3,5,7", {1, 2, 3, 5, 7}),
-            ("2-6,9-10", {2, 3, 4, 5, 6, 9, 10}),
-            ("1", {1}),
-            ("1-10,11,15,100", {1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 15, 100}),
-            ("1,10-15", {1, 10, 11, 12, 13, 14, 15}),
-            ("1,3-5", {1, 3, 4, 5}),
-            ("1-3,5,8-9", {1, 2, 3, 5, 8, 9}),
+            ("1-10,11", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]),
+            ("1-3,5,7", [1, 2, 3, 5, 7]),
+            ("2-6,9-10", [2, 3, 4, 5, 6, 9, 10]),
+            ("1", [1]),
+            ("1-10,11,15,100", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 15, 100]),
+            ("1,10-15", [1, 10, 11, 12, 13, 14, 15]),
+            ("1,3-5", [1, 3, 4, 5]),
+            ("1-3,5,8-9", [1, 2, 3, 5, 8, 9]),
         ],
     )
-    def test_parse_valid_ranges_returning_set(
-        self, page_range: str, expected_page_range: set[int]
+    def test_parse_valid_ranges_returning_pages_in_order(
+        self, page_range: str, expected_page_range: list[int]
     ) -> None:
         """
-        Test case: should return a set of int if page_range input is valid
+        Test case: should return the selected pages in order if page_range input is valid
         """
-        pages: set[int] = parse_page_range(pages=page_range)
-        assert pages == expected_page_range
+        pages: PageSelection = parse_page_range(pages=page_range)
+        assert list(pages) == expected_page_range
 
     @pytest.mark.parametrize(
         "page_range, expected_page_range",
         [
-            ("1-10,11", [{1, 2, 3, 4, 5, 6, 7, 8, 9, 10}, {11}]),
-            ("1-3,5,7", [{1, 2, 3}, {5}, {7}]),
-            ("2-6,9-10", [{2, 3, 4, 5, 6}, {9, 10}]),
-            ("1", [{1}]),
-            ("1-10,11,15,100", [{1, 2, 3, 4, 5, 6, 7, 8, 9, 10}, {11}, {15}, {100}]),
-            ("1,10-15", [{1}, {10, 11, 12, 13, 14, 15}]),
-            ("1,3-5", [{1}, {3, 4, 5}]),
-            ("1-3,5,8-9", [{1, 2, 3}, {5}, {8, 9}]),
+            ("1-10,11", [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [11]]),
+            ("1-3,5,7", [[1, 2, 3], [5], [7]]),
+            ("2-6,9-10", [[2, 3, 4, 5, 6], [9, 10]]),
+            ("1", [[1]]),
+            ("1-10,11,15,100", [[1, 2, 3, 4, 5, 6, 7, 8, 9, 10], [11], [15], [100]]),
+            ("1,10-15", [[1], [10, 11, 12, 13, 14, 15]]),
+            ("1,3-5", [[1], [3, 4, 5]]),
+            ("1-3,5,8-9", [[1, 2, 3], [5], [8, 9]]),
         ],
     )
-    def test_parse_valid_ranges_returning_list_of_sets(
-        self, page_range: str, expected_page_range: list[set[int]]
+    def test_parse_valid_ranges_returning_list_of_selections(
+        self, page_range: str, expected_page_range: list[list[int]]
     ) -> None:
         """
-        Test case: should return a set of int if page_range input is valid
+        Test case: should return the selected pages of each range if page_range input is valid
         """
-        pages: list[set[int]] = parse_page_ranges(pages=page_range)
-        assert pages == expected_page_range
+        pages: list[PageSelection] = parse_page_ranges(pages=page_range)
+        assert [list(selection) for selection in pages] == expected_page_range
+
+    @pytest.mark.parametrize(
+        "page_range, expected_pages",
+        [
+            ("8-", [[8, 9, 10]]),
+            ("-3", [[1, 2, 3]]),
+            ("last", [[10]]),
+            ("9-last", [[9, 10]]),
+            ("4-1", [[4, 3, 2, 1]]),
+            ("last-8", [[10, 9, 8]]),
+            ("1-10:3", [[1, 4, 7, 10]]),
+            ("10-1:4", [[10, 6, 2]]),
+            ("odd,even", [[1, 3, 5, 7, 9], [2, 4, 6, 8, 10]]),
+        ],
+    )
+    def test_parse_page_expression_against_page_count(
+        self, page_range: str, expected_pages: list[list[int]]
+    ) -> None:
+        """
+        Test case: should resolve open, reverse and stepped ranges against the page count
+        """
+        spans = parse_page_expression(page_range)
+        assert [list(span.resolve(page_count=10)) for span in spans] == expected_pages
+        assert [
+            list(selection)
+            for selection in parse_page_ranges(page_range, page_count=10)
+        ] == expected_pages
+
+    @pytest.mark.parametrize(
+        "page_range, page_count, expected_pages",
+        [
+            ("odd", 1, [[1]]),
+            ("even", 1, [[]]),
+            ("odd,even", 1, [[1], []]),
+            ("odd", 2, [[1]]),
+            ("even", 2, [[2]]),
+            ("last-1", 2, [[2, 1]]),
+            ("2-1", 1, [[2, 1]]),
+            ("2-", 1, [[2]]),
+            ("3-last", 2, [[3]]),
+        ],
+    )
+    def test_parse_page_expression_past_last_page(
+        self, page_range: str, page_count: int, expected_pages: list[list[int]]
+    ) -> None:
+        """
+        Test case: should only run an explicit a-b range backwards, never one running to the last page
+        """
+        assert [
+            list(selection)
+            for selection in parse_page_ranges(page_range, page_count=page_count)
+        ] == expected_pages
+
+    def test_empty_page_selection(self) -> None:
+        """
+        Test case: should select no page for a keyword without such a page
+        """
+        pages: PageSelection = parse_page_range("even", page_count=1)
+        assert list(pages) == [] and len(pages) == 0
+        assert pages.max() == 0
+
+    def test_page_selection_works_on_ranges(self) -> None:
+        """
+        Test case: should answer membership, slices and equality from the ranges, without listing the pages
+        """
+        pages: PageSelection = parse_page_range("1-5000000,7,20-10:5")
+        assert 4_999_999 in pages and 7 in pages and 15 in pages
+        assert 5_000_001 not in pages and 0 not in pages and "1" not in pages
+        assert pages[:2] == PageSelection([range(1, 3)])
+        assert list(pages[4_999_999:]) == [5_000_000, 7, 20, 15, 10]
+        assert list(pages[::-2_000_000]) == [10, 3_000_004, 1_000_004]
+        assert list(pages[-3:-1]) == [20, 15]
+        assert pages[5:5] == PageSelection()
+        assert parse_page_range("1-3,4-5") == parse_page_range("1-5")
+        assert parse_page_range("1-5") != parse_page_range("1-4")
+
+    def test_parse_page_expression_is_shared(self) -> None:
+        """
+        Test case: should parse an expression once and return the same result to every caller
+        """
+        pages: str = ",".join(f"{i}-{i + 1}" for i in range(1, 20_000, 3))
+        assert parse_page_expression(pages) is parse_page_expression(pages)
+        assert len(parse_page_range(pages)) == 2 * len(range(1, 20_000, 3))
+
+    def test_parse_open_range_without_page_count(self) -> None:
+        """
+        Test case: should raise an exception when an open range is resolved without a page count
+        """
+        with pytest.raises(ValueError):
+            parse_page_range("5-")
+
+    def test_parse_page_range_keeps_order_and_repeats(self) -> None:
+        """
+        Test case: should keep the requested order and repeated pages
+        """
+        pages: PageSelection = parse_page_range("3,1,2,1,6-4", page_count=6)
+        assert list(pages) == [3, 1, 2, 1, 6, 5, 4]
+        assert len(pages) == 7
+        assert pages[4] == 6 and pages[-1] == 4
+        assert pages.max() == 6
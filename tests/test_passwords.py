@@ -0,0 +1,51 @@
+import os
+from argparse import ArgumentTypeError
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from pypdfeditor.passwords import read_password
+
+
+class TestReadPassword:
+    def test_read_password_sources(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should read the password from an environment variable, a file descriptor and a key file
+        """
+        monkeypatch.setenv("PDF_PASSWORD", "from env")
+        assert read_password("env:PDF_PASSWORD") == "from env"
+
+        key_file: Path = tmp_path / "key"
+        key_file.write_text("from file\nignored\n")
+        assert read_password(f"file:{key_file}") == "from file"
+
+        read_end, write_end = os.pipe()
+        os.write(write_end, b"from fd\n")
+        os.close(write_end)
+        try:
+            assert read_password(f"fd:{read_end}") == "from fd"
+        finally:
+            os.close(read_end)
+
+    @pytest.mark.parametrize(
+        "source, error",
+        [
+            ("secret", "Error: Invalid password source 'secret'"),
+            (
+                "env:PDF_PASSWORD_UNSET",
+                "Error: Environment variable PDF_PASSWORD_UNSET is not set.",
+            ),
+            ("fd:one", "Error: Invalid file descriptor 'one'."),
+            ("file:missing.key", "Error: Can not read key file <missing.key>"),
+        ],
+    )
+    def test_read_password_invalid_sources(self, source: str, error: str) -> None:
+        """
+        Test case: should raise an exception for unknown or unreadable password sources
+        """
+        with pytest.raises(ArgumentTypeError) as e:
+            read_password(source)
+        assert str(e.value).startswith(error)
@@ -0,0 +1,165 @@
+import io
+from pathlib import Path
+
+import pytest
+from pytest import MonkeyPatch
+
+from pypdfeditor.editor import merge_pdf, split_pdf
+from pypdfeditor.main import main
+from pypdfeditor.progress import (
+    CancellationToken,
+    JobCancelled,
+    Progress,
+    ProgressBar,
+    track_progress,
+)
+from pypdfeditor.type_definitions import SplitMode
+
+
+class TestProgress:
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_split_pdf_progress(
+        self, tmp_path: Path, source_file: Path, jobs: int
+    ) -> None:
+        """
+        Test case: should report every page of a split, also the ones written by worker processes
+        """
+        reports: list[Progress] = []
+        with track_progress(on_progress=reports.append):
+            split_pdf(
+                str(source_file),
+                "1-5",
+                SplitMode.MULTI_FILES,
+                jobs=jobs,
+                output_dir=str(tmp_path),
+            )
+
+        assert reports[-1].done == reports[-1].total == 5
+        assert reports[-1].pages == 5
+        assert reports[-1].bytes_written == sum(
+            (tmp_path / f"doc_{i}.pdf").stat().st_size for i in range(1, 6)
+        )
+        assert reports[-1].eta == 0
+        assert [report.done for report in reports] == sorted(
+            report.done for report in reports
+        )
+
+    def test_cancelled_split_removes_its_files(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should stop a cancelled split at a page and remove the files it wrote, but no others
+        """
+        (tmp_path / "doc_4.pdf").write_bytes(b"kept")
+        token = CancellationToken()
+
+        def cancel_after_two_pages(progress: Progress) -> None:
+            if progress.pages == 2:
+                token.cancel()
+
+        with pytest.raises(JobCancelled) as e:
+            with track_progress(on_progress=cancel_after_two_pages, token=token):
+                split_pdf(
+                    str(source_file),
+                    "1-5",
+                    SplitMode.MULTI_FILES,
+                    output_dir=str(tmp_path),
+                )
+
+        assert str(e.value) == "Error: The job was cancelled."
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "doc.pdf",
+            "doc_4.pdf",
+        ]
+        assert (tmp_path / "doc_4.pdf").read_bytes() == b"kept"
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_merge_pdf_progress(
+        self, tmp_path: Path, source_file: Path, stream: bool
+    ) -> None:
+        """
+        Test case: should count each input file of a merge as a step, with the pages it adds
+        """
+        output_file: Path = tmp_path / "merged.pdf"
+        reports: list[Progress] = []
+        with track_progress(on_progress=reports.append):
+            merge_pdf(
+                str(output_file),
+                [f"{source_file}:1-3", "lorem.pdf"],
+                stream=stream,
+            )
+
+        assert reports[-1].done == reports[-1].total == 2
+        assert reports[-1].pages == 5
+        assert reports[-1].bytes_written == output_file.stat().st_size
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_cancelled_merge_removes_its_output(
+        self, tmp_path: Path, source_file: Path, stream: bool
+    ) -> None:
+        """
+        Test case: should stop a cancelled merge between input files and remove its partial output
+        """
+        output_file: Path = tmp_path / "merged.pdf"
+        token = CancellationToken()
+
+        def cancel_after_first_file(progress: Progress) -> None:
+            if progress.done == 1:
+                token.cancel()
+
+        with pytest.raises(JobCancelled):
+            with track_progress(on_progress=cancel_after_first_file, token=token):
+                merge_pdf(
+                    str(output_file),
+                    [str(source_file), "lorem.pdf", str(source_file)],
+                    stream=stream,
+                )
+        assert not output_file.exists()
+
+    def test_progress_bar(self) -> None:
+        """
+        Test case: should redraw the bar on one line and end the line once the job is done
+        """
+        output = io.StringIO()
+        bar = ProgressBar(output, width=10, interval=0)
+        bar(Progress(done=0, total=4, pages=0, bytes_written=0, seconds=0.0))
+        bar(Progress(done=2, total=4, pages=2, bytes_written=1024 * 1024, seconds=2.0))
+        bar(
+            Progress(
+                done=4, total=4, pages=4, bytes_written=2 * 1024 * 1024, seconds=4.0
+            )
+        )
+        bar.close()
+
+        lines: list[str] = output.getvalue().split("\r")
+        assert lines[2] == "[#####     ]  50% 2/4 1.0 MiB ETA 0:00:02"
+        assert lines[3] == "[##########] 100% 4/4 2.0 MiB ETA 0:00:00\n"
+
+    def test_split_command_shows_progress(
+        self,
+        monkeypatch: MonkeyPatch,
+        capsys: pytest.CaptureFixture,
+        tmp_path: Path,
+        source_file: Path,
+    ) -> None:
+        """
+        Test case: should draw the progress bar of a split on stderr with --progress
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "split",
+                str(source_file),
+                "-p",
+                "1-5",
+                "-d",
+                str(tmp_path),
+                "--progress",
+            ],
+        )
+        main()
+        captured = capsys.readouterr()
+        assert "The PDF file was successfully split into 1 file" in captured.out
+        assert "100% 5/5" in captured.err
+        assert captured.err.endswith("\n")
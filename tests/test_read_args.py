@@ -1,8 +1,21 @@
+from pathlib import Path
+
 import pytest
 from pytest import MonkeyPatch
 
 from pypdfeditor.read_args import read_args
-from pypdfeditor.type_definitions import Args, Command, MergeArgs, SplitArgs
+from pypdfeditor.type_definitions import (
+    Args,
+    BatchArgs,
+    CacheAction,
+    CacheArgs,
+    CacheKey,
+    Command,
+    EncryptArgs,
+    MergeArgs,
+    ServeArgs,
+    SplitArgs,
+)
 
 
 class TestReadArgs:
@@ -95,3 +108,179 @@ class TestReadArgs:
             ),
         )
         assert args == expected_args
+
+    def test_read_args_batch_with_arguments(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should return Args object when batch command is provided with a manifest
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            ["pypdfeditor", "batch", "jobs.jsonl", "-j", "4"],
+        )
+        args: Args = read_args()
+        expected_args: Args = Args(
+            command=Command.BATCH,
+            options=BatchArgs(manifest="jobs.jsonl", jobs=4),
+        )
+        assert args == expected_args
+
+    def test_read_args_serve_with_arguments(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should return Args object when serve command is provided with a socket
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "serve",
+                "--socket",
+                "jobs.sock",
+                "-j",
+                "2",
+                "--max-queue",
+                "4",
+            ],
+        )
+        args: Args = read_args()
+        expected_args: Args = Args(
+            command=Command.SERVE,
+            options=ServeArgs(socket="jobs.sock", port=None, jobs=2, max_queue=4),
+        )
+        assert args == expected_args
+
+    def test_read_args_serve_with_token(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should read the token of the HTTP server from its source
+        """
+        monkeypatch.setenv("PYPDFEDITOR_TOKEN", "secret")
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "serve",
+                "--port",
+                "8080",
+                "--token",
+                "env:PYPDFEDITOR_TOKEN",
+            ],
+        )
+        args: Args = read_args()
+        expected_args: Args = Args(
+            command=Command.SERVE,
+            options=ServeArgs(port=8080, token="secret"),
+        )
+        assert args == expected_args
+
+    def test_read_args_split_with_cache(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should return the cache options of a split
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "split",
+                "doc.pdf",
+                "-p",
+                "1",
+                "--cache-dir",
+                "cache",
+                "--cache-key",
+                "content",
+            ],
+        )
+        args: Args = read_args()
+        assert args.options == SplitArgs(
+            source_file="doc.pdf",
+            pages="1",
+            cache_dir="cache",
+            cache_key=CacheKey.CONTENT,
+        )
+
+    def test_read_args_merge_with_progress(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should enable the progress bar when --progress is provided
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "merge",
+                "-o",
+                "out.pdf",
+                "-i",
+                "a.pdf",
+                "-i",
+                "b.pdf",
+                "--progress",
+            ],
+        )
+        args: Args = read_args()
+        assert args.options == MergeArgs(
+            output_file="out.pdf",
+            input_files=["a.pdf", "b.pdf"],
+            progress=True,
+        )
+
+    def test_read_args_cache_with_arguments(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should return Args object when cache command is provided with an action
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "cache",
+                "prune",
+                "--cache-dir",
+                "cache",
+                "--max-size",
+                "0",
+            ],
+        )
+        args: Args = read_args()
+        expected_args: Args = Args(
+            command=Command.CACHE,
+            options=CacheArgs(action=CacheAction.PRUNE, cache_dir="cache", max_size=0),
+        )
+        assert args == expected_args
+
+    def test_read_args_validate_only(self, monkeypatch: MonkeyPatch) -> None:
+        """
+        Test case: should flag the command as validation only when --validate-only is provided
+        """
+        monkeypatch.setattr(
+            "sys.argv",
+            ["pypdfeditor", "split", "doc.pdf", "-p", "1-3", "--validate-only"],
+        )
+        args: Args = read_args()
+        assert args.validate_only
+
+    def test_read_args_encrypt_many_files(
+        self, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should expand glob patterns and read the passwords from their sources
+        """
+        for name in ["b.pdf", "a.pdf", "c.txt"]:
+            (tmp_path / name).touch()
+        monkeypatch.setenv("PDF_PASSWORD", "secret")
+        monkeypatch.setattr(
+            "sys.argv",
+            [
+                "pypdfeditor",
+                "encrypt",
+                str(tmp_path / "*.pdf"),
+                str(tmp_path / "a.pdf"),
+                "--new-password",
+                "env:PDF_PASSWORD",
+                "-j",
+                "4",
+            ],
+        )
+        args: Args = read_args()
+        assert args.options == EncryptArgs(
+            input_files=[str(tmp_path / "a.pdf"), str(tmp_path / "b.pdf")],
+            new_password="secret",
+            jobs=4,
+        )
@@ -0,0 +1,93 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+
+from pypdfeditor.reader_cache import ReaderCache, ReaderPrefetcher
+
+
+class TestReaderCache:
+    def test_reader_cache_reuses_reader(self) -> None:
+        """
+        Test case: should parse a source once when it is requested again, even through another path
+        """
+        readers = ReaderCache()
+        reader: PdfReader = readers.get("doc.pdf")
+        assert readers.get(str(Path("doc.pdf").resolve())) is reader
+        assert readers.get("./doc.pdf") is reader
+        assert (readers.hits, readers.misses) == (2, 1)
+
+    def test_reader_cache_evicts_least_recently_used(self) -> None:
+        """
+        Test case: should drop the least recently used reader when the cap is reached
+        """
+        evicted: list[PdfReader] = []
+        readers = ReaderCache(max_readers=1, on_evict=evicted.append)
+        doc: PdfReader = readers.get("doc.pdf")
+        readers.get("lorem.pdf")
+        assert evicted == [doc]
+        assert len(readers) == 1
+        assert readers.get("doc.pdf") is not doc
+
+    def test_reader_cache_reopens_modified_file(self, tmp_path: Path) -> None:
+        """
+        Test case: should open a new reader when the source modification time changes
+        """
+        source_file: Path = tmp_path / "doc.pdf"
+        shutil.copy("doc.pdf", source_file)
+        readers = ReaderCache()
+        reader: PdfReader = readers.get(str(source_file))
+
+        stat: os.stat_result = source_file.stat()
+        os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert readers.get(str(source_file)) is not reader
+
+    def test_reader_cache_discard_and_clear(self) -> None:
+        """
+        Test case: should hand every dropped reader to the eviction callback
+        """
+        evicted: list[PdfReader] = []
+        readers = ReaderCache(on_evict=evicted.append)
+        doc: PdfReader = readers.get("doc.pdf")
+        lorem: PdfReader = readers.get("lorem.pdf")
+        readers.discard("doc.pdf")
+        readers.clear()
+        assert evicted == [doc, lorem]
+        assert len(readers) == 0
+
+    def test_reader_prefetcher_opens_next_files(self) -> None:
+        """
+        Test case: should hand out readers in order while opening the next files, skipping cached ones
+        """
+        readers = ReaderCache()
+        filenames: list[str] = [
+            "doc.pdf",
+            "lorem.pdf",
+            "./doc.pdf",
+            "tests/../lorem.pdf",
+        ]
+        with ReaderPrefetcher(readers, filenames, lookahead=2) as prefetcher:
+            doc: PdfReader = prefetcher.next_reader()
+            assert [path for path, _ in prefetcher._pending] == [
+                str(Path("lorem.pdf").resolve())
+            ]
+            lorem: PdfReader = prefetcher.next_reader()
+            # Both are cached under their resolved paths by now.
+            assert list(prefetcher._pending) == []
+            assert prefetcher.next_reader() is doc
+            assert prefetcher.next_reader() is lorem
+        assert (readers.hits, readers.misses) == (2, 2)
+
+    def test_reader_prefetcher_raises_errors_in_order(self, tmp_path: Path) -> None:
+        """
+        Test case: should only raise the error of a file that can not be opened once its turn comes
+        """
+        (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+        with ReaderPrefetcher(
+            ReaderCache(), ["doc.pdf", str(tmp_path / "broken.pdf")], lookahead=2
+        ) as prefetcher:
+            assert len(prefetcher.next_reader().pages) == 5
+            with pytest.raises(Exception):
+                prefetcher.next_reader()
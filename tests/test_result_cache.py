@@ -0,0 +1,150 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from mock import patch
+from PyPDF2 import PdfReader
+
+from pypdfeditor.editor import merge_pdf, split_pdf
+from pypdfeditor.result_cache import ResultCache
+from pypdfeditor.type_definitions import CacheKey, SplitMode, WriteOptions
+
+
+class TestResultCache:
+    def test_split_pdf_restores_cached_outputs(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should link the files of an identical earlier split instead of reading the source again
+        """
+        cache = ResultCache(str(tmp_path / "cache"))
+        output_dir: Path = tmp_path / "out"
+        output_dir.mkdir()
+        monkeypatch.chdir(output_dir)
+        split_pdf(str(source_file), "1-2", SplitMode.MULTI_FILES, cache=cache)
+        first: list[int] = [os.stat(f"doc_{i}.pdf").st_ino for i in (1, 2)]
+        os.unlink("doc_1.pdf")
+
+        with patch("pypdfeditor.editor.open_reader") as open_reader:
+            split_pdf(str(source_file), "1-2", SplitMode.MULTI_FILES, cache=cache)
+        open_reader.assert_not_called()
+        assert [os.stat(f"doc_{i}.pdf").st_ino for i in (1, 2)] == first
+        assert PdfReader("doc_1.pdf").pages[0].extract_text() == "Page1"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.parametrize(
+        "page_range, mode, options",
+        [
+            ("1-3", SplitMode.SINGLE_FILE, WriteOptions()),
+            ("1-2", SplitMode.RANGE_FILES, WriteOptions()),
+            ("1-2", SplitMode.MULTI_FILES, WriteOptions(optimize=True)),
+        ],
+    )
+    def test_split_pdf_misses_other_options(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        source_file: Path,
+        page_range: str,
+        mode: SplitMode,
+        options: WriteOptions,
+    ) -> None:
+        """
+        Test case: should not reuse a split with other pages, mode or write options
+        """
+        cache = ResultCache(str(tmp_path / "cache"))
+        monkeypatch.chdir(tmp_path)
+        split_pdf(str(source_file), "1-2", SplitMode.MULTI_FILES, cache=cache)
+        split_pdf(str(source_file), page_range, mode, options=options, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_split_pdf_to_cached_archive_reports_its_parts(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture,
+        tmp_path: Path,
+        source_file: Path,
+    ) -> None:
+        """
+        Test case: should report the files held by a restored archive, as the split that wrote it did
+        """
+        cache = ResultCache(str(tmp_path / "cache"))
+        monkeypatch.chdir(tmp_path)
+        for _ in range(2):
+            split_pdf(
+                str(source_file),
+                "1-3",
+                SplitMode.MULTI_FILES,
+                cache=cache,
+                archive="parts.zip",
+            )
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert (
+            capsys.readouterr().out.splitlines()
+            == ["The PDF file was successfully split into 3 files"] * 2
+        )
+
+    @pytest.mark.parametrize(
+        "key_mode, hits", [(CacheKey.STAT, 0), (CacheKey.CONTENT, 1)]
+    )
+    def test_merge_pdf_with_copied_input(
+        self, tmp_path: Path, source_file: Path, key_mode: CacheKey, hits: int
+    ) -> None:
+        """
+        Test case: should only recognize a copy of an input file when keyed by content
+        """
+        cache = ResultCache(str(tmp_path / "cache"), key_mode=key_mode)
+        merge_pdf(
+            str(tmp_path / "a.pdf"), [str(source_file), f"{source_file}:2"], cache=cache
+        )
+        shutil.copy(source_file, tmp_path / "copy.pdf")
+        os.utime(tmp_path / "copy.pdf", ns=(0, 0))
+        merge_pdf(
+            str(tmp_path / "b.pdf"),
+            [str(tmp_path / "copy.pdf"), f"{tmp_path / 'copy.pdf'}:2"],
+            cache=cache,
+        )
+        assert cache.hits == hits
+        assert len(PdfReader(tmp_path / "b.pdf").pages) == 6
+
+    def test_modified_output_is_not_restored(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should drop an entry whose output file was rewritten in place since it was stored
+        """
+        cache = ResultCache(str(tmp_path / "cache"))
+        output_file: Path = tmp_path / "out.pdf"
+        merge_pdf(str(output_file), [str(source_file), str(source_file)], cache=cache)
+        with open(output_file, "ab") as file:
+            file.write(b"%")
+
+        merge_pdf(str(output_file), [str(source_file), str(source_file)], cache=cache)
+        assert (cache.hits, cache.misses) == (0, 2)
+        assert len(PdfReader(output_file, strict=True).pages) == 10
+
+    def test_prune_evicts_least_recently_used(
+        self, tmp_path: Path, source_file: Path
+    ) -> None:
+        """
+        Test case: should evict the least recently used entries above the size limit
+        """
+        cache = ResultCache(str(tmp_path / "cache"))
+        keys: list[str] = []
+        for i, name in enumerate(["a.pdf", "b.pdf", "c.pdf"]):
+            output_file: Path = tmp_path / name
+            shutil.copy(source_file, output_file)
+            keys.append(cache.key("test", [], i))
+            cache.store(keys[-1], [str(output_file)])
+            os.utime(
+                cache.entries_directory / keys[-1] / "manifest.json", (i + 1, i + 1)
+            )
+        assert cache.lookup(keys[0]) is not None
+
+        entry_size: int = cache.stats().size // 3
+        assert cache.prune(2 * entry_size) == 1
+        assert cache.lookup(keys[1]) is None
+        assert cache.stats().entries == 2
+        assert cache.prune(0) == 2
+        assert cache.stats().entries == 0
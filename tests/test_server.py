@@ -0,0 +1,186 @@
+import http.client
+import json
+import os
+import shutil
+import stat
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pytest
+from pytest import MonkeyPatch
+
+from pypdfeditor.server import (
+    HOST,
+    MAX_BODY_SIZE,
+    JobDispatcher,
+    JobHttpServer,
+    JobUnixServer,
+)
+
+
+@pytest.fixture
+def dispatcher() -> Iterator[JobDispatcher]:
+    dispatcher = JobDispatcher(jobs=1, max_queue=0)
+    yield dispatcher
+    dispatcher.shutdown()
+
+
+@pytest.fixture
+def http_server(dispatcher: JobDispatcher) -> Iterator[JobHttpServer]:
+    server = JobHttpServer(0, dispatcher, token="secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post_job(
+    server: JobHttpServer, body: bytes, content_type: str, token: Optional[str]
+) -> tuple[int, dict]:
+    request = urllib.request.Request(
+        f"http://{HOST}:{server.server_address[1]}/",
+        data=body,
+        headers={"Content-Type": content_type},
+        method="POST",
+    )
+    if token is not None:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+class TestServer:
+    def test_dispatch_line_runs_job(
+        self, dispatcher: JobDispatcher, monkeypatch: MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should run a job sent as a JSON line and report it as ok
+        """
+        shutil.copy("doc.pdf", tmp_path / "doc.pdf")
+        monkeypatch.chdir(tmp_path)
+        record: dict = {
+            "command": "split",
+            "source_file": "doc.pdf",
+            "pages": "1-2",
+            "mode": "multi_files",
+        }
+
+        for _ in range(2):
+            result: dict = dispatcher.dispatch_line(json.dumps(record).encode())
+            assert result["status"] == "ok"
+        assert (tmp_path / "doc_2.pdf").exists()
+
+    @pytest.mark.parametrize(
+        "line, error",
+        [
+            (b"not json", "Error: Invalid JSON"),
+            (b'{"command": "batch"}', "Error: Invalid batch command 'batch'"),
+            (
+                b'{"command": "split", "source_file": "missing.pdf", "pages": "1"}',
+                "Error: Source file does not exist.",
+            ),
+        ],
+    )
+    def test_dispatch_line_invalid_jobs(
+        self, dispatcher: JobDispatcher, line: bytes, error: str
+    ) -> None:
+        """
+        Test case: should report invalid jobs as failed without stopping the server
+        """
+        result: dict = dispatcher.dispatch_line(line)
+        assert result["status"] == "failed"
+        assert result["error"].startswith(error)
+
+    def test_dispatch_rejects_when_busy(self, dispatcher: JobDispatcher) -> None:
+        """
+        Test case: should reject a job right away when every worker and queue slot is taken
+        """
+        dispatcher._slots.acquire()
+        try:
+            result: dict = dispatcher.dispatch({"command": "split"})
+        finally:
+            dispatcher._slots.release()
+        assert result["status"] == "rejected"
+
+    @pytest.mark.parametrize(
+        "content_type, token, code, error",
+        [
+            ("application/json", None, 401, "Error: Invalid token."),
+            ("application/json", "wrong", 401, "Error: Invalid token."),
+            ("text/plain", "secret", 415, "Error: Jobs must be sent as JSON."),
+            (
+                "application/json; charset=utf-8",
+                "secret",
+                422,
+                "Error: Invalid batch command 'batch'",
+            ),
+        ],
+    )
+    def test_http_requires_json_and_token(
+        self,
+        http_server: JobHttpServer,
+        content_type: str,
+        token: Optional[str],
+        code: int,
+        error: str,
+    ) -> None:
+        """
+        Test case: should only run jobs sent as JSON with the server token
+        """
+        status, result = post_job(
+            http_server, b'{"command": "batch"}', content_type, token
+        )
+        assert status == code
+        assert result["status"] == "failed"
+        assert result["error"].startswith(error)
+
+    @pytest.mark.parametrize(
+        "content_length, code, error",
+        [
+            ("abc", 400, "Error: Invalid Content-Length."),
+            ("-1", 400, "Error: Invalid Content-Length."),
+            (
+                str(MAX_BODY_SIZE + 1),
+                413,
+                f"Error: Jobs can not be larger than {MAX_BODY_SIZE} bytes.",
+            ),
+        ],
+    )
+    def test_http_rejects_invalid_content_length(
+        self, http_server: JobHttpServer, content_length: str, code: int, error: str
+    ) -> None:
+        """
+        Test case: should answer a malformed or too large Content-Length without reading the body
+        """
+        connection = http.client.HTTPConnection(HOST, http_server.server_address[1])
+        try:
+            connection.putrequest("POST", "/")
+            connection.putheader("Content-Type", "application/json")
+            connection.putheader("Authorization", "Bearer secret")
+            connection.putheader("Content-Length", content_length)
+            connection.endheaders()
+            response = connection.getresponse()
+            assert response.status == code
+            assert json.load(response) == {"status": "failed", "error": error}
+        finally:
+            connection.close()
+
+    def test_unix_socket_is_private(
+        self, dispatcher: JobDispatcher, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should only let the owner of the server connect to its socket
+        """
+        socket_path: str = str(tmp_path / "jobs.sock")
+        server = JobUnixServer(socket_path, dispatcher)
+        try:
+            assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        finally:
+            server.server_close()
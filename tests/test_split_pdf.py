@@ -1,20 +1,29 @@
+import gc
+import io
 import logging
+import weakref
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Optional
 
 import pytest
 from mock import patch
+from PyPDF2 import PdfReader, PdfWriter
 
-from pypdfeditor.type_definitions import SplitMode
+from pypdfeditor import editor
+from pypdfeditor.type_definitions import SplitMode, WriteOptions
 
 LOGGER = logging.getLogger(__name__)
 
-from pypdfeditor.editor import split_pdf
+from pypdfeditor.editor import check_split, split_pdf, split_pdf_streams
 
 
 class TestSplitPdf:
     @patch("PyPDF2.PdfReader")
     @pytest.mark.parametrize(
         "page_range",
-        ["10", "1-3,5,6,10", "50,51,1"],
+        ["10", "1-3,5,6,10", "50,51,1", "1-5000000", "8-1", "6-last"],
     )
     def test_split_pdf_with_wrong_page_ranges(self, _, page_range: str) -> None:
         with pytest.raises(ValueError) as e:
@@ -24,6 +33,85 @@ class TestSplitPdf:
             == "Error: The specified page range exceeds the number of pages in the PDF file."
         )
 
+    @pytest.mark.parametrize(
+        "page_range, mode, valid",
+        [
+            ("1-5", SplitMode.SINGLE_FILE, True),
+            ("1-2,6", SplitMode.MULTI_FILES, False),
+            ("1-2,3-5", SplitMode.RANGE_FILES, True),
+            ("1-2,3-6", SplitMode.RANGE_FILES, False),
+            ("4-,last-1,odd", SplitMode.RANGE_FILES, True),
+            ("6-", SplitMode.SINGLE_FILE, False),
+        ],
+    )
+    def test_check_split(
+        self, tmp_path: Path, page_range: str, mode: SplitMode, valid: bool
+    ) -> None:
+        """
+        Test case: should check the page range against the page count without writing any file
+        """
+        source_file: Path = tmp_path / "doc.pdf"
+        source_file.write_bytes(Path("doc.pdf").read_bytes())
+        if valid:
+            check_split(source_file=str(source_file), page_range=page_range, mode=mode)
+        else:
+            with pytest.raises(ValueError):
+                check_split(
+                    source_file=str(source_file), page_range=page_range, mode=mode
+                )
+        assert [path.name for path in tmp_path.iterdir()] == ["doc.pdf"]
+
+    @pytest.mark.parametrize(
+        "page_range, mode, error",
+        [
+            ("odd", SplitMode.SINGLE_FILE, None),
+            ("odd,even", SplitMode.SINGLE_FILE, None),
+            (
+                "even",
+                SplitMode.SINGLE_FILE,
+                "Error: The specified page range selects no pages.",
+            ),
+            (
+                "even",
+                SplitMode.MULTI_FILES,
+                "Error: The specified page range selects no pages.",
+            ),
+            (
+                "odd,even",
+                SplitMode.RANGE_FILES,
+                "Error: A page range of the split selects no pages.",
+            ),
+            (
+                "2-",
+                SplitMode.RANGE_FILES,
+                "Error: The specified page range exceeds the number of pages in the PDF file.",
+            ),
+        ],
+    )
+    def test_split_single_page_file(
+        self, tmp_path: Path, page_range: str, mode: SplitMode, error: Optional[str]
+    ) -> None:
+        """
+        Test case: should refuse a selection, or a range of range_files, without pages instead of writing an empty file
+        """
+        source_file: Path = tmp_path / "page.pdf"
+        writer = PdfWriter()
+        writer.add_page(PdfReader("doc.pdf").pages[0])
+        with open(source_file, "wb") as file:
+            writer.write(file)
+        output_dir: Path = tmp_path / "out"
+        output_dir.mkdir()
+        if error is None:
+            check_split(str(source_file), page_range, mode)
+            split_pdf(str(source_file), page_range, mode, output_dir=str(output_dir))
+            assert all(len(PdfReader(path).pages) > 0 for path in output_dir.iterdir())
+            return
+        for check in (check_split, split_pdf):
+            with pytest.raises(ValueError) as e:
+                check(str(source_file), page_range, mode)
+            assert str(e.value) == error
+        assert list(output_dir.iterdir()) == []
+
     @patch("PyPDF2.PdfReader")
     @pytest.mark.parametrize(
         "page_range, mode",
@@ -40,3 +128,214 @@ class TestSplitPdf:
         with pytest.raises(ValueError) as e:
             split_pdf(source_file="doc.pdf", page_range=page_range, mode=mode)
         assert str(e.value) == f"Error: Unsupported split mode: {mode}"
+
+    @pytest.mark.parametrize("jobs, use_mmap", [(1, False), (2, False), (2, True)])
+    def test_split_pdf_multi_files_with_jobs(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        jobs: int,
+        use_mmap: bool,
+    ) -> None:
+        """
+        Test case: should write one file per page named after its position, whatever the number of jobs
+        """
+        source_file: Path = Path("doc.pdf").resolve()
+        monkeypatch.chdir(tmp_path)
+        split_pdf(
+            source_file=str(source_file),
+            page_range="1-2,4-5",
+            mode=SplitMode.MULTI_FILES,
+            jobs=jobs,
+            use_mmap=use_mmap,
+        )
+        for i in range(1, 5):
+            assert len(PdfReader(tmp_path / f"doc_{i}.pdf").pages) == 1
+        assert not (tmp_path / "doc_5.pdf").exists()
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_split_pdf_range_files_with_jobs(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, jobs: int
+    ) -> None:
+        """
+        Test case: should write one file per range in the requested order, whatever the number of jobs
+        """
+        source_file: Path = Path("doc.pdf").resolve()
+        monkeypatch.chdir(tmp_path)
+        split_pdf(
+            source_file=str(source_file),
+            page_range="1,2-5,3-4",
+            mode=SplitMode.RANGE_FILES,
+            jobs=jobs,
+        )
+        page_counts: list[int] = [
+            len(PdfReader(tmp_path / f"doc_{i}.pdf").pages) for i in range(1, 4)
+        ]
+        assert page_counts == [1, 4, 2]
+
+    def test_split_pdf_keeps_order_and_shares_repeated_pages(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should write pages in the requested order, repeated pages sharing their content
+        """
+        source_file: Path = Path("doc.pdf").resolve()
+        monkeypatch.chdir(tmp_path)
+        split_pdf(source_file=str(source_file), page_range="3,1,2,1,5-4")
+
+        split = PdfReader(tmp_path / "doc_split.pdf", strict=True)
+        assert [page.extract_text() for page in split.pages] == [
+            "Page3",
+            "Page1",
+            "Page2",
+            "Page1",
+            "Page5",
+            "Page4",
+        ]
+        assert (
+            split.pages[1].raw_get("/Contents").idnum
+            == split.pages[3].raw_get("/Contents").idnum
+        )
+
+    def test_split_pdf_stdin_to_stdout(
+        self, monkeypatch: pytest.MonkeyPatch, capsysbinary: pytest.CaptureFixture
+    ) -> None:
+        """
+        Test case: should split stdin to stdout, reporting the result on stderr
+        """
+        monkeypatch.setattr(
+            "sys.stdin", io.TextIOWrapper(io.BytesIO(Path("doc.pdf").read_bytes()))
+        )
+        split_pdf(source_file="-", page_range="2,1", output_dir="-")
+
+        captured = capsysbinary.readouterr()
+        split = PdfReader(io.BytesIO(captured.out), strict=True)
+        assert [page.extract_text() for page in split.pages] == ["Page2", "Page1"]
+        assert captured.err == b"The PDF file was successfully split into 1 file\n"
+
+    def test_split_pdf_output_dir(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should write the files into the output directory instead of the working directory
+        """
+        source_file: Path = Path("doc.pdf").resolve()
+        (tmp_path / "out").mkdir()
+        monkeypatch.chdir(tmp_path)
+        split_pdf(
+            source_file=str(source_file),
+            page_range="1,2-3",
+            mode=SplitMode.RANGE_FILES,
+            output_dir="out",
+        )
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["out"]
+        assert sorted(path.name for path in (tmp_path / "out").iterdir()) == [
+            "doc_1.pdf",
+            "doc_2.pdf",
+        ]
+
+    @pytest.mark.parametrize(
+        "mode, page_counts",
+        [
+            (SplitMode.SINGLE_FILE, [3]),
+            (SplitMode.RANGE_FILES, [1, 2]),
+            (SplitMode.MULTI_FILES, [1, 1, 1]),
+        ],
+    )
+    def test_split_pdf_streams(self, mode: SplitMode, page_counts: list[int]) -> None:
+        """
+        Test case: should return one rewound stream per output file without writing any file
+        """
+        with open("doc.pdf", "rb") as source:
+            outputs: list[io.BytesIO] = split_pdf_streams(source, "5,1-2", mode)
+        assert [len(PdfReader(output).pages) for output in outputs] == page_counts
+
+    @pytest.mark.parametrize(
+        "archive, mode, jobs",
+        [
+            ("parts.zip", SplitMode.MULTI_FILES, 1),
+            ("parts.zip", SplitMode.MULTI_FILES, 2),
+            ("parts.tar.gz", SplitMode.RANGE_FILES, 1),
+            ("parts.tar", SplitMode.RANGE_FILES, 2),
+        ],
+    )
+    def test_split_pdf_to_archive(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        archive: str,
+        mode: SplitMode,
+        jobs: int,
+    ) -> None:
+        """
+        Test case: should write the files into a single archive under the names they would have had
+        """
+        source_file: Path = Path("doc.pdf").resolve()
+        monkeypatch.chdir(tmp_path)
+        split_pdf(
+            source_file=str(source_file),
+            page_range="1,2,3",
+            mode=mode,
+            jobs=jobs,
+            archive=archive,
+        )
+        assert [path.name for path in tmp_path.iterdir()] == [archive]
+
+        parts: dict[str, bytes]
+        if archive.endswith(".zip"):
+            with zipfile.ZipFile(archive) as zip_file:
+                parts = {name: zip_file.read(name) for name in zip_file.namelist()}
+        else:
+            with tarfile.open(archive) as tar_file:
+                parts = {
+                    member.name: tar_file.extractfile(member).read()  # type: ignore[union-attr]
+                    for member in tar_file
+                }
+        assert sorted(parts) == ["doc_1.pdf", "doc_2.pdf", "doc_3.pdf"]
+        assert (
+            PdfReader(io.BytesIO(parts["doc_3.pdf"])).pages[0].extract_text() == "Page3"
+        )
+
+    def test_split_pdf_to_archive_removes_it_on_error(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """
+        Test case: should not leave a partial archive behind when the split fails
+        """
+        source_file: Path = Path("doc.pdf").resolve()
+        monkeypatch.chdir(tmp_path)
+        with patch("pypdfeditor.editor.write_pages", side_effect=ValueError("Error")):
+            with pytest.raises(ValueError):
+                split_pdf(
+                    source_file=str(source_file),
+                    page_range="1,2",
+                    mode=SplitMode.MULTI_FILES,
+                    archive="parts.zip",
+                )
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("options", [WriteOptions(), WriteOptions(dedupe=True)])
+    def test_split_pdf_frees_reader(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path, options: WriteOptions
+    ) -> None:
+        """
+        Test case: should not keep the reader of the source file once the split is done
+        """
+        readers: list[weakref.ref] = []
+
+        def open_pdf_reader(path: str, use_mmap: bool = False) -> PdfReader:
+            reader = PdfReader(path)
+            readers.append(weakref.ref(reader))
+            return reader
+
+        monkeypatch.setattr(editor, "open_pdf_reader", open_pdf_reader)
+        monkeypatch.chdir(tmp_path)
+        split_pdf(
+            source_file=str(Path(__file__).parent.parent / "doc.pdf"),
+            page_range="1-3",
+            mode=SplitMode.MULTI_FILES,
+            options=options,
+        )
+        gc.collect()
+        assert len(readers) == 1
+        assert readers[0]() is None
@@ -0,0 +1,61 @@
+import gc
+import io
+import weakref
+
+from PyPDF2 import PdfReader
+
+from pypdfeditor.split_writer import serialized_objects, write_page_selection
+
+
+class TestSplitWriter:
+    def test_write_page_selection(self) -> None:
+        """
+        Test case: should write the selected pages in order under their own numbers, in a single xref subsection
+        """
+        reader = PdfReader("doc.pdf")
+        output = io.BytesIO()
+        write_page_selection(reader, [3, 1, 3], output)
+
+        output.seek(0)
+        split = PdfReader(output, strict=True)
+        assert [page.extract_text() for page in split.pages] == [
+            "Page3",
+            "Page1",
+            "Page3",
+        ]
+        assert (
+            split.pages[0].indirect_reference.idnum
+            == reader.pages[2].indirect_reference.idnum
+        )
+        assert (
+            split.pages[0].raw_get("/Contents").idnum
+            == split.pages[2].raw_get("/Contents").idnum
+        )
+        assert len(split.xref[0]) < len(reader.xref[0])
+        size: int = split.trailer["/Size"]
+        assert output.getvalue().count(b"\nxref\n") == 1
+        assert f"\nxref\n0 {size}\n".encode() in output.getvalue()
+        assert len(split.xref[0]) + sum(split.xref_free_entry[65535].values()) == size
+
+    def test_write_page_selection_serializes_shared_objects_once(self) -> None:
+        """
+        Test case: should only serialize the objects a file does not share with the ones written before
+        """
+        reader = PdfReader("doc.pdf")
+        write_page_selection(reader, [1], io.BytesIO())
+        serialized: int = len(serialized_objects(reader)._objects)
+
+        # Only the content stream of page 2 is new; its resources are shared.
+        write_page_selection(reader, [2], io.BytesIO())
+        assert len(serialized_objects(reader)._objects) == serialized + 1
+
+    def test_serialized_objects_are_freed_with_reader(self) -> None:
+        """
+        Test case: should free the reader and its serialized objects once the reader is no longer used
+        """
+        reader = PdfReader("doc.pdf")
+        write_page_selection(reader, [1, 2], io.BytesIO())
+        objects = weakref.ref(serialized_objects(reader))
+        del reader
+        gc.collect()
+        assert objects() is None
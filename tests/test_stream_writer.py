@@ -0,0 +1,76 @@
+import os
+import zlib
+from io import BytesIO
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, NameObject
+
+from pypdfeditor.stream_writer import StreamingPdfWriter, write_compact
+
+
+def writer_with_content(content: bytes) -> PdfWriter:
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    stream = DecodedStreamObject()
+    stream.set_data(content)
+    writer.pages[0][NameObject("/Contents")] = writer._add_object(stream)
+    return writer
+
+
+class TestWriteCompact:
+    @pytest.mark.parametrize("level, compressed", [(0, False), (1, True), (9, True)])
+    def test_write_compact_compresses_streams(
+        self, level: int, compressed: bool
+    ) -> None:
+        """
+        Test case: should compress streams without a filter at the given level
+        """
+        content: bytes = b"BT /F1 12 Tf 72 720 Td (Hello) Tj ET\n" * 100
+        output = BytesIO()
+        write_compact(writer_with_content(content), output, level)
+
+        reader = PdfReader(output, strict=True)
+        contents = reader.pages[0]["/Contents"].get_object()
+        assert contents.get_data() == content
+        assert ("/Filter" in contents) == compressed
+        if compressed:
+            assert contents._data == zlib.compress(content, level)
+
+    def test_write_compact_drops_unused_objects(self) -> None:
+        """
+        Test case: should leave out the objects nothing refers to and mark them free
+        """
+        writer: PdfWriter = writer_with_content(b"q Q")
+        unused = DecodedStreamObject()
+        unused.set_data(os.urandom(4096))
+        unused_idnum: int = writer._add_object(unused).idnum
+        output = BytesIO()
+        write_compact(writer, output, 6)
+
+        assert len(output.getvalue()) < 4096
+        reader = PdfReader(output, strict=True)
+        assert unused_idnum not in reader.xref[0]
+        assert unused_idnum not in reader.xref_objStm
+        assert len(reader.pages) == 1
+
+
+class TestStreamingPdfWriter:
+    def test_bytes_written(self) -> None:
+        """
+        Test case: should count the bytes written so far, also to a stream that can not tell its position
+        """
+
+        class UnseekableStream(BytesIO):
+            def tell(self) -> int:
+                raise OSError("not seekable")
+
+        stream = UnseekableStream()
+        writer = StreamingPdfWriter(stream)
+        writer.append(PdfReader("doc.pdf"))
+        assert writer.bytes_written == 0
+        writer.flush()
+        flushed: int = writer.bytes_written
+        assert 0 < flushed == len(stream.getvalue())
+        writer.close()
+        assert flushed < writer.bytes_written == len(stream.getvalue())
@@ -5,9 +5,10 @@ from typing import Literal
 import pytest
 from pytest import MonkeyPatch
 
-from pypdfeditor.type_definitions import SplitArgs
+from pypdfeditor.type_definitions import MergeArgs, SplitArgs, SplitMode
 from pypdfeditor.validator import (
     validate_input_files,
+    validate_merge_args,
     validate_output_file,
     validate_split_args,
 )
@@ -147,6 +148,22 @@ class TestValidateSplitArgs:
                 "my_file.pdf",
                 "1-10,20,30-40,50-60,70,80-90,100",
             ),
+            (
+                "my_file.pdf",
+                "1,2,3-",
+            ),
+            (
+                "my_file.pdf",
+                "-4,6,7",
+            ),
+            (
+                "my_file.pdf",
+                "10-1,last,last-5",
+            ),
+            (
+                "my_file.pdf",
+                "1-100:2,odd,even",
+            ),
         ],
     )
     def test_validate_split_args_with_valid_pages(
@@ -166,14 +183,6 @@ class TestValidateSplitArgs:
     @pytest.mark.parametrize(
         "file, pages",
         [
-            (
-                "my_file.pdf",
-                "1,2,3-",
-            ),
-            (
-                "my_file.pdf",
-                "-4,6,7",
-            ),
             (
                 "my_file.pdf",
                 "1-5-7",
@@ -202,6 +211,30 @@ class TestValidateSplitArgs:
                 "my_file.pdf",
                 "1-3,3-5,",
             ),
+            (
+                "my_file.pdf",
+                "5:2",
+            ),
+            (
+                "my_file.pdf",
+                "1-10:0",
+            ),
+            (
+                "my_file.pdf",
+                "odd-3",
+            ),
+            (
+                "my_file.pdf",
+                "-",
+            ),
+            (
+                "my_file.pdf",
+                "1,,2",
+            ),
+            (
+                "my_file.pdf",
+                "",
+            ),
         ],
     )
     def test_validate_split_args_with_invalid_pages(
@@ -221,6 +254,58 @@ class TestValidateSplitArgs:
             validate_split_args(args)
         assert str(e.value) == "Error: Invalid range format."
 
+    @pytest.mark.parametrize("jobs", [0, -1, -8])
+    def test_validate_split_args_with_invalid_jobs(
+        self, monkeypatch: MonkeyPatch, jobs: int
+    ) -> None:
+        """
+        Test case: `validate_split_args` raise an exception when the number of jobs is lower than 1.
+        """
+
+        def mock_exists(path) -> Literal[True]:
+            return True
+
+        monkeypatch.setattr(Path, "exists", mock_exists)
+        args = SplitArgs(source_file="my_file.pdf", pages="1-3", jobs=jobs)
+
+        with pytest.raises(ArgumentTypeError) as e:
+            validate_split_args(args)
+        assert str(e.value) == "Error: The number of jobs must be at least 1."
+
+    @pytest.mark.parametrize("level", [-1, 10])
+    def test_validate_split_args_with_invalid_compression_level(
+        self, monkeypatch: MonkeyPatch, level: int
+    ) -> None:
+        """
+        Test case: `validate_split_args` raise an exception when the compression level is not between 0 and 9.
+        """
+
+        def mock_exists(path) -> Literal[True]:
+            return True
+
+        monkeypatch.setattr(Path, "exists", mock_exists)
+        args = SplitArgs(
+            source_file="my_file.pdf", pages="1-3", compression_level=level
+        )
+
+        with pytest.raises(ArgumentTypeError) as e:
+            validate_split_args(args)
+        assert str(e.value) == "Error: The compression level must be between 0 and 9."
+
+    def test_validate_split_args_with_stdout_multi_files(self) -> None:
+        """
+        Test case: `validate_split_args` raise an exception when several files would be written to stdout.
+        """
+        args = SplitArgs(
+            source_file="-", pages="1-3", mode=SplitMode.MULTI_FILES, output_dir="-"
+        )
+
+        with pytest.raises(ArgumentTypeError) as e:
+            validate_split_args(args)
+        assert (
+            str(e.value) == "Error: Only single_file splits can be written to stdout."
+        )
+
 
 class TestValidateMergeArgs:
     @pytest.mark.parametrize(
@@ -309,3 +394,24 @@ class TestValidateMergeArgs:
         monkeypatch.setattr(Path, "exists", mock_exists)
 
         assert validate_input_files(input_files=input_files) is None
+
+    def test_validate_merge_args_with_negative_prefetch(
+        self, monkeypatch: MonkeyPatch
+    ) -> None:
+        """
+        Test case: `validate_merge_args` raise an exception when the number of prefetched files is negative.
+        """
+
+        def mock_exists(path) -> Literal[True]:
+            return True
+
+        monkeypatch.setattr(Path, "exists", mock_exists)
+        args = MergeArgs(
+            output_file="out.pdf", input_files=["a.pdf", "b.pdf"], prefetch=-1
+        )
+
+        with pytest.raises(ArgumentTypeError) as e:
+            validate_merge_args(args)
+        assert (
+            str(e.value) == "Error: The number of prefetched files can not be negative."
+        )